@@ -10,51 +10,156 @@
 #
 # SPDX-License-Identifier: Apache-2.0
 # *******************************************************************************
-import os
-import shutil
-import time
-
-
-def _execute_command(cmd):
-    return os.system(cmd)
+"""In-process reachability probing.
 
+Hosts are probed with ICMP echo requests sent over unprivileged ICMP datagram
+sockets (Linux ``net.ipv4.ping_group_range``). Where those are not permitted,
+a TCP connect to a configurable port is used instead: both an accepted and a
+refused connection prove that the host is up.
+"""
 
-def _ping(address, wait_ms_precision=None):
-    if shutil.which("ping") is None:
-        raise RuntimeError(
-            "The 'ping' utility is not installed on this system. "
-            "Please install it (e.g. 'apt install iputils-ping' on Debian/Ubuntu systems)."
-        )
-    timeout_command = f"timeout {wait_ms_precision} " if wait_ms_precision else ""
-    return _execute_command(f"{timeout_command}ping -c 1 -W 1 " + address) == 0
-
+import errno
+import itertools
+import logging
+import os
+import select
+import socket
+import statistics
+import struct
+import time
 
-def ping(address, timeout=0, interval=1, wait_ms_precision=None):
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, Optional
+
+from score.itf.core.utils.bunch import Bunch
+
+
+logger = logging.getLogger(__name__)
+
+ICMP = "icmp"
+TCP = "tcp"
+
+_ICMP_ECHO_REQUEST = 8
+_ICMP_ECHO_REPLY = 0
+_DEFAULT_TCP_PORT = 22
+_MAX_CONCURRENT_PROBES = 32
+
+_sequence = itertools.count(1)
+
+
+def icmp_available() -> bool:
+    """Return True if unprivileged ICMP datagram sockets may be used by this process."""
+    try:
+        socket.socket(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_ICMP).close()
+        return True
+    except OSError:
+        return False
+
+
+class Prober:
+    """Measures the round-trip time to hosts without forking external tools."""
+
+    def __init__(self, method: Optional[str] = None, port: int = _DEFAULT_TCP_PORT, timeout: float = 1.0):
+        """
+        :param Optional[str] method: ``"icmp"`` or ``"tcp"``. Default is ICMP where permitted, TCP otherwise.
+        :param int port: Port connected to by TCP probes. Default is 22.
+        :param float timeout: Seconds to wait for a single reply. Default is 1 second.
+        """
+        if method is None:
+            method = ICMP if icmp_available() else TCP
+            if method == TCP:
+                logger.debug(f"ICMP datagram sockets are not permitted, probing TCP port {port} instead")
+        if method not in (ICMP, TCP):
+            raise ValueError(f"Unknown probe method '{method}', expected '{ICMP}' or '{TCP}'")
+        self.method = method
+        self.port = port
+        self.timeout = timeout
+
+    def probe(self, address: str, timeout: Optional[float] = None) -> Optional[float]:
+        """Probe *address* once.
+
+        :return: round-trip time in seconds, or None if the host did not answer in time.
+        """
+        timeout = self.timeout if timeout is None else timeout
+        try:
+            if self.method == ICMP:
+                return _probe_icmp(address, timeout)
+            return _probe_tcp(address, self.port, timeout)
+        except OSError as ex:
+            logger.debug(f"Probing {address} failed: {ex}")
+            return None
+
+    def statistics(self, address: str, count: int = 4, interval: float = 0.2) -> Bunch:
+        """Probe *address* *count* times, *interval* seconds apart.
+
+        :return: Bunch with ``address``, ``sent``, ``received``, ``loss`` (fraction of lost probes)
+            and ``rtt_min``, ``rtt_avg``, ``rtt_max``, ``rtt_mdev`` in seconds (None without replies).
+        """
+        rtts = []
+        for index in range(count):
+            if index:
+                time.sleep(interval)
+            rtt = self.probe(address)
+            if rtt is not None:
+                rtts.append(rtt)
+        return _statistics(address, count, rtts)
+
+    def statistics_many(self, addresses: Iterable[str], count: int = 4, interval: float = 0.2) -> dict:
+        """Like :meth:`statistics` for several addresses probed concurrently.
+
+        :return: dict mapping each address to its statistics.
+        """
+        addresses = list(dict.fromkeys(addresses))
+        if not addresses:
+            return {}
+        workers = min(len(addresses), _MAX_CONCURRENT_PROBES)
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="probe") as executor:
+            results = executor.map(lambda address: self.statistics(address, count, interval), addresses)
+            return dict(zip(addresses, results))
+
+    def wait_until(self, address: str, reachable: bool, timeout: float, interval: float = 0.1) -> bool:
+        """Probe *address* until its reachability equals *reachable* or *timeout* seconds have passed.
+
+        The first probe is sent immediately.
+
+        :return: True if the expected state was observed in time.
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            answered = self.probe(address, timeout=max(min(self.timeout, remaining), 0.001)) is not None
+            if answered == reachable:
+                return True
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            time.sleep(min(interval, remaining))
+
+
+def ping(address, timeout=0, interval=1, wait_ms_precision=None, port=_DEFAULT_TCP_PORT):
+    """Return True if *address* answers within *timeout* seconds.
+
+    :param str address: Host to probe.
+    :param float timeout: Seconds to keep probing; 0 sends a single probe. Default is 0.
+    :param float interval: Seconds between probes. Default is 1 second.
+    :param float wait_ms_precision: Optional limit in seconds for a single probe. Default is 1 second.
+    :param int port: Port used when falling back to TCP probes. Default is 22.
+    """
+    prober = Prober(port=port, timeout=_probe_timeout(wait_ms_precision))
     if timeout == 0:
-        return _ping(address, wait_ms_precision)
+        return prober.probe(address) is not None
+    return prober.wait_until(address, reachable=True, timeout=timeout, interval=interval)
 
-    attempts = int(timeout / interval)
 
-    for _ in range(attempts):
-        time.sleep(interval)
-        if _ping(address, wait_ms_precision):
-            return True
+def ping_lost(address, timeout=0, interval=1, wait_ms_precision=None, port=_DEFAULT_TCP_PORT):
+    """Return True if *address* stops answering within *timeout* seconds.
 
-    return False
-
-
-def ping_lost(address, timeout=0, interval=1, wait_ms_precision=None):
+    Parameters are the same as for :func:`ping`.
+    """
+    prober = Prober(port=port, timeout=_probe_timeout(wait_ms_precision))
     if timeout == 0:
-        return not _ping(address, wait_ms_precision)
-
-    attempts = int(timeout / interval)
-
-    for _ in range(attempts):
-        time.sleep(interval)
-        if not _ping(address, wait_ms_precision):
-            return True
-
-    return False
+        return prober.probe(address) is None
+    return prober.wait_until(address, reachable=False, timeout=timeout, interval=interval)
 
 
 def check_ping_lost(address):
@@ -63,3 +168,74 @@ def check_ping_lost(address):
 
 def check_ping(address):
     assert ping(address, timeout=60)
+
+
+def _probe_timeout(wait_ms_precision):
+    return min(float(wait_ms_precision), 1.0) if wait_ms_precision else 1.0
+
+
+def _probe_icmp(address, timeout):
+    destination = socket.gethostbyname(address)
+    sequence = next(_sequence) & 0xFFFF
+    payload = struct.pack("!d", time.monotonic()) + os.urandom(8)
+    header = struct.pack("!BBHHH", _ICMP_ECHO_REQUEST, 0, 0, 0, sequence)
+    checksum = _checksum(header + payload)
+    packet = struct.pack("!BBHHH", _ICMP_ECHO_REQUEST, 0, checksum, 0, sequence) + payload
+
+    deadline = time.monotonic() + timeout
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_ICMP) as sock:
+        start = time.monotonic()
+        sock.sendto(packet, (destination, 0))
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not select.select([sock], [], [], remaining)[0]:
+                return None
+            reply, _ = sock.recvfrom(1024)
+            # Some platforms include the IP header.
+            if reply and reply[0] >> 4 == 4:
+                reply = reply[(reply[0] & 0x0F) * 4 :]
+            if len(reply) < 8:
+                continue
+            kind, _, _, _, reply_sequence = struct.unpack("!BBHHH", reply[:8])
+            # The kernel rewrites the identifier and only delivers replies for this socket.
+            if kind == _ICMP_ECHO_REPLY and reply_sequence == sequence and reply[8:] == payload:
+                return time.monotonic() - start
+
+
+def _probe_tcp(address, port, timeout):
+    start = time.monotonic()
+    try:
+        with socket.create_connection((address, port), timeout=timeout):
+            pass
+    except ConnectionRefusedError:
+        # The host answered with a reset, so it is up.
+        pass
+    except TimeoutError:
+        return None
+    except OSError as ex:
+        if ex.errno in (errno.EHOSTUNREACH, errno.ENETUNREACH, errno.EHOSTDOWN):
+            return None
+        raise
+    return time.monotonic() - start
+
+
+def _checksum(data):
+    if len(data) % 2:
+        data += b"\x00"
+    total = sum(struct.unpack(f"!{len(data) // 2}H", data))
+    total = (total >> 16) + (total & 0xFFFF)
+    total += total >> 16
+    return ~total & 0xFFFF
+
+
+def _statistics(address, sent, rtts):
+    return Bunch(
+        address=address,
+        sent=sent,
+        received=len(rtts),
+        loss=(1 - len(rtts) / sent) if sent else 0.0,
+        rtt_min=min(rtts) if rtts else None,
+        rtt_avg=statistics.fmean(rtts) if rtts else None,
+        rtt_max=max(rtts) if rtts else None,
+        rtt_mdev=statistics.pstdev(rtts) if rtts else None,
+    )
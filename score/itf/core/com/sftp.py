@@ -15,6 +15,7 @@ import stat
 import logging
 
 from score.itf.core.com.ssh import Ssh
+from score.itf.core.com.sftp_transfer import SftpTransfer
 from typing import Optional
 
 # Reduce the logging level of paramiko, from DEBUG to INFO
@@ -178,18 +179,18 @@ class Sftp:
     def rmdir(self, remote_path):
         self._sftp.rmdir(remote_path)
 
-    def upload_dir(self, local_path, remote_path, verbose=True):
-        for dirpath, _, filenames in os.walk(local_path):
-            dirpath_relative = os.path.relpath(dirpath, local_path)
-            for filename in filenames:
-                self.upload(
-                    os.path.join(dirpath, filename), os.path.join(remote_path, dirpath_relative, filename), verbose
-                )
-
-    def download_dir(self, remote_path, local_path, verbose=True):
-        for dirpath, filenames in self.walk(remote_path):
-            relative_dirpath = os.path.relpath(dirpath, remote_path)
-            for filename in filenames:
-                self.download(
-                    os.path.join(dirpath, filename), os.path.join(local_path, relative_dirpath, filename), verbose
-                )
+    def upload_dir(self, local_path, remote_path, verbose=True, workers=4):
+        """
+        Upload the content of a local directory, spreading the files over several SFTP channels.
+        :param int workers: Number of SFTP channels used concurrently. Default is 4.
+        :return: transfer statistics with ``files``, ``bytes``, ``duration`` and ``throughput``.
+        """
+        return SftpTransfer(self._ssh, workers=workers, verbose=verbose).upload_dir(local_path, remote_path)
+
+    def download_dir(self, remote_path, local_path, verbose=True, workers=4):
+        """
+        Download the content of a remote directory, spreading the files over several SFTP channels.
+        :param int workers: Number of SFTP channels used concurrently. Default is 4.
+        :return: transfer statistics with ``files``, ``bytes``, ``duration`` and ``throughput``.
+        """
+        return SftpTransfer(self._ssh, workers=workers, verbose=verbose).download_dir(remote_path, local_path)
@@ -0,0 +1,202 @@
+# *******************************************************************************
+# Copyright (c) 2026 Contributors to the Eclipse Foundation
+#
+# See the NOTICE file(s) distributed with this work for additional
+# information regarding copyright ownership.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Apache License Version 2.0 which is available at
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# SPDX-License-Identifier: Apache-2.0
+# *******************************************************************************
+import logging
+import os
+import posixpath
+import queue
+import shlex
+import stat
+import threading
+import time
+
+from score.itf.core.com.ssh import Ssh
+from score.itf.core.utils.bunch import Bunch
+
+
+logger = logging.getLogger(__name__)
+
+# Keep generated "mkdir -p" command lines well below common ARG_MAX limits.
+_MAX_COMMAND_LENGTH = 16384
+_MKDIR = "mkdir -p"
+
+
+class SftpTransfer:
+    """Transfers directory trees over several SFTP channels of one SSH connection.
+
+    Remote directories are created up front with as few ``mkdir -p`` commands as
+    possible, then the files are spread over *workers* SFTP channels that run
+    concurrently. Paramiko pipelines the requests of every single transfer
+    (``put`` writes without waiting for each acknowledgement and ``get`` prefetches),
+    so each channel keeps the link busy on its own as well.
+    """
+
+    def __init__(self, ssh: Ssh, workers: int = 4, verbose: bool = True):
+        """
+        :param Ssh ssh: Established SSH connection to transfer over.
+        :param int workers: Number of SFTP channels used concurrently. Default is 4.
+        :param bool verbose: If True, every transferred file is logged. Default is True.
+        """
+        if workers < 1:
+            raise ValueError("Number of SFTP workers must be at least 1")
+        self._ssh = ssh
+        self._workers = workers
+        self._verbose = verbose
+
+    def upload_dir(self, local_path: str, remote_path: str) -> Bunch:
+        """Upload the content of *local_path* into *remote_path*.
+
+        :return: transfer statistics (see :meth:`_stats`).
+        """
+        start = time.monotonic()
+        directories = set()
+        jobs = []
+        for dirpath, _, filenames in os.walk(local_path):
+            remote_dir = posixpath.normpath(posixpath.join(remote_path, os.path.relpath(dirpath, local_path)))
+            directories.add(remote_dir)
+            for filename in filenames:
+                local_file = os.path.join(dirpath, filename)
+                jobs.append((local_file, posixpath.join(remote_dir, filename), os.path.getsize(local_file)))
+
+        self._make_remote_dirs(directories)
+
+        def put(sftp, job):
+            local_file, remote_file, _ = job
+            if self._verbose:
+                logger.debug(f"Uploading '{local_file}' to '{remote_file}'")
+            sftp.put(local_file, remote_file)
+
+        self._run(put, jobs)
+        return self._stats("Uploaded", jobs, start)
+
+    def download_dir(self, remote_path: str, local_path: str) -> Bunch:
+        """Download the content of *remote_path* into *local_path*.
+
+        File modification times are preserved.
+
+        :return: transfer statistics (see :meth:`_stats`).
+        """
+        start = time.monotonic()
+        sftp = self._ssh.get_paramiko_client().open_sftp()
+        try:
+            jobs = list(self._list_remote_files(sftp, remote_path, local_path))
+        finally:
+            sftp.close()
+
+        for directory in {os.path.dirname(job[1]) for job in jobs}:
+            os.makedirs(directory, exist_ok=True)
+
+        def get(sftp, job):
+            remote_file, local_file, _, attributes = job
+            if self._verbose:
+                logger.debug(f"Downloading '{remote_file}' to '{local_file}'")
+            sftp.get(remote_file, local_file)
+            os.utime(local_file, (attributes.st_atime, attributes.st_mtime))
+
+        self._run(get, jobs)
+        return self._stats("Downloaded", jobs, start)
+
+    def _list_remote_files(self, sftp, remote_path, local_path):
+        """Yield ``(remote_file, local_file, size, attributes)`` for every file below *remote_path*."""
+        pending = [remote_path]
+        while pending:
+            remote_dir = pending.pop()
+            local_dir = os.path.normpath(os.path.join(local_path, posixpath.relpath(remote_dir, remote_path)))
+            for attributes in sftp.listdir_attr(remote_dir):
+                remote_file = posixpath.join(remote_dir, attributes.filename)
+                if stat.S_ISDIR(attributes.st_mode):
+                    pending.append(remote_file)
+                else:
+                    local_file = os.path.join(local_dir, attributes.filename)
+                    yield remote_file, local_file, attributes.st_size, attributes
+
+    def _make_remote_dirs(self, directories):
+        # "mkdir -p" creates all parents, so only the leaves of the tree are needed. Sorting by
+        # path components places every directory right before its own subdirectories.
+        ordered = sorted(directories, key=lambda d: d.split("/"))
+        leaves = [
+            d for d, following in zip(ordered, ordered[1:] + [""]) if not following.startswith(d.rstrip("/") + "/")
+        ]
+        command = []
+        length = len(_MKDIR)
+        for directory in leaves:
+            quoted = shlex.quote(directory)
+            if command and length + 1 + len(quoted) > _MAX_COMMAND_LENGTH:
+                self._mkdir(command)
+                command = []
+                length = len(_MKDIR)
+            command.append(quoted)
+            length += 1 + len(quoted)
+        if command:
+            self._mkdir(command)
+
+    def _mkdir(self, quoted_directories):
+        cmd = " ".join([_MKDIR] + quoted_directories)
+        assert self._ssh.execute_command(cmd, verbose=False) == 0, f"Could not create remote paths: {cmd}"
+
+    def _run(self, transfer, jobs):
+        """Run *transfer(sftp, job)* for all jobs, spread over the worker SFTP channels."""
+        if not jobs:
+            return
+        # Start with the largest files so that the channels finish at about the same time.
+        work = queue.Queue()
+        for job in sorted(jobs, key=lambda j: j[2], reverse=True):
+            work.put(job)
+
+        errors = []
+        failed = threading.Event()
+
+        def worker():
+            try:
+                sftp = self._ssh.get_paramiko_client().open_sftp()
+            except Exception as ex:
+                errors.append(ex)
+                failed.set()
+                return
+            try:
+                while not failed.is_set():
+                    try:
+                        job = work.get_nowait()
+                    except queue.Empty:
+                        return
+                    transfer(sftp, job)
+            except Exception as ex:
+                errors.append(ex)
+                failed.set()
+            finally:
+                sftp.close()
+
+        threads = [
+            threading.Thread(target=worker, name=f"sftp-transfer-{i}", daemon=True)
+            for i in range(min(self._workers, len(jobs)))
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        if errors:
+            raise errors[0]
+
+    @staticmethod
+    def _stats(action, jobs, start):
+        """Log and return the aggregate statistics of a finished transfer.
+
+        The returned :class:`Bunch` has ``files``, ``bytes``, ``duration`` (seconds)
+        and ``throughput`` (bytes per second).
+        """
+        duration = time.monotonic() - start
+        total_bytes = sum(job[2] for job in jobs)
+        throughput = total_bytes / duration if duration > 0 else 0.0
+        logger.info(
+            f"{action} {len(jobs)} files ({total_bytes / 1e6:.2f} MB) in {duration:.2f}s ({throughput / 1e6:.2f} MB/s)"
+        )
+        return Bunch(files=len(jobs), bytes=total_bytes, duration=duration, throughput=throughput)
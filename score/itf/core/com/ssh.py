@@ -14,7 +14,7 @@ import time
 import logging
 import paramiko
 import shlex
-import select
+import threading
 
 from typing import Optional
 
@@ -214,24 +214,56 @@ class Ssh:
         return exit_code
 
 
-def _iter_channel_lines_from_bytes(
-    data: bytes,
-    partial: str,
-    encoding: str = "utf-8",
-    errors: str = "replace",
-):
-    text = partial + data.decode(encoding, errors=errors)
-    lines = text.splitlines(keepends=True)
-    if lines and not lines[-1].endswith("\n"):
-        partial = lines.pop()
-    else:
-        partial = ""
-    return lines, partial
+# Upper bound for a single wait on channel activity. Data, EOF and channel close wake
+# the reader immediately, so this only matters for commands whose exit status arrives
+# while a background child still holds the output stream open.
+_IDLE_WAIT = 0.5
+# How long to wait for further output once the exit status is known but the output
+# stream has not been closed by the remote side.
+_EXIT_GRACE = 0.1
+_RECV_SIZE = 32768
+
+
+class _LineAccumulator:
+    """Collects raw channel bytes and decodes them once per batch of complete lines."""
+
+    def __init__(self, logger_in=None, encoding="utf-8", errors="replace"):
+        self.lines = []
+        self._pending = bytearray()
+        self._logger = logger_in
+        self._encoding = encoding
+        self._errors = errors
+
+    def feed(self, data: bytes):
+        self._pending += data
+        end = self._pending.rfind(b"\n")
+        if end < 0:
+            return
+        text = self._pending[: end + 1].decode(self._encoding, errors=self._errors)
+        del self._pending[: end + 1]
+        self._add(text.splitlines(keepends=True))
+
+    def finish(self):
+        if self._pending:
+            text = self._pending.decode(self._encoding, errors=self._errors)
+            self._pending.clear()
+            self._add(text.splitlines(keepends=True))
+        return self.lines
+
+    def _add(self, new_lines):
+        self.lines.extend(new_lines)
+        if self._logger:
+            for line in new_lines:
+                self._logger.info(line.rstrip("\n"))
 
 
 def _read_output_with_timeout(stream, logger_in, log, max_exec_time, separate_stderr: bool = False):
     """Logs the output from a given stream and returns the lines of output.
 
+    The reader sleeps on a single event that paramiko sets whenever stdout or stderr
+    data arrives or the remote side sends EOF, so it wakes up as soon as there is
+    something to do instead of polling the channel in fixed time slices.
+
     :param stream: The stream to read the output from (should be stdout).
     :type stream: paramiko.ChannelFile
     :param logger_in: The logger object used for logging output. If None, the default logger is used.
@@ -259,99 +291,41 @@ def _read_output_with_timeout(stream, logger_in, log, max_exec_time, separate_st
     # - separate_stderr=True: keep stderr separate
     channel.set_combine_stderr(not separate_stderr)
 
-    start_time = time.time()
-    deadline = start_time + max_exec_time
-    channel.settimeout(0.5)
+    activity = threading.Event()
+    channel.in_buffer.set_event(activity)
+    channel.in_stderr_buffer.set_event(activity)
 
-    stdout_lines = []
-    stderr_lines = []
-    stdout_partial = ""
-    stderr_partial = ""
+    stdout = _LineAccumulator(logger_in if log else None)
+    stderr = _LineAccumulator(logger_in if log else None)
+    deadline = time.monotonic() + max_exec_time
     try:
         while True:
-            now = time.time()
-            if now > deadline:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
                 raise TimeoutError(f"Command did not finish within {max_exec_time} seconds")
 
             did_read = False
-
             if channel.recv_ready():
-                data = channel.recv(32768)
-                new_lines, stdout_partial = _iter_channel_lines_from_bytes(data, stdout_partial)
-                stdout_lines.extend(new_lines)
-                if log:
-                    for line in new_lines:
-                        logger_in.info(line.rstrip("\n"))
+                stdout.feed(channel.recv(_RECV_SIZE))
                 did_read = True
-
             if separate_stderr and channel.recv_stderr_ready():
-                data = channel.recv_stderr(32768)
-                new_lines, stderr_partial = _iter_channel_lines_from_bytes(data, stderr_partial)
-                stderr_lines.extend(new_lines)
-                if log:
-                    for line in new_lines:
-                        logger_in.info(line.rstrip("\n"))
+                stderr.feed(channel.recv_stderr(_RECV_SIZE))
                 did_read = True
-
             if did_read:
                 continue
 
-            if channel.exit_status_ready():
-                # The remote process has exited, but output may still be buffered
-                # in the SSH transport.  Keep draining until recv() returns empty
-                # bytes (true EOF) to avoid truncating large outputs.
-                remaining = deadline - now
-                wait_after_exit = 0 if remaining <= 0 else min(0.5, remaining)
-                try:
-                    select.select([channel], [], [], wait_after_exit)
-                except Exception:
-                    time.sleep(min(0.05, remaining if remaining > 0 else 0))
-
-                drained = False
-                if channel.recv_ready():
-                    data = channel.recv(32768)
-                    if data:
-                        new_lines, stdout_partial = _iter_channel_lines_from_bytes(data, stdout_partial)
-                        stdout_lines.extend(new_lines)
-                        if log:
-                            for line in new_lines:
-                                logger_in.info(line.rstrip("\n"))
-                        drained = True
-
-                if separate_stderr and channel.recv_stderr_ready():
-                    data = channel.recv_stderr(32768)
-                    if data:
-                        new_lines, stderr_partial = _iter_channel_lines_from_bytes(data, stderr_partial)
-                        stderr_lines.extend(new_lines)
-                        if log:
-                            for line in new_lines:
-                                logger_in.info(line.rstrip("\n"))
-                        drained = True
-
-                if drained:
-                    continue
+            if channel.eof_received or channel.closed:
                 break
 
-            # Avoid busy-waiting. Paramiko Channel supports fileno() on POSIX, so we can
-            # use select() to wait for activity up to a small slice of the remaining time.
-            remaining = deadline - now
-            if remaining <= 0:
+            if channel.exit_status_ready():
+                # The remote process has exited but the stream is still open, e.g. because
+                # a background child inherited it. Collect what is still in flight and stop.
+                if not activity.wait(min(_EXIT_GRACE, remaining)):
+                    break
                 continue
-            wait = min(0.5, remaining)
-            try:
-                select.select([channel], [], [], wait)
-            except Exception:
-                # Fallback: channel may not be selectable on some platforms.
-                time.sleep(min(0.05, remaining))
+
+            activity.wait(min(_IDLE_WAIT, remaining))
     except Exception as ex:
-        if stdout_partial:
-            stdout_lines.append(stdout_partial)
-        if stderr_partial:
-            stderr_lines.append(stderr_partial)
-        return stdout_lines, stderr_lines, ex
-
-    if stdout_partial:
-        stdout_lines.append(stdout_partial)
-    if stderr_partial:
-        stderr_lines.append(stderr_partial)
-    return stdout_lines, stderr_lines, ""
+        return stdout.finish(), stderr.finish(), ex
+
+    return stdout.finish(), stderr.finish(), ""
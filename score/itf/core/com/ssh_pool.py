@@ -0,0 +1,182 @@
+# *******************************************************************************
+# Copyright (c) 2026 Contributors to the Eclipse Foundation
+#
+# See the NOTICE file(s) distributed with this work for additional
+# information regarding copyright ownership.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Apache License Version 2.0 which is available at
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# SPDX-License-Identifier: Apache-2.0
+# *******************************************************************************
+import logging
+import threading
+
+from contextlib import contextmanager
+from typing import Callable, Optional
+
+from score.itf.core.com.ssh import Ssh
+from score.itf.core.utils.bunch import Bunch
+
+
+logger = logging.getLogger(__name__)
+
+
+class SshPool:
+    """Keeps authenticated SSH connections to a target alive and hands them out for reuse.
+
+    Paramiko multiplexes any number of channels over one transport, so pooled
+    connections are shared between callers instead of being checked out
+    exclusively. A new connection is only opened when every live connection is
+    in use and the pool has not reached its size yet.
+    """
+
+    def __init__(
+        self,
+        connection_factory: Callable[[], Ssh],
+        size: int = 1,
+        keep_alive_interval: Optional[int] = 10,
+    ):
+        """
+        :param callable connection_factory: Returns a new, not yet entered, :class:`Ssh` instance.
+        :param int size: Maximum number of connections kept open. Default is 1.
+        :param Optional[int] keep_alive_interval: Interval (in seconds) for transport keep-alive
+            messages, which let paramiko detect dead connections. None disables keep-alive. Default is 10.
+        """
+        if size < 1:
+            raise ValueError("SSH pool size must be at least 1")
+        self._connection_factory = connection_factory
+        self._size = size
+        self._keep_alive_interval = keep_alive_interval
+        self._connections = []
+        self._in_use = {}
+        self._lock = threading.Lock()
+        # Notified when a connection has been opened or failed to open.
+        self._connected = threading.Condition(self._lock)
+        self._connecting = 0
+        self._discarded = 0
+        self._hits = 0
+        self._misses = 0
+        self._reconnects = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    @contextmanager
+    def connection(self):
+        """Yield a live :class:`Ssh` connection from the pool."""
+        ssh = self._acquire()
+        try:
+            yield ssh
+        finally:
+            with self._lock:
+                if id(ssh) in self._in_use:
+                    self._in_use[id(ssh)] -= 1
+
+    def stats(self) -> Bunch:
+        """Return the pool counters.
+
+        ``hits`` counts requests served by an existing connection, ``misses``
+        requests that had to open a new one and ``reconnects`` the subset of
+        misses that replaced a dead or invalidated connection.
+        """
+        with self._lock:
+            return Bunch(
+                hits=self._hits,
+                misses=self._misses,
+                reconnects=self._reconnects,
+                connections=len(self._connections),
+            )
+
+    def invalidate(self):
+        """Close all pooled connections, e.g. because the target is about to restart.
+
+        Subsequent requests transparently reconnect.
+        """
+        with self._lock:
+            connections, self._connections = self._connections, []
+            self._in_use.clear()
+            self._discarded += len(connections)
+        for ssh in connections:
+            _close_quietly(ssh)
+
+    def close(self):
+        """Close all pooled connections and log the pool counters."""
+        self.invalidate()
+        stats = self.stats()
+        logger.info(f"SSH pool closed: hits={stats.hits}, misses={stats.misses}, reconnects={stats.reconnects}")
+
+    def _acquire(self):
+        with self._lock:
+            while True:
+                self._drop_dead_connections()
+
+                idle = [ssh for ssh in self._connections if self._in_use[id(ssh)] == 0]
+                full = len(self._connections) + self._connecting >= self._size
+                if idle or (full and self._connections):
+                    ssh = idle[0] if idle else min(self._connections, key=lambda c: self._in_use[id(c)])
+                    self._hits += 1
+                    self._in_use[id(ssh)] += 1
+                    return ssh
+                if not full:
+                    # Reserve the slot; the handshake runs without holding the lock.
+                    self._connecting += 1
+                    break
+                # Every slot is still connecting, wait for one of them.
+                self._connected.wait()
+
+        try:
+            ssh = self._connect()
+        except BaseException:
+            with self._lock:
+                self._connecting -= 1
+                self._connected.notify_all()
+            raise
+
+        with self._lock:
+            self._connecting -= 1
+            self._misses += 1
+            if self._discarded > 0:
+                self._discarded -= 1
+                self._reconnects += 1
+                logger.info("SSH pool re-established a connection")
+            self._connections.append(ssh)
+            self._in_use[id(ssh)] = 1
+            self._connected.notify_all()
+        return ssh
+
+    def _connect(self):
+        ssh = self._connection_factory().__enter__()
+        transport = ssh.get_paramiko_client().get_transport()
+        if transport and self._keep_alive_interval is not None:
+            transport.set_keepalive(self._keep_alive_interval)
+        return ssh
+
+    def _drop_dead_connections(self):
+        alive = []
+        for ssh in self._connections:
+            if _is_alive(ssh):
+                alive.append(ssh)
+                continue
+            logger.debug("SSH pool discards a connection whose transport is no longer active")
+            self._in_use.pop(id(ssh), None)
+            self._discarded += 1
+            _close_quietly(ssh)
+        self._connections = alive
+
+
+def _is_alive(ssh):
+    client = ssh.get_paramiko_client()
+    transport = client.get_transport() if client else None
+    return transport is not None and transport.is_active()
+
+
+def _close_quietly(ssh):
+    try:
+        ssh.__exit__(None, None, None)
+    except Exception:
+        logger.debug("Closing pooled SSH connection failed", exc_info=True)
@@ -52,10 +52,13 @@ class AsyncProcess(ABC):
         """
 
     @abstractmethod
-    def get_output(self) -> str:
+    def get_output(self, since: int = 0) -> str:
         """Return the captured stdout of the process.
 
         Output is accumulated as the process runs.  It is safe to call
         while the process is still executing (returns what has been
         captured so far) or after it has finished.
+
+        :param since: byte offset to start at, e.g. the ``bytes`` count of the
+            capture at an earlier call, to only get the output that followed.
         """
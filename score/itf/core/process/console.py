@@ -10,6 +10,8 @@
 #
 # SPDX-License-Identifier: Apache-2.0
 # *******************************************************************************
+import asyncio
+import concurrent.futures
 import logging
 import re
 import subprocess
@@ -22,9 +24,14 @@ from datetime import datetime
 from queue import Empty
 from typing import Optional
 
+from score.itf.core.process.event_loop import on_shared_loop, shared_loop
+from score.itf.core.process.io_hub import io_hub
+from score.itf.core.process.pattern_set import compile_patterns
+from score.itf.core.process.ring_buffer import DEFAULT_CAPACITY, LineRingBuffer
+
 
 class Console:
-    def __init__(self, name, reader, writer, print_logger=True, logfile=None):
+    def __init__(self, name, reader, writer, print_logger=True, logfile=None, history_bytes=DEFAULT_CAPACITY):
         """Initializes the Console instance.
 
         :param str name: Name of the console.
@@ -32,6 +39,7 @@ class Console:
         :param callable writer: Function to write commands to the console.
         :param bool print_logger: Flag to enable or disable logging to the console. Defaults to True.
         :param str logfile: Path to the log file for logging output. Defaults to None.
+        :param int history_bytes: Size of the buffer keeping the console output history. Defaults to 1 MiB.
         """
         self.name = name
         self.writer = writer
@@ -40,6 +48,7 @@ class Console:
             name=self.name,
             print_logger=print_logger,
             logfile=logfile,
+            history_bytes=history_bytes,
         )
         self.line_reader.start()
 
@@ -100,6 +109,9 @@ class Console:
     def add_expr_cbk(self, expr, cbk, regex=False):
         self.line_reader.add_expr_cbk(expr, cbk, regex)
 
+    def remove_expr_cbk(self, expr, cbk, regex=False):
+        self.line_reader.remove_expr_cbk(expr, cbk, regex)
+
     def _expect(self, cmd, msgs, timeout, regex=False, end_func=any, clear_history=True):
         if clear_history:
             self.clear_history()
@@ -138,6 +150,10 @@ class PipeConsole(Console):
     This class provides an interface for interacting with a subprocess through
     its stdin and stdout streams. It allows sending commands to the subprocess
     and reading its output with configurable timeout and logging options.
+
+    The output is read without a thread of its own on the shared event loop
+    (see :mod:`score.itf.core.process.event_loop`); :attr:`aio` gives access
+    to the same console from coroutines.
     """
 
     def __init__(
@@ -148,6 +164,7 @@ class PipeConsole(Console):
         linefeed: str = "\n",
         logfile: Optional[str] = None,
         print_logger: bool = True,
+        history_bytes: int = DEFAULT_CAPACITY,
     ) -> None:
         """Initializes the PipeConsole instance.
 
@@ -157,31 +174,13 @@ class PipeConsole(Console):
         :param str linefeed: Linefeed character(s) to use when sending commands. Defaults to '\n'.
         :param Optional[str] logfile: Path to the log file for logging output. Defaults to None.
         :param bool print_logger: Flag to enable or disable logging to the console. Defaults to True.
+        :param int history_bytes: Size of the buffer keeping the output history. Defaults to 1 MiB.
         """
         self._timeout = timeout
         self._linefeed = linefeed
         self._process = process
         self._logger = logging.getLogger(str(process))
 
-        def reader() -> Optional[str]:
-            """Reads a line from the process's stdout with a timeout.
-
-            Continuously checks if the process's stdout is ready for reading
-            and reads a line from it. If the read operation times out, it
-            returns None. If EOF is detected, it breaks the loop.
-
-            :returns: The decoded line from stdout or None if EOF is detected or a timeout occurs.
-            :rtype: Optional[str]
-            """
-            while True:
-                line = self._process.stdout.readline()
-                if not line:  # EOF detected
-                    break
-                if line.endswith(b"\n") or line.endswith(b"# "):
-                    return try_to_decode(line)
-            self._process.stdout.close()
-            return None
-
         def writer(command: str) -> None:
             """Writes a command to the process's stdin.
 
@@ -195,83 +194,175 @@ class PipeConsole(Console):
                 self._process.stdin.write(try_to_encode(command + "\n"))
                 self._process.stdin.flush()
 
-        super().__init__(name, reader, writer)
+        async def async_writer(command: str) -> None:
+            await asyncio.get_running_loop().run_in_executor(None, writer, command)
 
+        self.name = name
+        self.writer = writer
+        self.line_reader = AsyncLineReader(
+            process.stdout,
+            name=name,
+            print_logger=print_logger,
+            logfile=logfile,
+            history_bytes=history_bytes,
+        )
+        self.aio = AsyncConsole(name, self.line_reader, async_writer)
+        self.line_reader.start()
 
-class LineReader(threading.Thread):
-    """
-    This class launches a separate thread to read line-by-line
-    messages from a specific pipe that blocks, unblocking when
-    a new message is ready, or when the pipe is closing,
-    returning None. The messages are stored in a queue, and
-    can be later retrieved.
-    """
 
-    log_locks = {}
-    log_queues = {}
+class AsyncConsole:
+    """Coroutine interface of a console whose output is read by an :class:`AsyncLineReader`.
 
-    def __init__(self, readline_func, name, print_logger=True, logfile=None):
-        """Initializes the LineReader instance.
+    The coroutines can be awaited from any event loop; they run on the shared one.
+    """
 
-        :param callable readline_func: Function to read lines from the console.
+    def __init__(self, name, line_reader, writer):
+        """
         :param str name: Name of the console.
-        :param bool print_logger: Flag to enable or disable logging to the console. Defaults to True.
-        :param str logfile: Path to the log file for logging output. Defaults to None.
+        :param AsyncLineReader line_reader: Reader of the console output. It is started by the caller.
+        :param callable writer: Coroutine function writing a command to the console.
         """
-        super().__init__(name=name)
-        self.readline_func = readline_func
+        self.name = name
+        self.line_reader = line_reader
+        self._writer = writer
+
+    async def readline(self, timeout=None):
+        """Return the next line of output.
+
+        :param Optional[float] timeout: Maximum seconds to wait; None waits forever.
+        :raises TimeoutError: if no line arrived in time.
+        """
+        return await self.line_reader.readline_async(timeout)
+
+    async def write(self, command):
+        await on_shared_loop(self._writer(command))
+
+    async def expect(self, msgs, timeout, regex=False, end_func=any, cmd=None, clear_history=True):
+        """Wait until *end_func* of the expectations *msgs* is met by the output.
+
+        :param msgs: Expected literal or regex message, or a list of them.
+        :param float timeout: Maximum seconds to wait.
+        :param bool regex: Treat *msgs* as regular expressions. Default is False.
+        :param callable end_func: ``any`` or ``all`` of the messages must appear. Default is ``any``.
+        :param Optional[str] cmd: Command to write after skipping the output received so far.
+        :param bool clear_history: Ignore the output received before. Default is True.
+        :raises TimeoutError: if the expectation was not met in time.
+        """
+        if clear_history:
+            self.clear_history()
+        if cmd is not None:
+            await self.write(cmd)
+        if isinstance(msgs, str):
+            msgs = [msgs]
+        if await self.line_reader.read_cond_async(msgs, timeout, regex, end_func):
+            return True
+        raise TimeoutError(f"Failed expect {end_func.__name__}: {cmd}: {msgs}")
+
+    async def expect_any(self, msgs, timeout, regex=False, cmd=None, clear_history=True):
+        return await self.expect(msgs, timeout, regex, any, cmd, clear_history)
+
+    async def expect_all(self, msgs, timeout, regex=False, cmd=None, clear_history=True):
+        return await self.expect(msgs, timeout, regex, all, cmd, clear_history)
+
+    async def wait_closed(self):
+        """Wait until the end of the output was read."""
+        await self.line_reader.wait_closed()
+
+    def add_expr_cbk(self, expr, cbk, regex=False):
+        self.line_reader.add_expr_cbk(expr, cbk, regex)
+
+    def remove_expr_cbk(self, expr, cbk, regex=False):
+        self.line_reader.remove_expr_cbk(expr, cbk, regex)
+
+    def clear_history(self):
+        self.line_reader.clear_history()
+
+
+class _LineHandler:
+    """Line history, expectations and callbacks shared by :class:`LineReader` and :class:`AsyncLineReader`."""
+
+    log_locks = {}
+    log_queues = {}
+
+    def _init_lines(self, name, print_logger, logfile, history_bytes):
         self.name = name
         self.logger = logging.getLogger(name)
         self.print_logger = print_logger
         self._logfile = logfile
-        self._log_queue = LineReaderQueue(max_size=400)
+        self._history = LineRingBuffer(history_bytes)
         self._expr_cbks = defaultdict(lambda: [])
+        self._expr_cbks_lock = threading.Lock()
+        # Patterns of the callbacks, recompiled when callbacks are added or removed.
+        self._expr_cbks_patterns = None
         if logfile:
-            if logfile not in LineReader.log_locks:
-                LineReader.log_locks[logfile] = threading.Lock()
-                LineReader.log_queues[logfile] = LineReaderQueue(max_size=400)
-            self._log_queue = LineReader.log_queues[logfile]
-
-    def run(self):
-        with open(self._logfile, encoding="utf-8", mode="a") if self._logfile else nullcontext() as logfile:
-            while True:
+            if logfile not in _LineHandler.log_locks:
+                _LineHandler.log_locks[logfile] = threading.Lock()
+                _LineHandler.log_queues[logfile] = LineRingBuffer(history_bytes)
+            self._history = _LineHandler.log_queues[logfile]
+        self._cursor = self._history.cursor()
+
+    def _open_logfile(self):
+        return open(self._logfile, encoding="utf-8", mode="a") if self._logfile else nullcontext()
+
+    def _handle_line(self, line, logfile):
+        line, message = self._buffer_line(line)
+        self._process_line(line, message, logfile)
+
+    def _buffer_line(self, line):
+        """Clean up *line* and append it to the history. Return the line and its logfile entry."""
+        line = line.replace("\x00", "")
+        line = line.strip()
+        message = ""
+        if line:
+            message = f"[{datetime.now()}] [{self.name}] - {line}"
+        if self._logfile and "SIPDBG_02" not in self.name:
+            self._add_log(message)
+        else:
+            self._add_log(line)
+        return line, message
+
+    def _process_line(self, line, message, logfile):
+        """Log *line*, write *message* to the logfile and run the callbacks matching *line*."""
+        if self.print_logger:
+            self.logger.info(line)
+        if self._logfile:
+            with _LineHandler.log_locks[self._logfile]:
                 try:
-                    line = self.readline_func()
-                except Exception:
-                    line = None
-                if line is None:
-                    break
-                line = line.replace("\x00", "")
-                line = line.strip()
-                message = ""
-                if line:
-                    message = f"[{datetime.now()}] [{self.name}] - {line}"
-                if self.print_logger:
-                    self.logger.info(line)
-                if self._logfile:
-                    with LineReader.log_locks[self._logfile]:
-                        try:
-                            logfile.write(f"{message} \n")
-                            logfile.flush()
-                            if "SIPDBG_02" in self.name:
-                                message = line
-                            self._add_log(message)
-                        except Exception as exception:
-                            self.logger.error(f"Exception on write: {exception}")
-                else:
-                    self._add_log(line)
-
-                for expr, regex in self._expr_cbks:
-                    for cbk in self._expr_cbks[(expr, regex)]:
-                        if self._check_msg(line, expr, regex):
-                            cbk()
+                    logfile.write(f"{message} \n")
+                    logfile.flush()
+                except Exception as exception:
+                    self.logger.error(f"Exception on write: {exception}")
+        self._dispatch_expr_cbks(line)
 
     def add_expr_cbk(self, expr, cbk, regex=False):
-        self._expr_cbks[(expr, regex)].append(cbk)
+        with self._expr_cbks_lock:
+            self._expr_cbks[(expr, regex)].append(cbk)
+            self._expr_cbks_patterns = None
+
+    def remove_expr_cbk(self, expr, cbk, regex=False):
+        with self._expr_cbks_lock:
+            cbks = self._expr_cbks.get((expr, regex), [])
+            if cbk in cbks:
+                cbks.remove(cbk)
+            if not cbks:
+                self._expr_cbks.pop((expr, regex), None)
+            self._expr_cbks_patterns = None
+
+    def _dispatch_expr_cbks(self, line):
+        with self._expr_cbks_lock:
+            if not self._expr_cbks:
+                return
+            if self._expr_cbks_patterns is None:
+                self._expr_cbks_patterns = compile_patterns(tuple(self._expr_cbks))
+            patterns = self._expr_cbks_patterns
+            expr_cbks = [list(cbks) for cbks in self._expr_cbks.values()]
+        for pattern_id in sorted(patterns.matches(line)):
+            for cbk in expr_cbks[pattern_id]:
+                cbk()
 
     def read_cond(self, exprs, timeout=90, regex=False, end_func=any):
         start = time.time()
-        checks = [False] * len(exprs)
+        matcher = _CondMatcher(exprs, regex, end_func)
         while True:
             time_remaining = start - time.time() + timeout
             if time_remaining <= 0:
@@ -280,15 +371,30 @@ class LineReader(threading.Thread):
                 line = self.get_line(block=True, timeout=time_remaining)
             except Empty:
                 break
-            for i, expr in enumerate(exprs):
-                if self._check_msg(line, expr, regex):
-                    checks[i] = True
-            if end_func(checks):
+            if matcher.check(line):
                 return True
         return False
 
     def clear_history(self):
-        self._log_queue.clear()
+        """Skip the lines received so far. Other readers of the history are not affected."""
+        self._cursor.seek_end()
+
+    def reader(self, from_start=False):
+        """Return an independent reader of the line history.
+
+        :param bool from_start: Start at the oldest retained line instead of the next new one.
+        :rtype: RingCursor
+        """
+        return self._history.cursor(from_start)
+
+    def lines(self, since=0):
+        """Return the lines retained in the history, optionally from sequence number *since* on."""
+        return self._history.lines(since)
+
+    @property
+    def dropped_lines(self):
+        """Number of lines overwritten in the history before :meth:`get_line` returned them."""
+        return self._cursor.dropped
 
     def read_until(self, expr, timeout=90, regex=False):
         assert isinstance(expr, str)
@@ -310,63 +416,265 @@ class LineReader(threading.Thread):
         return self.read_until_all(exprs, timeout, regex=True)
 
     def get_line(self, block=False, timeout=None):
-        return self._log_queue.get(block=block, timeout=timeout)
+        return self._cursor.get(block=block, timeout=timeout)
 
     def _add_log(self, log):
-        self._log_queue.put(log)
+        self._history.append(log)
 
-    @staticmethod
-    def _check_msg(msg, expr, regex=False):
-        return (regex and re.search(expr, msg)) or (not regex and expr in msg)
 
+class _CondMatcher:
+    """Tracks which of the expressions of a ``read_cond`` call were seen."""
 
-class LineReaderQueue:
+    def __init__(self, exprs, regex, end_func):
+        self._patterns = compile_patterns(tuple((expr, regex) for expr in exprs))
+        self._end_func = end_func
+        self._checks = [False] * len(exprs)
+
+    def check(self, line):
+        if self._end_func is any:
+            return self._patterns.search(line)
+        for pattern_id in self._patterns.matches(line):
+            self._checks[pattern_id] = True
+        return self._end_func(self._checks)
+
+
+class LineReader(_LineHandler, threading.Thread):
     """
-    Thread-safe implementation of a queue.
-    When the queue is full, older items
-    are removed.
+    This class launches a separate thread to read line-by-line
+    messages from a specific pipe that blocks, unblocking when
+    a new message is ready, or when the pipe is closing,
+    returning None. The messages are stored in a queue, and
+    can be later retrieved.
     """
 
-    def __init__(self, max_size=0):
-        """Initializes the LineReaderQueue instance.
+    def __init__(self, readline_func, name, print_logger=True, logfile=None, history_bytes=DEFAULT_CAPACITY):
+        """Initializes the LineReader instance.
 
-        :param int max_size: Maximum size of the queue. If set to 0, the queue can grow indefinitely.
+        :param callable readline_func: Function to read lines from the console.
+        :param str name: Name of the console.
+        :param bool print_logger: Flag to enable or disable logging to the console. Defaults to True.
+        :param str logfile: Path to the log file for logging output. Defaults to None.
+        :param int history_bytes: Size of the buffer keeping the line history. Defaults to 1 MiB.
+            Readers sharing a logfile share the history of the first one.
         """
-        self.queue = deque()
-        self.max_size = max_size
-        self.mutex = threading.Lock()
-        self.not_empty = threading.Condition(self.mutex)
-
-    def put(self, item):
-        with self.mutex:
-            if self.max_size > 0 and len(self.queue) >= self.max_size:
-                self.queue.popleft()
-            self.queue.append(item)
-            self.not_empty.notify()
-
-    def get(self, block=True, timeout=None):
-        with self.not_empty:
-            if not block:
-                if len(self.queue) == 0:
-                    raise Empty
-            elif timeout is None:
-                while len(self.queue) == 0:
-                    self.not_empty.wait()
-            elif timeout < 0:
-                raise ValueError("'timeout' must be a non-negative number")
-            else:
-                endtime = time.time() + timeout
-                while len(self.queue) == 0:
-                    remaining = endtime - time.time()
-                    if remaining <= 0.0:
-                        raise Empty
-                    self.not_empty.wait(remaining)
-            item = self.queue.popleft()
-            return item
-
-    def clear(self):
-        with self.mutex:
-            self.queue.clear()
+        threading.Thread.__init__(self, name=name)
+        self.readline_func = readline_func
+        self._init_lines(name, print_logger, logfile, history_bytes)
+
+    def run(self):
+        with self._open_logfile() as logfile:
+            while True:
+                try:
+                    line = self.readline_func()
+                except Exception:
+                    line = None
+                if line is None:
+                    break
+                self._handle_line(line, logfile)
+
+
+class _LineDispatcher:
+    """Runs the functions submitted for one console in order on a thread pool shared by all consoles.
+
+    Keeps logging, logfile writes and user callbacks off the shared event loop, so that a
+    slow callback only delays its own console.
+    """
+
+    _pool = None
+    _pool_lock = threading.Lock()
+
+    def __init__(self, name):
+        self._name = name
+        self._pending = deque()
+        self._lock = threading.Lock()
+        self._scheduled = False
+
+    def submit(self, func, *args):
+        with self._lock:
+            self._pending.append((func, args))
+            if self._scheduled:
+                return
+            self._scheduled = True
+        self._get_pool().submit(self._drain)
+
+    def _drain(self):
+        while True:
+            with self._lock:
+                if not self._pending:
+                    self._scheduled = False
+                    return
+                func, args = self._pending.popleft()
+            try:
+                func(*args)
+            except Exception:
+                logging.getLogger(self._name).exception("Handling a line failed")
+
+    @classmethod
+    def _get_pool(cls):
+        with cls._pool_lock:
+            if cls._pool is None:
+                cls._pool = concurrent.futures.ThreadPoolExecutor(thread_name_prefix="itf-console")
+            return cls._pool
+
+
+class AsyncLineReader(_LineHandler):
+    """Reads the lines of a pipe or :class:`asyncio.StreamReader` on the shared event loop.
+
+    Pipes are read by the :class:`~score.itf.core.process.io_hub.IoHub`. Only the line
+    history is updated on the loop; logging, logfile writes and callbacks run in order
+    on a dispatcher thread, so they may block or call synchronous APIs of the framework.
+
+    Offers the synchronous interface of :class:`LineReader` and, for coroutines,
+    :meth:`readline_async` and :meth:`read_cond_async`.
+    """
+
+    def __init__(
+        self,
+        source,
+        name,
+        print_logger=True,
+        logfile=None,
+        history_bytes=DEFAULT_CAPACITY,
+        decode=None,
+        capture=None,
+    ):
+        """
+        :param source: Pipe file object (e.g. ``Popen.stdout``) or :class:`asyncio.StreamReader` to read.
+            None is treated as an empty stream.
+        :param str name: Name of the console.
+        :param bool print_logger: Flag to enable or disable logging to the console. Defaults to True.
+        :param str logfile: Path to the log file for logging output. Defaults to None.
+        :param int history_bytes: Size of the buffer keeping the line history. Defaults to 1 MiB.
+        :param callable decode: Converts the raw bytes of a line to text. Defaults to :func:`try_to_decode`.
+        :param OutputCapture capture: Optional capture receiving every line as well. It is closed at the end.
+        """
+        self._source = source
+        self._decode = decode or try_to_decode
+        self._capture = capture
+        self._done = concurrent.futures.Future()
+        self._log_handle = None
+        # Futures of coroutines waiting for the next line; only touched on the shared loop.
+        self._waiters = set()
+        self._closed = False
+        self._dispatcher = _LineDispatcher(name)
+        self._init_lines(name, print_logger, logfile, history_bytes)
+
+    def start(self):
+        if self._source is None:
+            self._finish()
+            return
+        self._log_handle = self._open_logfile().__enter__()
+        if isinstance(self._source, asyncio.StreamReader):
+            asyncio.run_coroutine_threadsafe(self._run(self._source), shared_loop())
+        else:
+            io_hub().register(self.name, self._source, self._on_line, on_close=self._on_close, decode=self._decode)
+
+    def is_alive(self):
+        return not self._done.done()
+
+    def join(self, timeout=None):
+        """Wait until the end of the stream was read and all its lines were handled."""
+        concurrent.futures.wait([self._done], timeout)
+
+    async def wait_closed(self):
+        await asyncio.wrap_future(self._done)
+
+    async def readline_async(self, timeout=None):
+        """Return the next line, like :meth:`get_line` with ``block=True``.
+
+        :raises TimeoutError: if no line arrived in time.
+        """
+        return await on_shared_loop(self._next_line(self._cursor, timeout))
+
+    async def read_cond_async(self, exprs, timeout=90, regex=False, end_func=any):
+        """Coroutine version of :meth:`read_cond`."""
+        return await on_shared_loop(self._read_cond(exprs, timeout, regex, end_func))
+
+    async def _read_cond(self, exprs, timeout, regex, end_func):
+        deadline = time.monotonic() + timeout
+        matcher = _CondMatcher(exprs, regex, end_func)
+        while True:
+            try:
+                line = await self._next_line(self._cursor, deadline - time.monotonic())
+            except TimeoutError:
+                return False
+            if matcher.check(line):
+                return True
+
+    async def _next_line(self, cursor, timeout):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        loop = asyncio.get_running_loop()
+        while True:
+            try:
+                return cursor.get(block=False)
+            except Empty:
+                pass
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if self._closed or (remaining is not None and remaining <= 0):
+                raise TimeoutError(f"No line from {self.name} within {timeout} seconds")
+            waiter = loop.create_future()
+            self._waiters.add(waiter)
+            try:
+                await asyncio.wait_for(waiter, remaining)
+            except asyncio.TimeoutError:
+                pass
+            finally:
+                self._waiters.discard(waiter)
+
+    def _on_line(self, line):
+        if self._capture is not None:
+            self._capture.append_line(line)
+        line, message = self._buffer_line(line)
+        self._wake_waiters()
+        self._dispatcher.submit(self._process_line, line, message, self._log_handle)
+
+    def _on_close(self):
+        try:
+            if hasattr(self._source, "close"):
+                self._source.close()
+        finally:
+            self._finish()
+
+    async def _run(self, stream):
+        traffic = io_hub().track(self.name)
+        try:
+            while True:
+                try:
+                    data = await stream.readline()
+                except ValueError:
+                    self.logger.warning(f"Skipped a line longer than {stream._limit} bytes")
+                    continue
+                except Exception:
+                    break
+                if not data:
+                    break
+                traffic.record(data)
+                self._on_line(self._decode(data))
+        finally:
+            traffic.finish()
+            self._finish()
+
+    def _finish(self):
+        if self._capture is not None:
+            self._capture.close()
+        self._closed = True
+        self._wake_waiters()
+        # Completes after the lines handed to the dispatcher before.
+        self._dispatcher.submit(self._complete)
+
+    def _complete(self):
+        try:
+            if self._log_handle is not None:
+                self._log_handle.close()
+        finally:
+            if not self._done.done():
+                self._done.set_result(None)
+
+    def _wake_waiters(self):
+        for waiter in self._waiters:
+            if not waiter.done():
+                waiter.set_result(None)
+        self._waiters.clear()
 
 
 def try_to_encode(data, encoding="ascii"):
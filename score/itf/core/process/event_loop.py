@@ -0,0 +1,76 @@
+# *******************************************************************************
+# Copyright (c) 2026 Contributors to the Eclipse Foundation
+#
+# See the NOTICE file(s) distributed with this work for additional
+# information regarding copyright ownership.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Apache License Version 2.0 which is available at
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# SPDX-License-Identifier: Apache-2.0
+# *******************************************************************************
+"""The asyncio event loop shared by all consoles and processes of a test session.
+
+The loop runs in a daemon thread that is started on first use. Synchronous code
+submits coroutines with :func:`run_coroutine`; coroutines running on another
+loop (e.g. in an async test) await the shared loop with :func:`on_shared_loop`.
+"""
+
+import asyncio
+import threading
+
+from typing import Awaitable, Optional, TypeVar
+
+
+T = TypeVar("T")
+
+_lock = threading.Lock()
+_loop = None
+
+
+def shared_loop() -> asyncio.AbstractEventLoop:
+    """Return the shared event loop, starting its thread if needed."""
+    global _loop  # pylint: disable=global-statement
+    with _lock:
+        if _loop is None or _loop.is_closed():
+            loop = asyncio.new_event_loop()
+            started = threading.Event()
+            loop.call_soon(started.set)
+            threading.Thread(target=loop.run_forever, name="itf-event-loop", daemon=True).start()
+            started.wait()
+            _loop = loop
+        return _loop
+
+
+def run_coroutine(coro: Awaitable[T], timeout: Optional[float] = None) -> T:
+    """Run *coro* on the shared loop and wait for its result.
+
+    :raises RuntimeError: if called from the shared loop itself, which would deadlock.
+    :raises concurrent.futures.TimeoutError: if *timeout* elapses first; the coroutine is cancelled.
+    """
+    loop = shared_loop()
+    if _running_loop() is loop:
+        coro.close()
+        raise RuntimeError("run_coroutine() must not be called from the shared event loop")
+    future = asyncio.run_coroutine_threadsafe(coro, loop)
+    try:
+        return future.result(timeout)
+    except BaseException:
+        future.cancel()
+        raise
+
+
+async def on_shared_loop(coro: Awaitable[T]) -> T:
+    """Await *coro* on the shared loop, from the shared loop or any other one."""
+    loop = shared_loop()
+    if _running_loop() is loop:
+        return await coro
+    return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(coro, loop))
+
+
+def _running_loop():
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
@@ -0,0 +1,224 @@
+# *******************************************************************************
+# Copyright (c) 2026 Contributors to the Eclipse Foundation
+#
+# See the NOTICE file(s) distributed with this work for additional
+# information regarding copyright ownership.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Apache License Version 2.0 which is available at
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# SPDX-License-Identifier: Apache-2.0
+# *******************************************************************************
+"""One thread reading the output of all consoles and asynchronously executed commands.
+
+Streams (pipes, sockets, paramiko channels - anything with a ``fileno()``) are
+registered with the :class:`IoHub`, which watches them with the selector of the
+shared event loop (see :mod:`score.itf.core.process.event_loop`) and hands
+complete lines to a callback. Nothing sleeps or polls, and the number of
+threads does not grow with the number of streams.
+"""
+
+import logging
+import os
+import ssl
+import threading
+import time
+
+from typing import Callable, Optional
+
+from score.itf.core.process.event_loop import shared_loop
+from score.itf.core.utils.bunch import Bunch
+
+
+logger = logging.getLogger(__name__)
+
+_CHUNK_SIZE = 64 * 1024
+# Longer lines are split, so that a stream without line breaks cannot exhaust the memory.
+_MAX_LINE = 1024 * 1024
+# Errors meaning that a non-blocking source has no data right now.
+_NO_DATA = (BlockingIOError, InterruptedError, TimeoutError, ssl.SSLWantReadError)
+
+
+class IoStream:
+    """A stream read by the :class:`IoHub`, with its traffic statistics."""
+
+    def __init__(self, name, read, on_line, on_close, decode):
+        self.name = name
+        self.bytes = 0
+        self.lines = 0
+        self._read = read
+        self._on_line = on_line
+        self._on_close = on_close
+        self._decode = decode
+        self._fd = None
+        self._partial = b""
+        self._started = time.monotonic()
+        self._ended = None
+        self._closed = threading.Event()
+
+    @property
+    def closed(self) -> bool:
+        return self._closed.is_set()
+
+    def join(self, timeout: Optional[float] = None) -> bool:
+        """Wait until the end of the stream was read. Return False on timeout."""
+        return self._closed.wait(timeout)
+
+    def rate(self) -> float:
+        """Average number of bytes per second since the stream was registered, until it ended."""
+        elapsed = (self._ended or time.monotonic()) - self._started
+        return self.bytes / elapsed if elapsed > 0 else 0.0
+
+    def stats(self) -> Bunch:
+        return Bunch(name=self.name, bytes=self.bytes, lines=self.lines, rate=self.rate(), open=not self.closed)
+
+    def record(self, data: bytes) -> None:
+        """Account for *data* read by the owner of a stream registered with :meth:`IoHub.track`."""
+        self.bytes += len(data)
+        self.lines += data.count(b"\n")
+
+    def finish(self) -> None:
+        """Mark the end of a stream registered with :meth:`IoHub.track`."""
+        if not self.closed:
+            self._ended = time.monotonic()
+            self._closed.set()
+
+    def _feed(self, data):
+        self.bytes += len(data)
+        self._partial += data
+        *lines, self._partial = self._partial.split(b"\n")
+        if len(self._partial) > _MAX_LINE:
+            lines.append(self._partial)
+            self._partial = b""
+        for line in lines:
+            self._emit(line)
+
+    def _emit(self, line):
+        self.lines += 1
+        try:
+            self._on_line(self._decode(line))
+        except Exception:
+            logger.exception(f"Handling a line of {self.name} failed")
+
+    def _end(self):
+        if self._partial:
+            self._emit(self._partial)
+            self._partial = b""
+        try:
+            if self._on_close is not None:
+                self._on_close()
+        except Exception:
+            logger.exception(f"Closing {self.name} failed")
+        finally:
+            self.finish()
+
+
+class IoHub:
+    """Reads registered streams on the shared event loop and dispatches their lines."""
+
+    def __init__(self, loop=None):
+        self._loop = loop or shared_loop()
+        self._lock = threading.Lock()
+        self._streams = []
+
+    def register(
+        self,
+        name: str,
+        source,
+        on_line: Callable[[str], None],
+        read: Optional[Callable[[int], Optional[bytes]]] = None,
+        on_close: Optional[Callable[[], None]] = None,
+        decode: Optional[Callable[[bytes], str]] = None,
+        initial: bytes = b"",
+    ) -> IoStream:
+        """Start reading *source*.
+
+        :param str name: Name of the stream in logs and statistics.
+        :param source: File descriptor or object with a ``fileno()`` that is readable when data is available.
+        :param callable on_line: Called on the event loop for every line, without the line break.
+        :param callable read: ``read(size)`` returns up to *size* bytes without blocking, ``b""`` at the
+            end of the stream and None if no data is available (yet). By default, *source* is set to
+            non-blocking mode and read with :func:`os.read`.
+        :param callable on_close: Called on the event loop after the last line.
+        :param callable decode: Converts a line to text. Default is UTF-8 with replacement characters.
+        :param bytes initial: Data already read from *source* by the caller, handled before anything else.
+        """
+        fd = source if isinstance(source, int) else source.fileno()
+        if read is None:
+            os.set_blocking(fd, False)
+
+            def read(size):
+                return os.read(fd, size)
+
+        stream = IoStream(name, read, on_line, on_close, decode or _decode_utf8)
+        stream._fd = fd
+        with self._lock:
+            self._streams.append(stream)
+        self._loop.call_soon_threadsafe(self._add, stream, initial)
+        return stream
+
+    def track(self, name: str) -> IoStream:
+        """Include a stream read by other means in the statistics.
+
+        The owner reports its data with :meth:`IoStream.record` and its end with :meth:`IoStream.finish`.
+        """
+        stream = IoStream(name, None, None, None, None)
+        with self._lock:
+            self._streams.append(stream)
+        return stream
+
+    def unregister(self, stream: IoStream) -> None:
+        """Stop reading *stream*. Its pending partial line is delivered and ``on_close`` is called."""
+        if stream._fd is not None:
+            self._loop.call_soon_threadsafe(self._close, stream)
+
+    def stats(self) -> Bunch:
+        """Return the number of ``threads`` of the process and the statistics of all open ``streams``."""
+        with self._lock:
+            self._streams = [stream for stream in self._streams if not stream.closed]
+            streams = [stream.stats() for stream in self._streams]
+        return Bunch(threads=threading.active_count(), streams=streams)
+
+    def _add(self, stream, initial):
+        if initial:
+            stream._feed(initial)
+        self._loop.add_reader(stream._fd, self._on_readable, stream)
+
+    def _on_readable(self, stream):
+        try:
+            data = stream._read(_CHUNK_SIZE)
+        except _NO_DATA:
+            return
+        except OSError:
+            logger.debug(f"Reading {stream.name} failed", exc_info=True)
+            data = b""
+        if data is None:
+            return
+        if not data:
+            self._close(stream)
+            return
+        stream._feed(data)
+
+    def _close(self, stream):
+        if stream.closed:
+            return
+        self._loop.remove_reader(stream._fd)
+        stream._end()
+
+
+_hub = None
+_hub_lock = threading.Lock()
+
+
+def io_hub() -> IoHub:
+    """Return the hub shared by all streams of the session."""
+    global _hub  # pylint: disable=global-statement
+    with _hub_lock:
+        if _hub is None:
+            _hub = IoHub()
+        return _hub
+
+
+def _decode_utf8(data):
+    return data.decode("utf-8", "replace")
@@ -0,0 +1,155 @@
+# *******************************************************************************
+# Copyright (c) 2026 Contributors to the Eclipse Foundation
+#
+# See the NOTICE file(s) distributed with this work for additional
+# information regarding copyright ownership.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Apache License Version 2.0 which is available at
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# SPDX-License-Identifier: Apache-2.0
+# *******************************************************************************
+import asyncio
+import logging
+import os
+
+from typing import List, Optional
+
+from score.itf.core.process.async_process import AsyncProcess
+from score.itf.core.process.console import AsyncConsole, AsyncLineReader, try_to_encode
+from score.itf.core.process.event_loop import on_shared_loop, run_coroutine
+from score.itf.core.process.output_capture import OutputCapture
+from score.itf.core.process.ring_buffer import DEFAULT_CAPACITY
+
+
+logger = logging.getLogger(__name__)
+
+
+class LocalAsyncProcess(AsyncProcess):
+    """Process on the test host, run with :mod:`asyncio.subprocess` on the shared event loop.
+
+    The synchronous :class:`AsyncProcess` methods are a facade over the coroutines
+    :meth:`wait_async` and :meth:`stop_async`. The output (stdout and stderr) is
+    available through :attr:`console` and, completely, through :attr:`output`.
+
+    Use :meth:`start` from synchronous code and :meth:`spawn` from coroutines.
+    """
+
+    def __init__(self, process: asyncio.subprocess.Process, console: AsyncConsole, output: OutputCapture):
+        self._process = process
+        self.console = console
+        self.output = output
+
+    @classmethod
+    def start(cls, args: List[str], cwd: Optional[str] = None, env=None, name=None, **kwargs) -> "LocalAsyncProcess":
+        """Start *args* and return its handle. See :meth:`spawn` for the parameters."""
+        return run_coroutine(cls.spawn(args, cwd=cwd, env=env, name=name, **kwargs))
+
+    @classmethod
+    async def spawn(
+        cls,
+        args: List[str],
+        cwd: Optional[str] = None,
+        env=None,
+        name: Optional[str] = None,
+        print_logger: bool = True,
+        logfile: Optional[str] = None,
+        history_bytes: int = DEFAULT_CAPACITY,
+    ) -> "LocalAsyncProcess":
+        """Start *args* and return its handle.
+
+        :param list args: Binary and its arguments.
+        :param Optional[str] cwd: Working directory. Default is the current one.
+        :param dict env: Environment. Default is the environment of the test.
+        :param Optional[str] name: Name of the console and logger. Default is the binary name.
+        :param bool print_logger: Log every output line. Default is True.
+        :param Optional[str] logfile: Path of a file to append the output to.
+        :param int history_bytes: Size of the buffer keeping the output. Default is 1 MiB.
+        """
+        return await on_shared_loop(cls._spawn(args, cwd, env, name, print_logger, logfile, history_bytes))
+
+    @classmethod
+    async def _spawn(cls, args, cwd, env, name, print_logger, logfile, history_bytes):
+        name = name or os.path.basename(args[0])
+        logger.info(f"Starting process: {' '.join(args)}")
+        process = await asyncio.create_subprocess_exec(
+            *args,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.STDOUT,
+            cwd=cwd,
+            env=env,
+            start_new_session=True,
+        )
+
+        async def writer(command):
+            process.stdin.write(try_to_encode(command + "\n"))
+            await process.stdin.drain()
+
+        output = OutputCapture(name)
+        line_reader = AsyncLineReader(
+            process.stdout,
+            name=name,
+            print_logger=print_logger,
+            logfile=logfile,
+            history_bytes=history_bytes,
+            capture=output,
+        )
+        line_reader.start()
+        return cls(process, AsyncConsole(name, line_reader, writer), output)
+
+    def pid(self) -> int:
+        return self._process.pid
+
+    def is_running(self) -> bool:
+        return self._process.returncode is None
+
+    def get_exit_code(self) -> int:
+        return self._process.returncode
+
+    def stop(self) -> int:
+        return run_coroutine(self.stop_async())
+
+    def wait(self, timeout_s: float = 15) -> int:
+        return run_coroutine(self.wait_async(timeout_s))
+
+    def get_output(self, since: int = 0) -> str:
+        return self.output.get_output(since)
+
+    async def wait_async(self, timeout_s: Optional[float] = None) -> int:
+        """Wait until the process finished and its output was read.
+
+        :param Optional[float] timeout_s: Maximum seconds to wait; None waits forever.
+        :raises RuntimeError: on timeout.
+        """
+        return await on_shared_loop(self._wait(timeout_s))
+
+    async def stop_async(self, grace: float = 5) -> int:
+        """Terminate the process, killing it if it did not exit within *grace* seconds.
+
+        :return: exit code of the stopped process.
+        """
+        return await on_shared_loop(self._stop(grace))
+
+    async def _wait(self, timeout_s):
+        try:
+            await asyncio.wait_for(self._process.wait(), timeout_s)
+            # The pipe is closed at the latest when the process exited, unless it was inherited by children.
+            await asyncio.wait_for(self.console.wait_closed(), timeout_s)
+        except asyncio.TimeoutError as error:
+            raise RuntimeError(f"Process {self._process.pid} did not finish within {timeout_s} seconds") from error
+        return self._process.returncode
+
+    async def _stop(self, grace):
+        if self._process.returncode is None:
+            try:
+                self._process.terminate()
+                await asyncio.wait_for(self._process.wait(), grace)
+            except ProcessLookupError:
+                pass
+            except asyncio.TimeoutError:
+                logger.info(f"Process {self._process.pid} could not be stopped with SIGTERM, sending SIGKILL")
+                self._process.kill()
+                await self._process.wait()
+        return self._process.returncode
@@ -0,0 +1,152 @@
+# *******************************************************************************
+# Copyright (c) 2026 Contributors to the Eclipse Foundation
+#
+# See the NOTICE file(s) distributed with this work for additional
+# information regarding copyright ownership.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Apache License Version 2.0 which is available at
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# SPDX-License-Identifier: Apache-2.0
+# *******************************************************************************
+import logging
+import os
+import re
+import tempfile
+import threading
+
+from typing import Optional
+
+from score.itf.core.utils.bazel import get_output_dir
+
+
+logger = logging.getLogger(__name__)
+
+# Output kept in memory once the stream was spilled to disk.
+DEFAULT_TAIL_BYTES = 1024 * 1024
+# Size after which the stream is spilled to a file.
+DEFAULT_SPILL_BYTES = 8 * 1024 * 1024
+
+
+class OutputCapture:
+    """Captured output of a command, with bounded memory use.
+
+    Lines are kept in memory until the output exceeds *spill_bytes*. From then on, the
+    whole stream is written to a file in the test output directory (see
+    :func:`~score.itf.core.utils.bazel.get_output_dir`) and only the last *tail_bytes*
+    stay in memory. Positions in the output are byte offsets of its UTF-8 encoding, see
+    :meth:`get_output`.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        tail_bytes: int = DEFAULT_TAIL_BYTES,
+        spill_bytes: int = DEFAULT_SPILL_BYTES,
+        spill_dir: Optional[str] = None,
+    ):
+        """
+        :param str name: Name of the output, used in the name of the spill file.
+        :param int tail_bytes: Bytes kept in memory after spilling.
+        :param int spill_bytes: Bytes kept in memory before the output is spilled to disk.
+        :param Optional[str] spill_dir: Directory of the spill file. Default is the test output directory.
+        """
+        self.name = name
+        self._tail_bytes = tail_bytes
+        self._spill_bytes = max(spill_bytes, tail_bytes)
+        self._spill_dir = spill_dir
+        self._lock = threading.Lock()
+        self._buffer = bytearray()
+        # Offset of the first byte in the buffer.
+        self._buffer_start = 0
+        self._bytes = 0
+        self._lines = 0
+        self._spill = None
+        self._spill_failed = False
+        # Path of the file the output is spilled to, None while it fits into memory.
+        self.spill_path = None
+
+    @property
+    def bytes(self) -> int:
+        """Number of bytes captured so far. Pass it as ``since`` to only get the output that follows."""
+        return self._bytes
+
+    @property
+    def lines(self) -> int:
+        """Number of lines captured so far."""
+        return self._lines
+
+    def append_line(self, line: str) -> None:
+        data = line.encode("utf-8", "replace") + b"\n"
+        with self._lock:
+            self._bytes += len(data)
+            self._lines += 1
+            self._buffer += data
+            if self._spill is not None:
+                self._spill.write(data)
+            if len(self._buffer) > self._spill_bytes:
+                self._trim()
+
+    def get_output(self, since: int = 0) -> str:
+        """Return the output from byte offset *since* on.
+
+        Output that is no longer in memory is read from the spill file. If the output
+        could not be spilled, it starts with the oldest line still in memory.
+        """
+        with self._lock:
+            start = max(since - self._buffer_start, 0)
+            data = bytes(self._buffer[start:])
+            if since >= self._buffer_start or self._spill is None:
+                return data.decode("utf-8", "replace")
+            self._spill.flush()
+            with open(self.spill_path, "rb") as spilled:
+                spilled.seek(since)
+                head = spilled.read(self._buffer_start - since)
+            return (head + data).decode("utf-8", "replace")
+
+    def close(self) -> None:
+        """Close the spill file. The captured output stays readable."""
+        with self._lock:
+            if self._spill is not None:
+                self._spill.close()
+                self._spill = _ClosedSpill()
+
+    def _trim(self):
+        if self._spill is None and not self._spill_failed:
+            self._open_spill()
+        # Keep complete lines only.
+        cut = len(self._buffer) - self._tail_bytes
+        newline = self._buffer.find(b"\n", cut - 1)
+        cut = newline + 1 if newline >= 0 else cut
+        del self._buffer[:cut]
+        self._buffer_start += cut
+
+    def _open_spill(self):
+        try:
+            directory = self._spill_dir or get_output_dir()
+        except RuntimeError:
+            directory = None
+        safe_name = re.sub(r"[^\w.-]", "_", self.name)
+        try:
+            if directory is None:
+                raise OSError("no output directory")
+            fd, path = tempfile.mkstemp(prefix=f"{safe_name}-", suffix=".log", dir=directory)
+            self._spill = os.fdopen(fd, "wb")
+            self._spill.write(self._buffer)
+            self.spill_path = path
+            logger.info(f"Output of {self.name} exceeds {self._spill_bytes} bytes, writing it to {path}")
+        except OSError as error:
+            # Keep only the tail from now on.
+            self._spill_failed = True
+            logger.warning(f"Output of {self.name} cannot be spilled to disk ({error}), keeping only its tail")
+
+
+class _ClosedSpill:
+    """Stands in for the spill file after :meth:`OutputCapture.close`."""
+
+    def write(self, data):
+        pass
+
+    def flush(self):
+        pass
@@ -0,0 +1,125 @@
+# *******************************************************************************
+# Copyright (c) 2026 Contributors to the Eclipse Foundation
+#
+# See the NOTICE file(s) distributed with this work for additional
+# information regarding copyright ownership.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Apache License Version 2.0 which is available at
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# SPDX-License-Identifier: Apache-2.0
+# *******************************************************************************
+"""Matching many console expectations against a line.
+
+Each pattern is compiled once: literals are checked with ``in`` and regular
+expressions with their precompiled :class:`re.Pattern`, both running in C.
+Only large literal sets are looked up with an Aho–Corasick automaton, whose
+pure-Python walk costs about the same for any number of literals and beats
+the ``in`` checks once there are a few hundred of them.
+"""
+
+import collections
+import functools
+import re
+
+from typing import Iterable, Set, Tuple
+
+
+# Number of literals from which the automaton is faster than checking each literal with ``in``.
+AUTOMATON_MIN_LITERALS = 200
+
+
+class PatternSet:
+    """Precompiled set of literal and regex patterns.
+
+    Pattern ids are the positions of the patterns in the list passed to the constructor.
+    """
+
+    def __init__(self, patterns: Iterable[Tuple[str, bool]]):
+        """
+        :param patterns: ``(expr, regex)`` pairs. Literals match if they occur in the line,
+            regexes if :func:`re.search` finds them.
+        :raises re.error: if a regex is invalid.
+        """
+        self.patterns = list(patterns)
+        self._literals = [(pid, expr) for pid, (expr, regex) in enumerate(self.patterns) if not regex]
+        self._regexes = [(pid, re.compile(expr)) for pid, (expr, regex) in enumerate(self.patterns) if regex]
+        self._automaton = _Automaton(self._literals) if len(self._literals) >= AUTOMATON_MIN_LITERALS else None
+
+    def __len__(self) -> int:
+        return len(self.patterns)
+
+    def matches(self, line: str) -> Set[int]:
+        """Return the ids of all patterns matching *line*."""
+        if self._automaton is not None:
+            found = set(self._automaton.search(line))
+        else:
+            found = {pid for pid, expr in self._literals if expr in line}
+        found.update(pid for pid, compiled in self._regexes if compiled.search(line))
+        return found
+
+    def search(self, line: str) -> bool:
+        """Return True if any pattern matches *line*."""
+        if self._automaton is not None:
+            if self._automaton.search(line, first=True):
+                return True
+        elif any(expr in line for _, expr in self._literals):
+            return True
+        return any(compiled.search(line) for _, compiled in self._regexes)
+
+
+@functools.lru_cache(maxsize=128)
+def compile_patterns(patterns: Tuple[Tuple[str, bool], ...]) -> PatternSet:
+    """Return the :class:`PatternSet` of *patterns*, reusing sets compiled before."""
+    return PatternSet(patterns)
+
+
+class _Automaton:
+    """Aho–Corasick automaton over the characters of a set of literals."""
+
+    def __init__(self, literals):
+        self._goto = [{}]
+        self._outputs = [[]]
+        for pid, literal in literals:
+            node = 0
+            for char in literal:
+                nxt = self._goto[node].get(char)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[node][char] = nxt
+                    self._goto.append({})
+                    self._outputs.append([])
+                node = nxt
+            self._outputs[node].append(pid)
+        # Empty literals are in every line.
+        self._always = self._outputs[0]
+        self._outputs[0] = []
+        self._fail = [0] * len(self._goto)
+        pending = collections.deque(self._goto[0].values())
+        while pending:
+            node = pending.popleft()
+            for char, child in self._goto[node].items():
+                pending.append(child)
+                fallback = self._fail[node]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[child] = target if target != child else 0
+                self._outputs[child] = self._outputs[child] + self._outputs[self._fail[child]]
+
+    def search(self, text, first=False):
+        found = list(self._always)
+        if found and first:
+            return found
+        goto, fail, outputs = self._goto, self._fail, self._outputs
+        node = 0
+        for char in text:
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            if outputs[node]:
+                found.extend(outputs[node])
+                if first:
+                    break
+        return found
@@ -0,0 +1,170 @@
+# *******************************************************************************
+# Copyright (c) 2026 Contributors to the Eclipse Foundation
+#
+# See the NOTICE file(s) distributed with this work for additional
+# information regarding copyright ownership.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Apache License Version 2.0 which is available at
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# SPDX-License-Identifier: Apache-2.0
+# *******************************************************************************
+import collections
+import threading
+import time
+
+from queue import Empty
+from typing import Optional
+
+
+DEFAULT_CAPACITY = 1024 * 1024
+
+
+class LineRingBuffer:
+    """Bounded history of text lines stored as UTF-8 in a preallocated byte ring.
+
+    Every line gets a sequence number. Readers consume the history through their
+    own :class:`RingCursor`, so several consumers can wait for lines independently
+    and skipping ahead (see :meth:`RingCursor.seek_end`) does not affect the others.
+    When the ring is full, the oldest lines are overwritten; cursors that had not
+    read them yet count them as dropped.
+    """
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY):
+        """
+        :param int capacity: Size of the ring in bytes. Lines longer than this are truncated.
+        """
+        if capacity < 1:
+            raise ValueError("Ring buffer capacity must be at least 1 byte")
+        self._buffer = bytearray(capacity)
+        self._capacity = capacity
+        # (start, length) of every retained line, oldest first.
+        self._offsets = collections.deque()
+        self._first = 0
+        self._write = 0
+        self._used = 0
+        self._evicted = 0
+        self._waiters = 0
+        self._cond = threading.Condition(threading.Lock())
+
+    @property
+    def capacity(self) -> int:
+        return self._capacity
+
+    @property
+    def first(self) -> int:
+        """Sequence number of the oldest retained line."""
+        with self._cond:
+            return self._first
+
+    @property
+    def end(self) -> int:
+        """Sequence number the next line will get."""
+        with self._cond:
+            return self._first + len(self._offsets)
+
+    @property
+    def evicted(self) -> int:
+        """Number of lines overwritten since the buffer was created."""
+        with self._cond:
+            return self._evicted
+
+    def append(self, line: str) -> int:
+        """Add a line and return its sequence number."""
+        data = line.encode("utf-8", "replace")[: self._capacity]
+        size = len(data)
+        with self._cond:
+            # Every line is charged one extra byte, so that empty lines are bounded as well.
+            while self._offsets and self._used + size + 1 > self._capacity:
+                self._used -= self._offsets.popleft()[1] + 1
+                self._first += 1
+                self._evicted += 1
+            start = self._write
+            head = min(size, self._capacity - start)
+            self._buffer[start : start + head] = data[:head]
+            if head < size:
+                self._buffer[: size - head] = data[head:]
+            self._write = (start + size) % self._capacity
+            self._used += size + 1
+            self._offsets.append((start, size))
+            sequence = self._first + len(self._offsets) - 1
+            # Waking waiters is the expensive part, so only do it when someone is waiting.
+            if self._waiters:
+                self._cond.notify_all()
+            return sequence
+
+    def cursor(self, from_start: bool = False) -> "RingCursor":
+        """Return a new reader positioned at the end of the history, or at its oldest line."""
+        return RingCursor(self, self.first if from_start else self.end)
+
+    def lines(self, since: int = 0) -> list:
+        """Return the retained lines with a sequence number of at least *since*."""
+        with self._cond:
+            start = max(since, self._first) - self._first
+            return [self._decode(self._offsets[index]) for index in range(start, len(self._offsets))]
+
+    def clear(self) -> None:
+        """Drop all retained lines. Sequence numbers keep increasing."""
+        with self._cond:
+            self._first += len(self._offsets)
+            self._offsets.clear()
+            self._used = 0
+
+    def _read(self, position, block, timeout):
+        """Return ``(line, next_position, dropped)`` for the first line at or after *position*."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while position >= self._first + len(self._offsets):
+                if not block:
+                    raise Empty
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise Empty
+                self._waiters += 1
+                try:
+                    self._cond.wait(remaining)
+                finally:
+                    self._waiters -= 1
+            dropped = max(self._first - position, 0)
+            position = max(position, self._first)
+            return self._decode(self._offsets[position - self._first]), position + 1, dropped
+
+    def _decode(self, offset):
+        start, size = offset
+        end = start + size
+        if end <= self._capacity:
+            data = self._buffer[start:end]
+        else:
+            data = self._buffer[start:] + self._buffer[: end - self._capacity]
+        return data.decode("utf-8", "replace")
+
+
+class RingCursor:
+    """Read position of one consumer of a :class:`LineRingBuffer`."""
+
+    def __init__(self, ring: LineRingBuffer, position: int):
+        self._ring = ring
+        self.position = position
+        self.dropped = 0
+
+    def get(self, block: bool = True, timeout: Optional[float] = None) -> str:
+        """Return the next line.
+
+        :param bool block: Wait for a line if there is none. Default is True.
+        :param Optional[float] timeout: Maximum seconds to wait; None waits forever.
+        :raises queue.Empty: if no line is available in time.
+        """
+        if timeout is not None and timeout < 0:
+            raise ValueError("'timeout' must be a non-negative number")
+        line, self.position, dropped = self._ring._read(self.position, block, timeout)
+        self.dropped += dropped
+        return line
+
+    def seek_end(self) -> None:
+        """Skip all lines received so far."""
+        self.position = self._ring.end
+
+    def pending(self) -> int:
+        """Number of retained lines this cursor has not read yet."""
+        return max(self._ring.end - max(self.position, self._ring.first), 0)
@@ -80,9 +80,9 @@ class WrappedProcess:
     def wait(self, timeout_s=15):
         return self.process.wait(timeout_s)
 
-    def get_output(self):
+    def get_output(self, since=0):
         """Return the captured stdout of the process."""
-        return self.process.get_output()
+        return self.process.get_output(since)
 
     def _handle_process_exit(self):
         if self._wait_on_exit:
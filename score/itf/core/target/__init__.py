@@ -11,4 +11,5 @@
 # SPDX-License-Identifier: Apache-2.0
 # *******************************************************************************
 
+from .deploy_cache import DeploymentCache, deployment_cache
 from .target import Target, UnsupportedTarget
@@ -0,0 +1,95 @@
+# *******************************************************************************
+# Copyright (c) 2026 Contributors to the Eclipse Foundation
+#
+# See the NOTICE file(s) distributed with this work for additional
+# information regarding copyright ownership.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Apache License Version 2.0 which is available at
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# SPDX-License-Identifier: Apache-2.0
+# *******************************************************************************
+import hashlib
+import os
+import threading
+
+from typing import Optional
+
+from score.itf.core.utils.bunch import Bunch
+
+
+_CHUNK_SIZE = 1024 * 1024
+
+
+class DeploymentCache:
+    """Remembers the content (SHA-256) of the files deployed to each target.
+
+    Targets are identified by their :meth:`Target.deployment_key`, which changes
+    whenever the target file system may have been reset (new container, new
+    overlay, reboot). Digests of local files are cached by path, size and
+    modification time, so unchanged files are hashed only once per session.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local_digests = {}
+        self._manifests = {}
+        self._hits = 0
+        self._misses = 0
+        self._bytes_skipped = 0
+
+    def digest(self, local_path: str) -> str:
+        """Return the SHA-256 hex digest of a local file."""
+        st = os.stat(local_path)
+        signature = (st.st_size, st.st_mtime_ns)
+        with self._lock:
+            cached = self._local_digests.get(local_path)
+        if cached and cached[0] == signature:
+            return cached[1]
+
+        sha = hashlib.sha256()
+        with open(local_path, "rb") as f:
+            for chunk in iter(lambda: f.read(_CHUNK_SIZE), b""):
+                sha.update(chunk)
+        digest = sha.hexdigest()
+        with self._lock:
+            self._local_digests[local_path] = (signature, digest)
+        return digest
+
+    def lookup(self, key: str, remote_path: str) -> Optional[str]:
+        """Return the digest recorded for *remote_path* on the target *key*, if any."""
+        with self._lock:
+            return self._manifests.get(key, {}).get(remote_path)
+
+    def record(self, key: str, remote_path: str, digest: str) -> None:
+        """Record that *remote_path* on the target *key* has the content *digest*."""
+        with self._lock:
+            self._manifests.setdefault(key, {})[remote_path] = digest
+
+    def forget(self, key: str) -> None:
+        """Drop everything recorded for the target *key*."""
+        with self._lock:
+            self._manifests.pop(key, None)
+
+    def count(self, hit: bool, size: int = 0) -> None:
+        """Update the hit/miss counters; *size* is the number of bytes not transferred on a hit."""
+        with self._lock:
+            if hit:
+                self._hits += 1
+                self._bytes_skipped += size
+            else:
+                self._misses += 1
+
+    def stats(self) -> Bunch:
+        """Return the ``hits``, ``misses`` and ``bytes_skipped`` counters."""
+        with self._lock:
+            return Bunch(hits=self._hits, misses=self._misses, bytes_skipped=self._bytes_skipped)
+
+
+_deployment_cache = DeploymentCache()
+
+
+def deployment_cache() -> DeploymentCache:
+    """Return the deployment cache shared by all targets of the test session."""
+    return _deployment_cache
@@ -11,11 +11,23 @@
 # SPDX-License-Identifier: Apache-2.0
 # *******************************************************************************
 
+import logging
+import os
+import posixpath
+import shlex
+import time
+
 from abc import ABC, abstractmethod
-from typing import List, Set, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Set, Optional, Tuple
 
 from score.itf.core.process.async_process import AsyncProcess
 from score.itf.core.process.wrapped_process import WrappedProcess
+from score.itf.core.target.deploy_cache import deployment_cache
+from score.itf.core.utils.bunch import Bunch
+
+
+logger = logging.getLogger(__name__)
 
 
 class Target(ABC):
@@ -93,6 +105,53 @@ class Target(ABC):
     def execute(self, command: str) -> Tuple[int, bytes]:
         """Execute a command on the target."""
 
+    def execute_many(self, commands: List[str], concurrency: int = 4) -> List[Bunch]:
+        """Execute independent commands and return one result per command, in input order.
+
+        Each result is a :class:`Bunch` with ``command``, ``exit_code``, ``stdout`` and
+        ``stderr`` (bytes) and ``duration`` (seconds). This default implementation runs the
+        commands one after another through :meth:`execute`, which cannot tell stdout and
+        stderr apart, so ``stderr`` is always empty. Targets that can run commands
+        concurrently override it.
+
+        :param commands: shell commands to execute.
+        :param concurrency: maximum number of commands in flight at once.
+        :return: list of results, in the same order as *commands*.
+        """
+
+        def run(command):
+            exit_code, output = self.execute(command)
+            return exit_code, output, b""
+
+        return self._run_many(run, commands, concurrency=1)
+
+    @staticmethod
+    def _run_many(
+        run: Callable[[str], Tuple[int, bytes, bytes]],
+        commands: List[str],
+        concurrency: int,
+    ) -> List[Bunch]:
+        """Call ``run(command) -> (exit_code, stdout, stderr)`` for every command and time it.
+
+        Up to *concurrency* calls are made from worker threads at the same time.
+        """
+
+        def timed(command):
+            start = time.monotonic()
+            exit_code, stdout, stderr = run(command)
+            return Bunch(
+                command=command,
+                exit_code=exit_code,
+                stdout=stdout,
+                stderr=stderr,
+                duration=time.monotonic() - start,
+            )
+
+        if concurrency <= 1 or len(commands) <= 1:
+            return [timed(command) for command in commands]
+        with ThreadPoolExecutor(max_workers=min(concurrency, len(commands))) as executor:
+            return list(executor.map(timed, commands))
+
     @abstractmethod
     def execute_async(
         self,
@@ -127,6 +186,79 @@ class Target(ABC):
     def download(self, remote_path: str, local_path: str) -> None:
         """Download a file from the target to the test host."""
 
+    def deployment_key(self) -> Optional[str]:
+        """Identify the current file system state of the target for :meth:`upload_cached`.
+
+        The key must change whenever previously deployed files may be gone, e.g. when
+        the target is recreated or rebooted. ``None`` (the default) disables caching.
+        """
+        return None
+
+    def upload_cached(self, local_path: str, remote_path: str) -> bool:
+        """Upload a file unless the target already has the same content at *remote_path*.
+
+        Contents are compared by SHA-256, first against the files recorded as deployed
+        to this target during the session, then against ``sha256sum`` of the remote file.
+        Files modified on the target behind the cache's back are not detected.
+
+        :param local_path: file on the test host.
+        :param remote_path: destination path on the target.
+        :return: True if the file was transferred, False if the upload was skipped.
+        """
+        key = self.deployment_key()
+        if key is None:
+            self.upload(local_path, remote_path)
+            return True
+
+        cache = deployment_cache()
+        digest = cache.digest(local_path)
+        hit = cache.lookup(key, remote_path) == digest or self._remote_digest(remote_path) == digest
+        if hit:
+            cache.count(hit=True, size=os.path.getsize(local_path))
+            logger.info(f"Deployment cache hit: '{remote_path}' is up to date")
+        else:
+            self.upload(local_path, remote_path)
+            cache.count(hit=False)
+            logger.info(f"Deployment cache miss: uploaded '{local_path}' to '{remote_path}'")
+        cache.record(key, remote_path, digest)
+        return not hit
+
+    def _remote_digest(self, remote_path):
+        exit_code, output = self.execute(f"sha256sum {shlex.quote(remote_path)} 2>/dev/null")
+        fields = output.split() if exit_code == 0 and output else []
+        return fields[0].decode(errors="replace") if fields else None
+
+    def upload_tree(self, local_dir: str, remote_dir: str) -> None:
+        """Upload the content of a directory from the test host into *remote_dir* on the target.
+
+        This default implementation uploads the files one by one through :meth:`upload`.
+        Targets with a faster bulk transfer path override it.
+        """
+        for dirpath, _, filenames in os.walk(local_dir):
+            relative_dir = os.path.relpath(dirpath, local_dir)
+            for filename in filenames:
+                remote_path = posixpath.normpath(posixpath.join(remote_dir, relative_dir, filename))
+                self.upload(os.path.join(dirpath, filename), remote_path)
+
+    def download_tree(self, remote_dir: str, local_dir: str) -> None:
+        """Download the content of *remote_dir* on the target into a directory on the test host.
+
+        This default implementation lists the files with ``find`` and downloads them one by
+        one through :meth:`download`. Targets with a faster bulk transfer path override it.
+
+        :raises RuntimeError: if the files of *remote_dir* cannot be listed.
+        """
+        exit_code, output = self.execute(f"find {shlex.quote(remote_dir)} -type f -print0")
+        if exit_code != 0:
+            raise RuntimeError(f"Listing the files of '{remote_dir}' failed with exit code {exit_code}")
+        for remote_path in output.decode(errors="surrogateescape").split("\0"):
+            if not remote_path:
+                continue
+            relative_path = posixpath.relpath(remote_path, remote_dir)
+            local_path = os.path.join(local_dir, *relative_path.split("/"))
+            os.makedirs(os.path.dirname(local_path), exist_ok=True)
+            self.download(remote_path, local_path)
+
     @abstractmethod
     def restart(self) -> None:
         """Restart the target environment."""
@@ -0,0 +1,198 @@
+# *******************************************************************************
+# Copyright (c) 2026 Contributors to the Eclipse Foundation
+#
+# See the NOTICE file(s) distributed with this work for additional
+# information regarding copyright ownership.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Apache License Version 2.0 which is available at
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# SPDX-License-Identifier: Apache-2.0
+# *******************************************************************************
+"""Helpers for streaming directory trees as tar archives.
+
+The archives are written to and read from file-like objects in tarfile's stream
+modes, so no archive is ever held in memory or written to disk as a whole.
+"""
+
+import io
+import os
+import queue
+import tarfile
+import threading
+
+# Size of the chunks handed out by iter_tar_chunks and the number of chunks that may
+# be pending at once. Together they bound the memory used by an archive in flight.
+_CHUNK_SIZE = 1024 * 1024
+_MAX_PENDING_CHUNKS = 8
+
+
+def write_tree(fileobj, local_dir: str) -> int:
+    """Write the content of *local_dir* as an uncompressed tar stream to *fileobj*.
+
+    Entries are stored relative to *local_dir*, so extracting the stream into a
+    destination directory recreates the tree below it.
+
+    :param fileobj: writable file-like object.
+    :param str local_dir: directory to archive.
+    :return: number of archived regular files.
+    """
+    files = 0
+    with tarfile.open(fileobj=fileobj, mode="w|", format=tarfile.PAX_FORMAT) as tar:
+        for dirpath, dirnames, filenames in os.walk(local_dir):
+            dirnames.sort()
+            for name in dirnames + sorted(filenames):
+                path = os.path.join(dirpath, name)
+                tar.add(path, arcname=os.path.relpath(path, local_dir), recursive=False)
+                files += os.path.isfile(path) and not os.path.islink(path)
+    return files
+
+
+def extract_stream(fileobj, local_dir: str, strip_components: int = 0) -> int:
+    """Extract an uncompressed tar stream read from *fileobj* into *local_dir*.
+
+    Members that would end up outside of *local_dir* (absolute paths, ``..``
+    components, links pointing outside) are rejected.
+
+    :param fileobj: readable file-like object.
+    :param str local_dir: destination directory, created if missing.
+    :param int strip_components: number of leading path components removed from
+        every member name, like ``tar --strip-components``. Default is 0.
+    :return: number of extracted regular files.
+    :raises tarfile.TarError: if the stream is corrupt or contains unsafe members.
+    """
+    os.makedirs(local_dir, exist_ok=True)
+    files = 0
+    with tarfile.open(fileobj=fileobj, mode="r|") as tar:
+        for member in tar:
+            if strip_components:
+                member.name = _strip(member.name, strip_components)
+                if not member.name:
+                    continue
+                if member.islnk():
+                    member.linkname = _strip(member.linkname, strip_components)
+            _check_member(member, local_dir)
+            if hasattr(tarfile, "data_filter"):
+                tar.extract(member, local_dir, filter="data")
+            else:
+                tar.extract(member, local_dir)
+            files += member.isfile()
+    return files
+
+
+def iter_tar_chunks(write, chunk_size: int = _CHUNK_SIZE):
+    """Yield the tar stream written by *write* in chunks of about *chunk_size* bytes.
+
+    *write* is called with a writable file-like object in a background thread, e.g.
+    ``lambda f: write_tree(f, local_dir)``. Only a few chunks are buffered at a time,
+    so the generator can feed arbitrarily large archives to a streaming consumer
+    such as an HTTP request body. Errors raised by *write* are re-raised here.
+    """
+    chunks = queue.Queue(maxsize=_MAX_PENDING_CHUNKS)
+    cancelled = threading.Event()
+    errors = []
+
+    def produce():
+        try:
+            with _QueueWriter(chunks, chunk_size, cancelled) as writer:
+                write(writer)
+        except BaseException as ex:  # pylint: disable=broad-except
+            errors.append(ex)
+        finally:
+            chunks.put(None)
+
+    producer = threading.Thread(target=produce, name="tar-stream", daemon=True)
+    producer.start()
+    try:
+        while True:
+            chunk = chunks.get()
+            if chunk is None:
+                break
+            yield chunk
+    finally:
+        cancelled.set()
+        # Unblock the producer if the consumer stopped early.
+        while producer.is_alive():
+            try:
+                chunks.get(timeout=0.1)
+            except queue.Empty:
+                pass
+        producer.join()
+    if errors and not isinstance(errors[0], _Cancelled):
+        raise errors[0]
+
+
+class ChunkReader(io.RawIOBase):
+    """Read-only, non-seekable file object over an iterable of byte chunks."""
+
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+        self._pending = b""
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        while not self._pending:
+            self._pending = next(self._chunks, None)
+            if self._pending is None:
+                self._pending = b""
+                return 0
+        size = min(len(buffer), len(self._pending))
+        buffer[:size] = self._pending[:size]
+        self._pending = self._pending[size:]
+        return size
+
+
+class _Cancelled(Exception):
+    pass
+
+
+class _QueueWriter(io.RawIOBase):
+    """Collects written bytes into chunks and puts them on a bounded queue."""
+
+    def __init__(self, chunks, chunk_size, cancelled):
+        self._chunks = chunks
+        self._chunk_size = chunk_size
+        self._cancelled = cancelled
+        self._buffer = bytearray()
+
+    def writable(self):
+        return True
+
+    def write(self, b):
+        self._buffer += b
+        if len(self._buffer) >= self._chunk_size:
+            self._put()
+        return len(b)
+
+    def close(self):
+        if not self.closed and self._buffer:
+            self._put()
+        super().close()
+
+    def _put(self):
+        if self._cancelled.is_set():
+            raise _Cancelled()
+        self._chunks.put(bytes(self._buffer))
+        self._buffer.clear()
+
+
+def _strip(name, components):
+    parts = name.split("/")
+    while parts and parts[0] in ("", "."):
+        parts.pop(0)
+    return "/".join(parts[components:])
+
+
+def _check_member(member, local_dir):
+    root = os.path.realpath(local_dir)
+    target = os.path.realpath(os.path.join(root, member.name))
+    if os.path.commonpath([root, target]) != root:
+        raise tarfile.TarError(f"Refusing to extract '{member.name}' outside of '{local_dir}'")
+    if member.islnk() or member.issym():
+        link_base = root if member.islnk() else os.path.dirname(target)
+        link_target = os.path.realpath(os.path.join(link_base, member.linkname))
+        if os.path.commonpath([root, link_target]) != root:
+            raise tarfile.TarError(f"Refusing to extract link '{member.name}' pointing outside of '{local_dir}'")
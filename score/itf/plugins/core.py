@@ -12,9 +12,13 @@
 # *******************************************************************************
 
 import functools
+import logging
 import pytest
 
-from score.itf.core.target import Target, UnsupportedTarget
+from score.itf.core.target import Target, UnsupportedTarget, deployment_cache
+
+
+logger = logging.getLogger(__name__)
 
 
 def pytest_addoption(parser):
@@ -26,6 +30,15 @@ def pytest_addoption(parser):
     )
 
 
+def pytest_sessionfinish(session):
+    stats = deployment_cache().stats()
+    if stats.hits or stats.misses:
+        logger.info(
+            f"Deployment cache: {stats.hits} hits, {stats.misses} misses, "
+            f"{stats.bytes_skipped / 1e6:.2f} MB not transferred"
+        )
+
+
 def determine_target_scope(fixture_name, config):
     """Determines wether the target should be kept between tests or not
 
@@ -118,7 +118,7 @@ def dlt_on_target(request, target, dlt_config):
     on_target_path = request.config.getoption("dlt_receive_on_target_path", default=None)
     local_binary = on_target_path or dlt_config.dlt_receive_path
 
-    target.upload(local_binary, _DLT_RECEIVE_REMOTE_PATH)
+    target.upload_cached(local_binary, _DLT_RECEIVE_REMOTE_PATH)
     target.execute(f"chmod +x {_DLT_RECEIVE_REMOTE_PATH}")
 
     receivers = []
@@ -0,0 +1,470 @@
+# *******************************************************************************
+# Copyright (c) 2026 Contributors to the Eclipse Foundation
+#
+# See the NOTICE file(s) distributed with this work for additional
+# information regarding copyright ownership.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Apache License Version 2.0 which is available at
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# SPDX-License-Identifier: Apache-2.0
+# *******************************************************************************
+"""Columnar index of a DLT storage file, for fast queries without libdlt.
+
+The headers of all messages are parsed once into compact :mod:`array` columns
+(offset, size, storage time, timestamp, ECU/APID/CTID codes, MSIN, header type).
+Queries on the header fields only touch these columns; a message is parsed and
+its payload decoded only if the header fields match.
+
+The index can be saved to a sidecar file next to the storage file (see
+:func:`sidecar_path`), so that later queries on the same trace skip parsing
+the headers. The sidecar holds the columns, the rows of every APID and CTID
+(posting lists) and the rows per time bucket. It is only used while the size
+and modification time of the storage file are the ones it was written for.
+"""
+
+import bisect
+import json
+import logging
+import mmap
+import os
+import re
+import struct
+import sys
+import tempfile
+import time
+
+from array import array
+from typing import Iterable, List, Optional
+
+from score.itf.core.utils.bunch import Bunch
+from score.itf.plugins.dlt.dlt_storage import (
+    HTYP_UEH,
+    MSTP_LOG,
+    DltMessage,
+    message_bunch,
+    parse_header,
+    parse_message,
+    scan,
+)
+
+
+logger = logging.getLogger(__name__)
+
+# Query keys answered from the index columns.
+HEADER_KEYS = ("ecu", "apid", "ctid")
+# Width of the time buckets, in seconds of storage time.
+TIME_BUCKET_SECONDS = 60
+
+SIDECAR_SUFFIX = ".idx"
+_SIDECAR_MAGIC = b"ITFDLTIX"
+_SIDECAR_VERSION = 1
+_COLUMNS = ("offsets", "sizes", "seconds", "microseconds", "tmsps", "ecus", "apids", "ctids", "msins", "htyps")
+_POSTINGS = ("_apid_rows", "_ctid_rows", "_time_buckets")
+
+
+def sidecar_path(file_name: str) -> str:
+    """Return the path of the index sidecar of the storage file *file_name*."""
+    return file_name + SIDECAR_SUFFIX
+
+
+class DltIndex:
+    """Index over the messages of a DLT storage file.
+
+    Offers the interface of :class:`~score.itf.plugins.dlt.dlt_window.DltLogRecord`
+    (:meth:`find`, :meth:`total_count`, :meth:`filtered_count`, :meth:`queried_count`),
+    plus :meth:`select` for queries on the header fields only. Messages appended to
+    the file later are added by :meth:`update`.
+    """
+
+    def __init__(self, file_name: Optional[str], filters=None, sidecar: bool = False):
+        """
+        :param Optional[str] file_name: File with DLT logs. If None, the index keeps the
+            messages passed to :meth:`append` in memory.
+        :param list filters: Restrict the messages like :class:`DltLogRecord` does: list of
+            ``(APID, CTID)`` tuples, where an empty string matches any value. Messages
+            without extended header always pass.
+        :param bool sidecar: Load the index from its sidecar file if it is up to date, and
+            write the sidecar otherwise. Default is False.
+        """
+        self.file_name = file_name
+        self.offsets = array("Q")
+        self.sizes = array("I")
+        self.seconds = array("I")
+        self.microseconds = array("I")
+        self.tmsps = array("I")
+        self.ecus = array("H")
+        self.apids = array("H")
+        self.ctids = array("H")
+        self.msins = array("B")
+        self.htyps = array("B")
+        # ECU, APID and CTID strings; the columns hold positions in this list.
+        self.ids = []
+        self._codes = {}
+        # Rows per APID and CTID code, and per time bucket.
+        self._apid_rows = {}
+        self._ctid_rows = {}
+        self._time_buckets = {}
+        self._filters = [(apid or "", ctid or "") for apid, ctid in filters or [] if apid or ctid]
+        self._filtered = None
+        self._queried_counter = 0
+        self._sorted = True
+        self._file = None
+        self._data = None
+        self._position = 0
+        if file_name is None:
+            self._data = bytearray()
+        elif sidecar and self._load_sidecar():
+            self.update()
+        else:
+            self.update()
+            if sidecar:
+                self.save()
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self) -> None:
+        if self._file is not None:
+            if self._data is not None:
+                self._data.close()
+                self._data = None
+            self._file.close()
+            self._file = None
+
+    def append(self, data: bytes) -> int:
+        """Add messages in storage format to an index kept in memory. Return the number of complete messages."""
+        if self.file_name is not None:
+            raise RuntimeError("Messages can only be appended to an index without file")
+        self._data += data
+        found, self._position = scan(self._data, self._position, len(self._data))
+        for offset, length in found:
+            self._append(offset, length, parse_header(self._data, offset))
+        self._filtered = None
+        return len(found)
+
+    def update(self) -> int:
+        """Index the messages appended to the file since the last update. Return their number."""
+        if self.file_name is None:
+            return 0
+        size = os.path.getsize(self.file_name)
+        if size < self._position:
+            raise RuntimeError(f"{self.file_name} was truncated, create a new index")
+        if size and (self._data is None or len(self._data) < size):
+            self._map(size)
+        if size == self._position:
+            return 0
+        found, self._position = scan(self._data, self._position, size)
+        for offset, length in found:
+            self._append(offset, length, parse_header(self._data, offset))
+        self._filtered = None
+        return len(found)
+
+    def save(self, path: Optional[str] = None) -> Optional[str]:
+        """Write the index to *path*, by default its sidecar file.
+
+        :return: the path written, None if the file could not be written.
+        """
+        path = path or sidecar_path(self.file_name)
+        stat = os.stat(self.file_name)
+        columns = [getattr(self, name) for name in _COLUMNS]
+        postings = []
+        for name in _POSTINGS:
+            rows = getattr(self, name)
+            postings.append([[key, len(rows[key])] for key in rows])
+            columns += rows.values()
+        header = dict(
+            version=_SIDECAR_VERSION,
+            byteorder=sys.byteorder,
+            size=stat.st_size,
+            mtime_ns=stat.st_mtime_ns,
+            position=self._position,
+            sorted=self._sorted,
+            ids=self.ids,
+            columns=[[column.typecode, column.itemsize, len(column)] for column in columns[: len(_COLUMNS)]],
+            postings=postings,
+        )
+        encoded = json.dumps(header).encode()
+        try:
+            fd, temporary = tempfile.mkstemp(prefix=os.path.basename(path), dir=os.path.dirname(path) or ".")
+            with os.fdopen(fd, "wb") as file:
+                file.write(_SIDECAR_MAGIC + struct.pack("<Q", len(encoded)) + encoded)
+                for column in columns:
+                    column.tofile(file)
+            os.replace(temporary, path)
+        except OSError as error:
+            logger.warning(f"Could not write DLT index {path}: {error}")
+            return None
+        logger.debug(f"Wrote index of {len(self)} DLT messages to {path}")
+        return path
+
+    def code(self, value: str) -> Optional[int]:
+        """Return the code of an ECU, APID or CTID, None if no message has it."""
+        return self._codes.get(value)
+
+    def timestamp(self, row: int) -> float:
+        """Storage time of the message in *row*, in seconds since the epoch."""
+        return self.seconds[row] + self.microseconds[row] / 1e6
+
+    def message(self, row: int) -> DltMessage:
+        """Parse the message in *row*."""
+        return parse_message(self._data, self.offsets[row], self.sizes[row])
+
+    def messages(self, rows: Iterable[int]) -> Iterable[DltMessage]:
+        for row in rows:
+            yield self.message(row)
+
+    def select(
+        self,
+        ecu=None,
+        apid=None,
+        ctid=None,
+        log_level: Optional[int] = None,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        include_ext: bool = True,
+        include_non_ext: bool = False,
+    ) -> List[int]:
+        """Return the rows of the messages matching all given header fields.
+
+        :param ecu: ECU id as string or bytes, or compiled regular expression searched in it.
+        :param apid: Application id, like *ecu*.
+        :param ctid: Context id, like *ecu*.
+        :param Optional[int] log_level: Maximum log level (1 fatal ... 6 verbose) of log messages.
+        :param Optional[float] since: Minimum storage time, in seconds since the epoch.
+        :param Optional[float] until: Storage time the messages must be older than.
+        :param bool include_ext: Include messages with extended header.
+        :param bool include_non_ext: Include messages without extended header.
+        """
+        rows = self._candidates(include_ext, include_non_ext, since, until)
+        rows = self._narrow(rows, ecu=ecu, apid=apid, ctid=ctid)
+        if log_level is not None:
+            msins, htyps = self.msins, self.htyps
+            rows = [
+                row
+                for row in rows
+                if htyps[row] & HTYP_UEH and (msins[row] >> 1) & 0x07 == MSTP_LOG and 0 < msins[row] >> 4 <= log_level
+            ]
+        return rows
+
+    def find(self, query=None, include_ext=True, include_non_ext=False, full_match=True, timeout=None) -> List[Bunch]:
+        """Find messages like :meth:`DltLogRecord.find`.
+
+        Query items on ``ecu``, ``apid`` and ``ctid`` are answered from the index; the other
+        items are compared only for the messages matching those.
+        """
+        if not include_ext and not include_non_ext:
+            logger.warning("Both 'include_ext' and 'include_non_ext' flags are set to False: empty search space!")
+            return []
+        query = dict(query or {})
+        rows = self._candidates(include_ext, include_non_ext)
+        self._queried_counter = len(rows)
+        rows = self._narrow(rows, **{key: query.pop(key) for key in HEADER_KEYS if key in query})
+
+        result = []
+        start_time = time.time()
+        for row in rows:
+            message = self.message(row)
+            if not query or message.compare(query):
+                result.append(message_bunch(message))
+                if not full_match:
+                    break
+            if timeout is not None and time.time() - start_time >= timeout:
+                logger.debug("[DLT Index]: find function exceeded timeout set!")
+                break
+        return result
+
+    def total_count(self) -> int:
+        """Total number of DLT messages recorded."""
+        return len(self)
+
+    def filtered_count(self) -> int:
+        """Number of messages passing the filters, including all messages without extended header."""
+        return len(self._filtered_rows())
+
+    def queried_count(self) -> int:
+        """Number of messages passing the filters and the ``include_*`` flags of the last :meth:`find`."""
+        return self._queried_counter
+
+    def _candidates(self, include_ext, include_non_ext, since=None, until=None):
+        rows = self._filtered_rows()
+        if since is not None or until is not None:
+            rows = self._time_range(rows, since, until)
+        if include_ext and include_non_ext:
+            return list(rows)
+        htyps = self.htyps
+        wanted = HTYP_UEH if include_ext else (0 if include_non_ext else -1)
+        return [row for row in rows if htyps[row] & HTYP_UEH == wanted]
+
+    def _narrow(self, rows, ecu=None, apid=None, ctid=None):
+        for column, postings, value in (
+            (self.ecus, None, ecu),
+            (self.apids, self._apid_rows, apid),
+            (self.ctids, self._ctid_rows, ctid),
+        ):
+            if value is None:
+                continue
+            codes = self._matching_codes(value)
+            posted = None if postings is None else sum(len(postings.get(code, ())) for code in codes)
+            if posted is not None and posted < len(rows):
+                # Fewer rows have the id than are left: walk its posting lists instead of the column.
+                candidates = sorted(row for code in codes for row in postings.get(code, ()))
+                remaining = rows if isinstance(rows, range) else set(rows)
+                rows = [row for row in candidates if row in remaining]
+            else:
+                rows = [row for row in rows if column[row] in codes]
+        return rows
+
+    def _time_range(self, rows, since, until):
+        since = float("-inf") if since is None else since
+        until = float("inf") if until is None else until
+        if self._sorted and isinstance(rows, range):
+            # Storage times normally grow with the offset: bisect instead of scanning.
+            times = _TimeColumn(self)
+            return range(bisect.bisect_left(times, since), bisect.bisect_left(times, until))
+        timestamp = self.timestamp
+        if isinstance(rows, range) and since > float("-inf") and until < float("inf"):
+            first, last = int(since) // TIME_BUCKET_SECONDS, int(until) // TIME_BUCKET_SECONDS
+            if last - first < len(self._time_buckets):
+                rows = sorted(row for bucket in range(first, last + 1) for row in self._time_buckets.get(bucket, ()))
+        return [row for row in rows if since <= timestamp(row) < until]
+
+    def _filtered_rows(self):
+        if not self._filters:
+            return range(len(self))
+        if self._filtered is None:
+            allowed = [
+                (self._matching_codes(apid) if apid else None, self._matching_codes(ctid) if ctid else None)
+                for apid, ctid in self._filters
+            ]
+            apids, ctids, htyps = self.apids, self.ctids, self.htyps
+            self._filtered = [
+                row
+                for row in range(len(self))
+                if not htyps[row] & HTYP_UEH
+                or any(
+                    (apid_codes is None or apids[row] in apid_codes)
+                    and (ctid_codes is None or ctids[row] in ctid_codes)
+                    for apid_codes, ctid_codes in allowed
+                )
+            ]
+        return self._filtered
+
+    def _matching_codes(self, value):
+        if isinstance(value, re.Pattern):
+            if isinstance(value.pattern, bytes):
+                return {code for code, text in enumerate(self.ids) if value.search(text.encode())}
+            return {code for code, text in enumerate(self.ids) if value.search(text)}
+        if isinstance(value, bytes):
+            value = value.decode(errors="replace")
+        code = self._codes.get(value)
+        return set() if code is None else {code}
+
+    def _code(self, value):
+        code = self._codes.get(value)
+        if code is None:
+            code = self._codes[value] = len(self.ids)
+            self.ids.append(value)
+        return code
+
+    def _append(self, offset, size, header):
+        seconds, microseconds, ecu, htyp, _, _, tmsp, apid, ctid, msin, _, _ = header
+        if self._sorted and self.offsets and (seconds, microseconds) < (self.seconds[-1], self.microseconds[-1]):
+            self._sorted = False
+        row = len(self.offsets)
+        apid_code, ctid_code = self._code(apid), self._code(ctid)
+        _posting(self._apid_rows, apid_code).append(row)
+        _posting(self._ctid_rows, ctid_code).append(row)
+        _posting(self._time_buckets, seconds // TIME_BUCKET_SECONDS).append(row)
+        self.offsets.append(offset)
+        self.sizes.append(size)
+        self.seconds.append(seconds)
+        self.microseconds.append(microseconds)
+        self.tmsps.append(tmsp)
+        self.ecus.append(self._code(ecu))
+        self.apids.append(apid_code)
+        self.ctids.append(ctid_code)
+        self.msins.append(msin)
+        self.htyps.append(htyp)
+
+    def _load_sidecar(self):
+        path = sidecar_path(self.file_name)
+        try:
+            stat = os.stat(self.file_name)
+            with open(path, "rb") as file:
+                if file.read(len(_SIDECAR_MAGIC)) != _SIDECAR_MAGIC:
+                    raise ValueError("not an index file")
+                (length,) = struct.unpack("<Q", file.read(8))
+                header = json.loads(file.read(length))
+                if header["version"] != _SIDECAR_VERSION or header["byteorder"] != sys.byteorder:
+                    raise ValueError("incompatible index format")
+                if (header["size"], header["mtime_ns"]) != (stat.st_size, stat.st_mtime_ns):
+                    logger.debug(f"DLT index {path} is outdated")
+                    return False
+                # Read everything before changing the index, which stays empty if the file is damaged.
+                columns = {
+                    name: _read_array(file, typecode, itemsize, length)
+                    for name, (typecode, itemsize, length) in zip(_COLUMNS, header["columns"])
+                }
+                if len(columns) != len(_COLUMNS) or len({len(column) for column in columns.values()}) != 1:
+                    raise ValueError("inconsistent columns")
+                postings = {
+                    name: {key: _read_array(file, "I", 4, length) for key, length in keys}
+                    for name, keys in zip(_POSTINGS, header["postings"])
+                }
+                ids, position, is_sorted = header["ids"], header["position"], header["sorted"]
+        except FileNotFoundError:
+            return False
+        except (OSError, EOFError, ValueError, KeyError, TypeError, struct.error) as error:
+            logger.warning(f"Ignoring DLT index {path}: {error}")
+            return False
+        for name, values in {**columns, **postings}.items():
+            setattr(self, name, values)
+        self.ids = ids
+        self._codes = {value: code for code, value in enumerate(self.ids)}
+        self._position = position
+        self._sorted = is_sorted
+        logger.debug(f"Loaded index of {len(self)} DLT messages from {path}")
+        return True
+
+    def _map(self, size):
+        if self._file is None:
+            self._file = open(self.file_name, "rb")
+        if self._data is not None:
+            self._data.close()
+        self._data = mmap.mmap(self._file.fileno(), size, access=mmap.ACCESS_READ)
+
+
+def _posting(postings, key):
+    rows = postings.get(key)
+    if rows is None:
+        rows = postings[key] = array("I")
+    return rows
+
+
+def _read_array(file, typecode, itemsize, length):
+    column = array(typecode)
+    if column.itemsize != itemsize:
+        raise ValueError(f"array item size of '{typecode}' differs")
+    column.fromfile(file, length)
+    return column
+
+
+class _TimeColumn:
+    """Storage times of an index as a sequence, for :mod:`bisect`."""
+
+    def __init__(self, index):
+        self._index = index
+
+    def __len__(self):
+        return len(self._index)
+
+    def __getitem__(self, row):
+        return self._index.timestamp(row)
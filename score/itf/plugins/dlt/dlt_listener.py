@@ -0,0 +1,284 @@
+# *******************************************************************************
+# Copyright (c) 2026 Contributors to the Eclipse Foundation
+#
+# See the NOTICE file(s) distributed with this work for additional
+# information regarding copyright ownership.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Apache License Version 2.0 which is available at
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# SPDX-License-Identifier: Apache-2.0
+# *******************************************************************************
+"""Receiving DLT messages in the test process, as an alternative to ``dlt-receive``.
+
+The sockets are served by the shared event loop (see
+:mod:`score.itf.core.process.event_loop`). Every received message gets a storage
+header and is added to an in-memory :class:`~score.itf.plugins.dlt.dlt_index.DltIndex`,
+which tests can query while messages keep arriving; the storage file is written
+in batches.
+"""
+
+import asyncio
+import logging
+import socket
+import threading
+import time
+
+from typing import Callable, List, Optional
+
+from score.itf.core.process.event_loop import run_coroutine, shared_loop
+from score.itf.core.utils.bunch import Bunch
+from score.itf.plugins.dlt.dlt_index import DltIndex
+from score.itf.plugins.dlt.dlt_receive import Protocol
+from score.itf.plugins.dlt.dlt_storage import (
+    EXTENDED_HEADER,
+    HTYP_UEH,
+    HTYP_WEID,
+    HTYP_WSID,
+    HTYP_WTMS,
+    STANDARD_HEADER,
+    STORAGE_HEADER,
+    STORAGE_PATTERN,
+)
+
+
+logger = logging.getLogger(__name__)
+
+DLT_PORT = 3490
+# ECU id of the storage header of messages without ECU id, as used by dlt-receive.
+DEFAULT_ECU = b"RECV"
+# Optional header in front of messages sent by dlt-daemon over serial lines and some TCP setups.
+SERIAL_HEADER = b"DLS\x01"
+_RECEIVE_BUFFER = 4 * 1024 * 1024
+
+
+def storage_header(ecu: bytes = DEFAULT_ECU, timestamp: Optional[float] = None) -> bytes:
+    """Return a storage header with the reception time *timestamp*, by default now."""
+    timestamp = time.time() if timestamp is None else timestamp
+    seconds = int(timestamp)
+    return STORAGE_HEADER.pack(STORAGE_PATTERN, seconds, int((timestamp - seconds) * 1e6), ecu)
+
+
+class DltListener:
+    """Receives DLT messages over UDP (optionally multicast) or TCP, like ``dlt-receive``.
+
+    The received messages can be queried with :meth:`find` and :meth:`select` at
+    any time, and are written to *file_name* (if given) in the storage format,
+    in batches of *batch_bytes* or after *flush_interval* seconds.
+    """
+
+    # pylint: disable=too-many-instance-attributes
+    def __init__(
+        self,
+        protocol: Protocol = Protocol.UDP,
+        host_ip: Optional[str] = None,
+        multicast_ips: Optional[List[str]] = None,
+        target_ip: Optional[str] = None,
+        file_name: Optional[str] = None,
+        port: int = DLT_PORT,
+        filters=None,
+        on_message: Optional[Callable[[bytes], None]] = None,
+        flush_interval: float = 0.1,
+        batch_bytes: int = 64 * 1024,
+    ):
+        """
+        :param Protocol protocol: Protocol to use for receiving DLT logs (TCP or UDP).
+        :param str host_ip: IP address of the interface joining the multicast groups in case of UDP.
+        :param list[str] multicast_ips: Multicast IPs to join to in case of UDP.
+        :param str target_ip: IP address to connect to in case of TCP.
+        :param str file_name: DLT file to write the messages to. Default is to keep them in memory only.
+        :param int port: Port to listen on (UDP) or to connect to (TCP). 0 picks a free UDP port.
+        :param list filters: Keep only messages matching one of these ``(APID, CTID)`` tuples, where an
+            empty string matches any value, and the messages without extended header.
+        :param callable on_message: Called on the event loop with every kept message in storage format.
+        :param float flush_interval: Maximum seconds a received message waits to be written.
+        :param int batch_bytes: Write as soon as this many bytes are waiting.
+        """
+        if protocol not in (Protocol.UDP, Protocol.TCP):
+            raise RuntimeError(f"Unsupported Transport Layer Protocol provided: {protocol}.")
+        self.protocol = protocol
+        self.host_ip = host_ip
+        self.multicast_ips = multicast_ips or []
+        self.target_ip = target_ip
+        self.file_name = file_name
+        self.port = port
+        self.received = 0
+        self.dropped = 0
+        self._filters = [
+            (apid.encode().ljust(4, b"\0") if apid else None, ctid.encode().ljust(4, b"\0") if ctid else None)
+            for apid, ctid in filters or []
+            if apid or ctid
+        ]
+        self._on_message = on_message
+        self._flush_interval = flush_interval
+        self._batch_bytes = batch_bytes
+        self._lock = threading.Lock()
+        self._index = DltIndex(None)
+        self._transport = None
+        self._file = None
+        self._pending = bytearray()
+        self._flush_handle = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    @property
+    def running(self) -> bool:
+        return self._transport is not None
+
+    def start(self) -> "DltListener":
+        run_coroutine(self._start())
+        logger.info(f"Receiving DLT messages over {self.protocol.name} on port {self.port}")
+        return self
+
+    def stop(self) -> None:
+        """Close the socket and write the pending messages."""
+        run_coroutine(self._stop())
+
+    def flush(self) -> None:
+        """Write the pending messages to the DLT file now."""
+        run_coroutine(self._flush())
+
+    def count(self) -> int:
+        """Number of messages kept so far."""
+        with self._lock:
+            return len(self._index)
+
+    def find(self, query=None, include_ext=True, include_non_ext=False, full_match=True, timeout=None) -> List[Bunch]:
+        """Find received messages, see :meth:`DltLogRecord.find`."""
+        with self._lock:
+            return self._index.find(query, include_ext, include_non_ext, full_match, timeout)
+
+    def select(self, **fields) -> List[int]:
+        """Return the rows of the received messages matching header fields, see :meth:`DltIndex.select`."""
+        with self._lock:
+            return self._index.select(**fields)
+
+    def message(self, row: int):
+        """Parse the received message in *row* of :meth:`select`."""
+        with self._lock:
+            return self._index.message(row)
+
+    async def _start(self):
+        if self.file_name:
+            self._file = open(self.file_name, "wb")
+        loop = asyncio.get_running_loop()
+        if self.protocol == Protocol.UDP:
+            self._transport, _ = await loop.create_datagram_endpoint(
+                lambda: _DatagramProtocol(self), sock=self._udp_socket()
+            )
+            self.port = self._transport.get_extra_info("sockname")[1]
+        else:
+            self._transport, _ = await loop.create_connection(lambda: _StreamProtocol(self), self.target_ip, self.port)
+
+    def _udp_socket(self):
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, _RECEIVE_BUFFER)
+        # Like dlt-receive, listen on all addresses and join the groups on the interface of host_ip.
+        sock.bind(("", self.port))
+        for multicast_ip in self.multicast_ips:
+            membership = socket.inet_aton(multicast_ip) + socket.inet_aton(self.host_ip or "0.0.0.0")
+            sock.setsockopt(socket.IPPROTO_IP, socket.IP_ADD_MEMBERSHIP, membership)
+        sock.setblocking(False)
+        return sock
+
+    async def _stop(self):
+        if self._transport is not None:
+            self._transport.close()
+            self._transport = None
+        await self._flush()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    async def _flush(self):
+        self._write()
+
+    def _receive(self, data, start=0) -> int:
+        """Handle the complete messages in *data* from offset *start*. Return the offset after the last one."""
+        end = len(data)
+        while start < end:
+            if data[start : start + 4] == SERIAL_HEADER:
+                start += 4
+            if end - start < STANDARD_HEADER.size:
+                break
+            htyp, _, length = STANDARD_HEADER.unpack_from(data, start)
+            if length < STANDARD_HEADER.size:
+                self.dropped += 1
+                logger.debug(f"Dropped {end - start} bytes with invalid DLT message length {length}")
+                return end
+            if start + length > end:
+                break
+            self._add(htyp, bytes(data[start : start + length]))
+            start += length
+        return start
+
+    def _add(self, htyp, message):
+        self.received += 1
+        position = STANDARD_HEADER.size
+        ecu = DEFAULT_ECU
+        if htyp & HTYP_WEID:
+            ecu = message[position : position + 4]
+            position += 4
+        if self._filters and htyp & HTYP_UEH:
+            position += 4 * bool(htyp & HTYP_WSID) + 4 * bool(htyp & HTYP_WTMS)
+            _, _, apid, ctid = EXTENDED_HEADER.unpack_from(message, position)
+            if not any(
+                (wanted_apid is None or wanted_apid == apid) and (wanted_ctid is None or wanted_ctid == ctid)
+                for wanted_apid, wanted_ctid in self._filters
+            ):
+                return
+        record = storage_header(ecu) + message
+        with self._lock:
+            self._index.append(record)
+        if self._file is not None:
+            self._pending += record
+            if len(self._pending) >= self._batch_bytes:
+                self._write()
+            elif self._flush_handle is None:
+                self._flush_handle = shared_loop().call_later(self._flush_interval, self._write)
+        if self._on_message is not None:
+            try:
+                self._on_message(record)
+            except Exception:
+                logger.exception("Handling a received DLT message failed")
+
+    def _write(self):
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if self._pending and self._file is not None:
+            self._file.write(self._pending)
+            self._file.flush()
+            self._pending.clear()
+
+
+class _DatagramProtocol(asyncio.DatagramProtocol):
+    def __init__(self, listener):
+        self._listener = listener
+
+    def datagram_received(self, data, addr):
+        self._listener._receive(data)
+
+    def error_received(self, exc):
+        logger.debug(f"Receiving DLT datagrams failed: {exc}")
+
+
+class _StreamProtocol(asyncio.Protocol):
+    def __init__(self, listener):
+        self._listener = listener
+        self._buffer = bytearray()
+
+    def data_received(self, data):
+        self._buffer += data
+        del self._buffer[: self._listener._receive(self._buffer)]
+
+    def connection_lost(self, exc):
+        if exc is not None:
+            logger.warning(f"DLT connection to {self._listener.target_ip} lost: {exc}")
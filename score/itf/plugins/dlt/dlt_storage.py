@@ -0,0 +1,457 @@
+# *******************************************************************************
+# Copyright (c) 2026 Contributors to the Eclipse Foundation
+#
+# See the NOTICE file(s) distributed with this work for additional
+# information regarding copyright ownership.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Apache License Version 2.0 which is available at
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# SPDX-License-Identifier: Apache-2.0
+# *******************************************************************************
+"""Reading DLT storage files (as written by ``dlt-receive -o``) without libdlt.
+
+Every message in a storage file is a storage header (``DLT\\x01``, seconds,
+microseconds, ECU id) followed by the message as sent over the network: the
+standard header, optionally the extended header, and the payload.
+"""
+
+import logging
+import mmap
+import os
+import re
+import struct
+import time
+
+from collections import deque
+from typing import List, Optional, Tuple
+
+from score.itf.core.utils.bunch import Bunch
+
+
+logger = logging.getLogger(__name__)
+
+STORAGE_PATTERN = b"DLT\x01"
+STORAGE_HEADER = struct.Struct("<4sII4s")
+STANDARD_HEADER = struct.Struct(">BBH")
+EXTENDED_HEADER = struct.Struct(">BB4s4s")
+
+# Bits of the header type (HTYP) of the standard header.
+HTYP_UEH = 0x01
+HTYP_MSBF = 0x02
+HTYP_WEID = 0x04
+HTYP_WSID = 0x08
+HTYP_WTMS = 0x10
+
+# Message type (MSTP) of log messages; their message type info (MTIN) is the log level.
+MSTP_LOG = 0
+
+# Type info bits of verbose arguments.
+_TYLE_MASK = 0x0F
+_TYPE_BOOL = 0x10
+_TYPE_SINT = 0x20
+_TYPE_UINT = 0x40
+_TYPE_FLOA = 0x80
+_TYPE_STRG = 0x200
+_TYPE_RAWD = 0x400
+_TYPE_VARI = 0x800
+_TYPE_FIXP = 0x1000
+_TYLE_BYTES = {1: 1, 2: 2, 3: 4, 4: 8, 5: 16}
+
+
+class DltMessage:
+    """One message of a DLT storage file. The payload is only decoded when it is accessed."""
+
+    __slots__ = (
+        "offset",
+        "seconds",
+        "microseconds",
+        "ecu",
+        "htyp",
+        "mcnt",
+        "session_id",
+        "tmsp",
+        "apid",
+        "ctid",
+        "msin",
+        "noar",
+        "raw_payload",
+        "_payload_decoded",
+    )
+
+    def __init__(
+        self, offset, seconds, microseconds, ecu, htyp, mcnt, session_id, tmsp, apid, ctid, msin, noar, raw_payload
+    ):
+        self.offset = offset
+        self.seconds = seconds
+        self.microseconds = microseconds
+        self.ecu = ecu
+        self.htyp = htyp
+        self.mcnt = mcnt
+        self.session_id = session_id
+        self.tmsp = tmsp
+        self.apid = apid
+        self.ctid = ctid
+        self.msin = msin
+        self.noar = noar
+        self.raw_payload = raw_payload
+        self._payload_decoded = None
+
+    @property
+    def use_extended_header(self) -> bool:
+        return bool(self.htyp & HTYP_UEH)
+
+    @property
+    def verbose(self) -> bool:
+        return bool(self.msin & 0x01)
+
+    @property
+    def mstp(self) -> int:
+        return (self.msin >> 1) & 0x07
+
+    @property
+    def mtin(self) -> int:
+        return (self.msin >> 4) & 0x0F
+
+    @property
+    def log_level(self) -> Optional[int]:
+        """Log level (1 fatal ... 6 verbose) of log messages, None for other messages."""
+        return self.mtin if self.use_extended_header and self.mstp == MSTP_LOG else None
+
+    @property
+    def storage_timestamp(self) -> float:
+        return self.seconds + self.microseconds / 1e6
+
+    @property
+    def payload_decoded(self) -> str:
+        if self._payload_decoded is None:
+            self._payload_decoded = decode_payload(
+                self.raw_payload, self.verbose, bool(self.htyp & HTYP_MSBF), self.noar
+            )
+        return self._payload_decoded
+
+    @property
+    def payload(self) -> str:
+        return self.payload_decoded
+
+    def compare(self, query: dict) -> bool:
+        """Return True if the message matches all items of *query*, see :func:`compare`."""
+        return compare(self, query)
+
+    def __repr__(self):
+        return f"DltMessage({self.ecu} {self.apid} {self.ctid} @{self.offset}: {self.payload_decoded!r})"
+
+
+def compare(message, query: dict) -> bool:
+    """Return True if every attribute named in *query* matches its value, see :func:`match_value`."""
+    return all(match_value(expected, getattr(message, key)) for key, expected in query.items())
+
+
+def match_value(expected, value) -> bool:
+    """Return True if *value* matches *expected*.
+
+    *expected* is a string (or bytes) compared for equality, or a compiled regular
+    expression searched in *value*.
+    """
+    if isinstance(expected, re.Pattern):
+        if isinstance(expected.pattern, bytes) and isinstance(value, str):
+            value = value.encode()
+        elif isinstance(expected.pattern, str) and isinstance(value, bytes):
+            value = value.decode(errors="replace")
+        return value is not None and expected.search(value) is not None
+    if isinstance(expected, bytes) and isinstance(value, str):
+        expected = expected.decode(errors="replace")
+    return value == expected
+
+
+def message_size(data, offset: int, end: int) -> int:
+    """Return the size of the message stored at *offset*.
+
+    :return: the size, 0 if the message is not complete before *end* and -1 if
+        there is no storage header at *offset*.
+    """
+    if end - offset < STORAGE_HEADER.size + STANDARD_HEADER.size:
+        return 0 if STORAGE_PATTERN.startswith(bytes(data[offset : min(end, offset + 4)])) else -1
+    if data[offset : offset + 4] != STORAGE_PATTERN:
+        return -1
+    _, _, length = STANDARD_HEADER.unpack_from(data, offset + STORAGE_HEADER.size)
+    if length < STANDARD_HEADER.size:
+        return -1
+    size = STORAGE_HEADER.size + length
+    return size if offset + size <= end else 0
+
+
+def scan(data, start: int, end: int):
+    """Return the ``(offset, size)`` of the complete messages in ``data[start:end]`` and the end of the last one.
+
+    Bytes that are not part of a message are skipped up to the next storage header.
+    """
+    messages = []
+    position = start
+    while position < end:
+        size = message_size(data, position, end)
+        if size > 0:
+            messages.append((position, size))
+            position += size
+        elif size == 0:
+            break
+        else:
+            found = data.find(STORAGE_PATTERN, position + 1, end)
+            skipped_to = found if found >= 0 else max(end - len(STORAGE_PATTERN) + 1, position + 1)
+            logger.debug(f"Skipped {skipped_to - position} bytes without DLT storage header at {position}")
+            position = skipped_to
+    return messages, position
+
+
+def parse_header(data, offset: int) -> tuple:
+    """Parse the headers of the message stored at *offset*.
+
+    :return: ``(seconds, microseconds, ecu, htyp, mcnt, session_id, tmsp, apid, ctid, msin, noar, payload_offset)``,
+        with the timestamp *tmsp* in units of 0.1 milliseconds.
+    """
+    _, seconds, microseconds, ecu = STORAGE_HEADER.unpack_from(data, offset)
+    position = offset + STORAGE_HEADER.size
+    htyp, mcnt, _ = STANDARD_HEADER.unpack_from(data, position)
+    position += STANDARD_HEADER.size
+    session_id = None
+    tmsp = 0
+    if htyp & HTYP_WEID:
+        ecu = data[position : position + 4]
+        position += 4
+    if htyp & HTYP_WSID:
+        session_id = struct.unpack_from(">I", data, position)[0]
+        position += 4
+    if htyp & HTYP_WTMS:
+        tmsp = struct.unpack_from(">I", data, position)[0]
+        position += 4
+    apid = ctid = ""
+    msin = noar = 0
+    if htyp & HTYP_UEH:
+        msin, noar, raw_apid, raw_ctid = EXTENDED_HEADER.unpack_from(data, position)
+        apid, ctid = _id(raw_apid), _id(raw_ctid)
+        position += EXTENDED_HEADER.size
+    return seconds, microseconds, _id(ecu), htyp, mcnt, session_id, tmsp, apid, ctid, msin, noar, position
+
+
+def parse_message(data, offset: int, size: int) -> DltMessage:
+    """Parse the complete message of *size* bytes stored at *offset*."""
+    seconds, microseconds, ecu, htyp, mcnt, session_id, tmsp, apid, ctid, msin, noar, position = parse_header(
+        data, offset
+    )
+    return DltMessage(
+        offset,
+        seconds,
+        microseconds,
+        ecu,
+        htyp,
+        mcnt,
+        session_id,
+        tmsp / 10000,
+        apid,
+        ctid,
+        msin,
+        noar,
+        bytes(data[position : offset + size]),
+    )
+
+
+def _parse_at(data, offset: int, size: int, base: int) -> DltMessage:
+    message = parse_message(data, offset, size)
+    message.offset += base
+    return message
+
+
+def decode_payload(payload: bytes, verbose: bool, big_endian: bool, noar: int) -> str:
+    """Return the text of a payload: the verbose arguments separated by spaces.
+
+    Non-verbose payloads are shown as message id and hex dump, as the message
+    description (FIBEX) is not known here.
+    """
+    order = ">" if big_endian else "<"
+    if not verbose:
+        if len(payload) < 4:
+            return payload.hex()
+        message_id = struct.unpack_from(f"{order}I", payload)[0]
+        return f"[{message_id}] {payload[4:].hex(' ')}".rstrip()
+    arguments = []
+    position = 0
+    try:
+        for _ in range(noar):
+            text, position = _decode_argument(payload, position, order)
+            arguments.append(text)
+    except (struct.error, ValueError, IndexError):
+        arguments.append(payload[position:].hex(" "))
+    return " ".join(arguments)
+
+
+def _decode_argument(payload, position, order):
+    type_info = struct.unpack_from(f"{order}I", payload, position)[0]
+    position += 4
+    tyle = _TYLE_BYTES.get(type_info & _TYLE_MASK, 0)
+    if type_info & _TYPE_STRG:
+        length = struct.unpack_from(f"{order}H", payload, position)[0]
+        position += 2
+        if type_info & _TYPE_VARI:
+            name_length = struct.unpack_from(f"{order}H", payload, position)[0]
+            position += 2 + name_length
+        text = payload[position : position + length].rstrip(b"\0").decode(errors="replace")
+        return text, position + length
+    if type_info & _TYPE_RAWD:
+        length = struct.unpack_from(f"{order}H", payload, position)[0]
+        position += 2
+        if type_info & _TYPE_VARI:
+            name_length = struct.unpack_from(f"{order}H", payload, position)[0]
+            position += 2 + name_length
+        return payload[position : position + length].hex(" "), position + length
+    if type_info & (_TYPE_BOOL | _TYPE_SINT | _TYPE_UINT | _TYPE_FLOA):
+        if type_info & _TYPE_VARI:
+            name_length, unit_length = struct.unpack_from(f"{order}HH", payload, position)
+            position += 4 + name_length + (0 if type_info & _TYPE_BOOL else unit_length)
+        if type_info & _TYPE_FIXP:
+            position += 4 + (8 if tyle == 8 else 4)
+        raw = payload[position : position + tyle]
+        if len(raw) != tyle or tyle == 0:
+            raise ValueError("Truncated argument")
+        position += tyle
+        if type_info & _TYPE_BOOL:
+            return str(bool(raw[0])), position
+        if type_info & _TYPE_FLOA:
+            code = {2: "e", 4: "f", 8: "d"}.get(tyle)
+            if code is None:
+                raise ValueError("Unsupported float size")
+            return str(struct.unpack(f"{order}{code}", raw)[0]), position
+        byteorder = "big" if order == ">" else "little"
+        return str(int.from_bytes(raw, byteorder, signed=bool(type_info & _TYPE_SINT))), position
+    raise ValueError(f"Unsupported argument type {type_info:#x}")
+
+
+def _id(raw):
+    return bytes(raw).rstrip(b"\0").decode("ascii", errors="replace")
+
+
+def message_bunch(message: DltMessage) -> Bunch:
+    """Return *message* in the form of the results of :meth:`DltLogRecord.find`."""
+    return Bunch(
+        time_stamp=message.tmsp,
+        apid=message.apid,
+        ctid=message.ctid,
+        payload=message.payload_decoded,
+        raw_msg=message,
+        epoch_time=normalize_timestamp_precision(message.storage_timestamp),
+    )
+
+
+def normalize_timestamp_precision(epoch_time):
+    try:
+        time_str = str(epoch_time)
+        seconds, microseconds = time_str.split(".")
+
+        if len(microseconds) < 6:
+            microseconds = microseconds.rjust(6, "0")
+
+    except Exception as error:
+        logger.error(f"Error normalizing timestamp precision: {error}")
+    return f"{seconds}.{microseconds}"
+
+
+class DltStorageTail:
+    """Follows a growing DLT storage file and parses only the messages appended since the last read.
+
+    The appended region is memory-mapped; the offset after the last complete message
+    is remembered, so an incomplete message at the end is parsed by the next read.
+    Messages read by :meth:`wait_for` after the one it returns are kept for its next call.
+    """
+
+    def __init__(self, file_name: str, from_end: bool = False, poll_interval: float = 0.05):
+        """
+        :param str file_name: The storage file. It does not need to exist yet.
+        :param bool from_end: Skip the messages already in the file. Default is False.
+        :param float poll_interval: Seconds between checks of the file size while waiting.
+        """
+        self.file_name = file_name
+        self.position = 0
+        self.count = 0
+        self._poll_interval = poll_interval
+        self._inode = None
+        # File size at the last read, which can be ahead of position by an incomplete message.
+        self._size = None
+        self._pending = deque()
+        if from_end:
+            self._skip_to_end()
+
+    def read_new(self) -> List[DltMessage]:
+        """Return the messages completed since the last call."""
+        return self._read_new(_parse_at)
+
+    def read_new_records(self) -> List[Tuple[int, bytes]]:
+        """Return the file offset and the bytes of the messages completed since the last call.
+
+        Cheaper than :meth:`read_new` if only some of the messages need to be parsed.
+        """
+        return self._read_new(lambda data, offset, size, base: (base + offset, data[offset : offset + size]))
+
+    def _read_new(self, convert):
+        try:
+            with open(self.file_name, "rb") as file:
+                stat = os.fstat(file.fileno())
+                self._size = stat.st_size
+                if stat.st_ino != self._inode or stat.st_size < self.position:
+                    # The file was replaced or truncated.
+                    self._inode = stat.st_ino
+                    self.position = 0
+                if stat.st_size <= self.position:
+                    return []
+                # mmap offsets must be multiples of the allocation granularity.
+                base = self.position - self.position % mmap.ALLOCATIONGRANULARITY
+                with mmap.mmap(file.fileno(), stat.st_size - base, access=mmap.ACCESS_READ, offset=base) as data:
+                    found, end = scan(data, self.position - base, stat.st_size - base)
+                    messages = [convert(data, offset, size, base) for offset, size in found]
+                self.position = base + end
+        except FileNotFoundError:
+            self._size = None
+            return []
+        self.count += len(messages)
+        return messages
+
+    def wait_for(self, query=None, timeout=None, include_ext=True, include_non_ext=False) -> Optional[Bunch]:
+        """Wait for the next message matching *query*.
+
+        Only messages appended after the previous read, or read but not returned by the
+        previous call, are considered.
+
+        :param dict query: Attributes to match, see :func:`compare`. None matches any message.
+        :param Optional[float] timeout: Maximum seconds to wait; None waits forever.
+        :return: the matching message as :func:`message_bunch`, or None on timeout.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            if not self._pending:
+                self._pending.extend(self.read_new())
+            while self._pending:
+                message = self._pending.popleft()
+                if not include_ext and message.use_extended_header:
+                    continue
+                if not include_non_ext and not message.use_extended_header:
+                    continue
+                if not query or message.compare(query):
+                    return message_bunch(message)
+            if deadline is not None and time.monotonic() >= deadline:
+                return None
+            self._wait_for_growth(deadline)
+
+    def _wait_for_growth(self, deadline):
+        while deadline is None or time.monotonic() < deadline:
+            try:
+                stat = os.stat(self.file_name)
+                if stat.st_size != self._size or stat.st_ino != self._inode:
+                    return
+            except FileNotFoundError:
+                pass
+            remaining = (
+                self._poll_interval if deadline is None else min(self._poll_interval, deadline - time.monotonic())
+            )
+            time.sleep(max(remaining, 0))
+
+    def _skip_to_end(self):
+        self.read_new()
@@ -0,0 +1,229 @@
+# *******************************************************************************
+# Copyright (c) 2026 Contributors to the Eclipse Foundation
+#
+# See the NOTICE file(s) distributed with this work for additional
+# information regarding copyright ownership.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Apache License Version 2.0 which is available at
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# SPDX-License-Identifier: Apache-2.0
+# *******************************************************************************
+"""Live subscriptions to DLT messages.
+
+Every incoming message is matched once against all subscriptions. Subscriptions
+are grouped by their exact APID, so that a message is only checked against the
+subscriptions for its APID and the ones without APID. The header fields (ECU,
+APID, CTID, log level, extended header) are checked first; the message is parsed
+and its payload decoded only if the headers of some subscription match, and at
+most once for all subscriptions.
+"""
+
+import logging
+import queue
+import threading
+
+from typing import Callable, Optional
+
+from score.itf.core.utils.bunch import Bunch
+from score.itf.plugins.dlt.dlt_storage import (
+    HTYP_UEH,
+    MSTP_LOG,
+    DltMessage,
+    DltStorageTail,
+    compare,
+    match_value,
+    message_bunch,
+    parse_header,
+    parse_message,
+)
+
+
+logger = logging.getLogger(__name__)
+
+_HEADER_FIELDS = ("ecu", "apid", "ctid")
+
+
+class DltQuery:
+    """A query split into the checks on the message headers and the checks on the parsed message.
+
+    The query is a dictionary like the ones of :meth:`DltLogRecord.find`. ``ecu``, ``apid``
+    and ``ctid`` are checked on the headers, as is ``log_level``, which is the maximum log
+    level (1 fatal ... 6 verbose) of log messages. Other keys, e.g. ``payload``, are
+    compared with the parsed message.
+    """
+
+    def __init__(self, query=None, include_ext: bool = True, include_non_ext: bool = False):
+        query = dict(query or {})
+        self.include_ext = include_ext
+        self.include_non_ext = include_non_ext
+        self.log_level = query.pop("log_level", None)
+        header = [(field, query.pop(field)) for field in _HEADER_FIELDS if field in query]
+        # Exact APID, by which the subscriptions are grouped.
+        apid = dict(header).get("apid")
+        if isinstance(apid, bytes):
+            apid = apid.decode(errors="replace")
+        self.apid = apid if isinstance(apid, str) else None
+        self._header = [(_HEADER_FIELDS.index(field), expected) for field, expected in header]
+        self._rest = query
+
+    def matches_header(self, ecu: str, apid: str, ctid: str, htyp: int, msin: int) -> bool:
+        extended = htyp & HTYP_UEH
+        if not (self.include_ext if extended else self.include_non_ext):
+            return False
+        if self.log_level is not None and not (
+            extended and (msin >> 1) & 0x07 == MSTP_LOG and 0 < msin >> 4 <= self.log_level
+        ):
+            return False
+        values = (ecu, apid, ctid)
+        return all(match_value(expected, values[field]) for field, expected in self._header)
+
+    def matches(self, message: DltMessage) -> bool:
+        """Check the items of the query that need the parsed message. The header must match already."""
+        return not self._rest or compare(message, self._rest)
+
+
+class DltSubscription:
+    """Messages matching a query, handed to a callback or collected for :meth:`get`."""
+
+    def __init__(self, owner: "DltSubscriptions", query: DltQuery, callback: Optional[Callable[[Bunch], None]]):
+        self.query = query
+        self.matched = 0
+        self._owner = owner
+        self._callback = callback
+        self._queue = queue.Queue()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.cancel()
+
+    def get(self, timeout: Optional[float] = None) -> Bunch:
+        """Return the next matching message, like the results of :meth:`DltLogRecord.find`.
+
+        :raises TimeoutError: if no message matched within *timeout* seconds.
+        """
+        try:
+            return self._queue.get(timeout=timeout)
+        except queue.Empty as error:
+            raise TimeoutError(f"No DLT message matching the subscription within {timeout} seconds") from error
+
+    def cancel(self) -> None:
+        """Stop receiving messages."""
+        self._owner.remove(self)
+
+    def _deliver(self, message):
+        self.matched += 1
+        result = message_bunch(message)
+        if self._callback is None:
+            self._queue.put(result)
+            return
+        try:
+            self._callback(result)
+        except Exception:
+            logger.exception("DLT subscription callback failed")
+
+
+class DltSubscriptions:
+    """The subscriptions of a DLT source, which passes every message to :meth:`dispatch_record` or :meth:`dispatch`."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscriptions = []
+        # Subscriptions by exact APID and the other ones; replaced as a whole on every change.
+        self._routes = ({}, ())
+        self._follow_stop = None
+
+    def __len__(self):
+        return len(self._subscriptions)
+
+    def subscribe(self, query=None, callback=None, include_ext=True, include_non_ext=False) -> DltSubscription:
+        """Receive the messages matching *query* from now on, see :class:`DltQuery`.
+
+        :param callable callback: Called with every matching message, on the thread dispatching
+            the messages. Without callback, the messages are collected for :meth:`DltSubscription.get`.
+        """
+        subscription = DltSubscription(self, DltQuery(query, include_ext, include_non_ext), callback)
+        with self._lock:
+            self._subscriptions.append(subscription)
+            self._rebuild()
+        return subscription
+
+    def remove(self, subscription: DltSubscription) -> None:
+        with self._lock:
+            if subscription in self._subscriptions:
+                self._subscriptions.remove(subscription)
+                self._rebuild()
+
+    def dispatch_record(self, record: bytes, offset: int = 0) -> None:
+        """Dispatch a message in storage format. It is only parsed if a subscription needs it.
+
+        :param int offset: Offset of the message in its file, reported by the parsed message.
+        """
+        if not self._subscriptions:
+            return
+        _, _, ecu, htyp, _, _, _, apid, ctid, msin, _, _ = parse_header(record, 0)
+        self._dispatch(ecu, apid, ctid, htyp, msin, lambda: _parse_record(record, offset))
+
+    def dispatch(self, message: DltMessage) -> None:
+        """Dispatch a parsed message. Its payload is only decoded if a subscription needs it."""
+        if self._subscriptions:
+            self._dispatch(message.ecu, message.apid, message.ctid, message.htyp, message.msin, lambda: message)
+
+    def follow(self, file_name: str, poll_interval: float = 0.05) -> None:
+        """Dispatch the messages appended to the DLT file *file_name* from now on.
+
+        The file is checked for new messages every *poll_interval* seconds by a thread of its own.
+        Only the headers of the new messages are parsed unless a subscription matches them.
+        """
+        self.stop_following()
+        tail = DltStorageTail(file_name, from_end=True)
+        stop = threading.Event()
+        self._follow_stop = stop
+        threading.Thread(
+            target=self._follow, args=(tail, stop, poll_interval), name=f"dlt-follow-{file_name}", daemon=True
+        ).start()
+
+    def stop_following(self) -> None:
+        stop = self._follow_stop
+        self._follow_stop = None
+        if stop is not None:
+            stop.set()
+
+    def _dispatch(self, ecu, apid, ctid, htyp, msin, parse):
+        by_apid, others = self._routes
+        message = None
+        for subscription in by_apid.get(apid, ()) + others:
+            if not subscription.query.matches_header(ecu, apid, ctid, htyp, msin):
+                continue
+            if message is None:
+                message = parse()
+            if subscription.query.matches(message):
+                subscription._deliver(message)
+
+    def _follow(self, tail, stop, poll_interval):
+        while not stop.is_set():
+            try:
+                for offset, record in tail.read_new_records():
+                    self.dispatch_record(record, offset)
+            except Exception:
+                logger.exception(f"Reading {tail.file_name} failed")
+            stop.wait(poll_interval)
+
+    def _rebuild(self):
+        by_apid = {}
+        others = []
+        for subscription in self._subscriptions:
+            if subscription.query.apid is None:
+                others.append(subscription)
+            else:
+                by_apid.setdefault(subscription.query.apid, []).append(subscription)
+        self._routes = ({apid: tuple(subscriptions) for apid, subscriptions in by_apid.items()}, tuple(others))
+
+
+def _parse_record(record, offset):
+    message = parse_message(record, 0, len(record))
+    message.offset = offset
+    return message
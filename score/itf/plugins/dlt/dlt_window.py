@@ -18,7 +18,11 @@ import dlt.dlt as python_dlt
 
 from score.itf.core.utils.bunch import Bunch
 from score.itf.core.process.process_wrapper import ProcessWrapper
+from score.itf.plugins.dlt.dlt_index import DltIndex
+from score.itf.plugins.dlt.dlt_listener import DLT_PORT, DltListener
 from score.itf.plugins.dlt.dlt_receive import DltReceive, Protocol, protocol_arguments
+from score.itf.plugins.dlt.dlt_storage import DltStorageTail, normalize_timestamp_precision, parse_message
+from score.itf.plugins.dlt.dlt_subscription import DltSubscriptions
 
 
 logger = logging.getLogger(__name__)
@@ -50,6 +54,8 @@ class DltWindow(ProcessWrapper):
         logger_name: str = None,
         dlt_filter: str = None,
         binary_path: str = None,
+        in_process: bool = False,
+        port: int = DLT_PORT,
     ):
         """Initialize DltWindow with target IP, protocol, and optional parameters.
 
@@ -63,6 +69,10 @@ class DltWindow(ProcessWrapper):
         :param bool clear_dlt: If True, clears the DLT file at initialization.
         :param str filter: Filter string for DLT messages.
         :param str binary_path: Path to the dlt-receive binary.
+        :param bool in_process: Receive the messages in the test process with a :class:`DltListener`
+            instead of starting dlt-receive. The received messages can then also be queried live,
+            see :attr:`listener`.
+        :param int port: Port of the in-process receiver, see :class:`DltListener`.
         """
 
         self._file_name = file_name
@@ -70,20 +80,41 @@ class DltWindow(ProcessWrapper):
             with tempfile.NamedTemporaryFile(delete=False, delete_on_close=False) as file:
                 self._file_name = file.name
         self._captured_logs = []
+        self._tail = None
 
         logger_name = logger_name if logger_name else "dlt_receive_window"
         self._initialize_log_capture(logger_name)
 
-        dlt_receive_args = ["-o", self._file_name]
-        dlt_receive_args += protocol_arguments(protocol, host_ip, target_ip, multicast_ips)
-        dlt_receive_args += ["-a", "--stdout-flush"] if print_to_stdout else []
-
         self._filter_file = None
-        if dlt_filter:
-            with tempfile.NamedTemporaryFile(mode="w", delete=False, delete_on_close=False) as file:
-                self._filter_file = file.name
-                file.write(f"{dlt_filter}\n\n")
-            dlt_receive_args += ["-f", self._filter_file]
+        self._listener = None
+        self._print_to_stdout = print_to_stdout
+        self._subscriptions = DltSubscriptions()
+        self._following = False
+        if in_process:
+            # Same format as the filter file of dlt-receive: one "APID CTID" per line.
+            filters = [tuple((line.split() + ["", ""])[:2]) for line in (dlt_filter or "").splitlines() if line.strip()]
+            self._listener = DltListener(
+                protocol,
+                host_ip=host_ip,
+                multicast_ips=multicast_ips,
+                target_ip=target_ip,
+                file_name=self._file_name,
+                port=port,
+                filters=filters,
+                on_message=self._on_message,
+            )
+            binary_path = binary_path or "dlt-receive"
+            dlt_receive_args = []
+        else:
+            dlt_receive_args = ["-o", self._file_name]
+            dlt_receive_args += protocol_arguments(protocol, host_ip, target_ip, multicast_ips)
+            dlt_receive_args += ["-a", "--stdout-flush"] if print_to_stdout else []
+
+            if dlt_filter:
+                with tempfile.NamedTemporaryFile(mode="w", delete=False, delete_on_close=False) as file:
+                    self._filter_file = file.name
+                    file.write(f"{dlt_filter}\n\n")
+                dlt_receive_args += ["-f", self._filter_file]
 
         super().__init__(
             binary_path,
@@ -97,9 +128,81 @@ class DltWindow(ProcessWrapper):
     def stop(self):
         self._stop(None, None, None)
 
+    @property
+    def listener(self):
+        """The in-process :class:`DltListener`, None if dlt-receive is used."""
+        return self._listener
+
     def record(self, filters=None):
+        self._flush()
         return DltLogRecord(self._file_name, filters)
 
+    def index(self, filters=None, sidecar=False):
+        """Return a :class:`DltIndex` of the DLT file.
+
+        It answers the same queries as :meth:`record`, but parses only the message headers
+        up front and decodes a payload only when the headers match. Call its ``update()``
+        to add the messages recorded afterwards.
+
+        :param list filters: Same as for :class:`DltLogRecord`.
+        :param bool sidecar: Reuse the index saved next to the DLT file while the file is unchanged,
+            and save it otherwise. Useful for repeated queries after the recording stopped.
+        """
+        self._flush()
+        return DltIndex(self._file_name, filters, sidecar=sidecar)
+
+    def subscribe(self, query=None, callback=None, include_ext=True, include_non_ext=False):
+        """Receive the messages matching the query from now on.
+
+        The query is checked once for every incoming message: first on its headers, and only if
+        those match, on the parsed message. Other messages are never decoded.
+
+        :param dict query: Same as for :meth:`DltLogRecord.find`, plus ``log_level``, the maximum
+            log level (1 fatal ... 6 verbose) of log messages.
+        :param callable callback: Called with every matching message, as a Bunch like the results
+            of :meth:`DltLogRecord.find`. Without callback, get the messages with ``get(timeout)``.
+        :returns: the :class:`DltSubscription`; cancel it, or use it as a context manager.
+        """
+        # Register first, so that the first read of a followed file already dispatches to it.
+        subscription = self._subscriptions.subscribe(query, callback, include_ext, include_non_ext)
+        if self._listener is None and not self._following:
+            # dlt-receive only writes the file: follow it.
+            self._subscriptions.follow(self._file_name)
+            self._following = True
+        return subscription
+
+    def expect(self, query=None, timeout=None, include_ext=True, include_non_ext=False):
+        """Wait for the next message matching the query, see :meth:`subscribe`.
+
+        To not miss a message caused by an action of the test, subscribe before the action
+        and call ``get(timeout)`` of the subscription after it.
+
+        :raises TimeoutError: if no message matched within *timeout* seconds.
+        """
+        with self.subscribe(query, include_ext=include_ext, include_non_ext=include_non_ext) as subscription:
+            return subscription.get(timeout)
+
+    def tail(self, from_end=False):
+        """Return a reader of the messages appended to the DLT file, see :class:`DltStorageTail`.
+
+        :param bool from_end: Skip the messages already recorded. Default is False.
+        """
+        return DltStorageTail(self._file_name, from_end=from_end)
+
+    def wait_for(self, query=None, timeout=None, include_ext=True, include_non_ext=False):
+        """Wait for the next recorded message matching the query.
+
+        Unlike ``record().find()``, the file is not loaded again: each call only parses the
+        messages recorded since the previous call.
+
+        :param dict query: Same as for :meth:`DltLogRecord.find`.
+        :param float timeout: Maximum seconds to wait; None waits forever.
+        :returns: the message as a Bunch like the results of :meth:`DltLogRecord.find`, or None on timeout.
+        """
+        if self._tail is None:
+            self._tail = self.tail()
+        return self._tail.wait_for(query, timeout, include_ext=include_ext, include_non_ext=include_non_ext)
+
     def file_name(self):
         return self._file_name
 
@@ -117,6 +220,22 @@ class DltWindow(ProcessWrapper):
     def get_captured_logs(self):
         return self._captured_logs
 
+    def _flush(self):
+        if self._listener is not None and self._listener.running:
+            self._listener.flush()
+
+    def _on_message(self, record):
+        if self._print_to_stdout:
+            self._log_message(record)
+        self._subscriptions.dispatch_record(record)
+
+    def _log_message(self, record):
+        message = parse_message(record, 0, len(record))
+        self._logger.info(
+            f"{normalize_timestamp_precision(message.storage_timestamp)} {message.tmsp} {message.ecu} "
+            f"{message.apid} {message.ctid} {message.payload_decoded}"
+        )
+
     def _initialize_log_capture(self, logger_name):
         self._logger = logging.getLogger(logger_name)
         self._log_handler = None
@@ -138,13 +257,22 @@ class DltWindow(ProcessWrapper):
         return self
 
     def _start(self):
-        super().__enter__()
+        if self._listener is not None:
+            self._listener.start()
+        else:
+            super().__enter__()
 
     def __exit__(self, exc_type, exc_val, exc_tb):
         self._stop(exc_type, exc_val, exc_tb)
 
     def _stop(self, exc_type, exc_val, exc_tb):
-        super().__exit__(exc_type, exc_val, exc_tb)
+        if self._listener is not None:
+            self._listener.stop()
+        else:
+            super().__exit__(exc_type, exc_val, exc_tb)
+        if self._following:
+            self._subscriptions.stop_following()
+            self._following = False
         if self._filter_file and os.path.exists(self._filter_file):
             os.remove(self._filter_file)
         if self._logger and self._log_handler:
@@ -204,7 +332,7 @@ class DltLogRecord:
                 if isinstance(payload, bytes):
                     payload = payload.decode(errors="ignore")
 
-                normalized_time = _normalize_timestamp_precision(msg.storage_timestamp)
+                normalized_time = normalize_timestamp_precision(msg.storage_timestamp)
                 result.append(
                     Bunch(
                         time_stamp=msg.tmsp,
@@ -244,16 +372,3 @@ class DltLogRecord:
         and after (optionally) discarding non extended or extended DLT messages
         """
         return self._queried_counter
-
-
-def _normalize_timestamp_precision(epoch_time):
-    try:
-        time_str = str(epoch_time)
-        seconds, microseconds = time_str.split(".")
-
-        if len(microseconds) < 6:
-            microseconds = microseconds.rjust(6, "0")
-
-    except Exception as error:
-        logger.error(f"Error normalizing timestamp precision: {error}")
-    return f"{seconds}.{microseconds}"
@@ -10,22 +10,27 @@
 #
 # SPDX-License-Identifier: Apache-2.0
 # *******************************************************************************
+import json
 import logging
 import subprocess
-import io
 import os
 import shlex
+import shutil
+import struct
 import tarfile
-import threading
 import time
 import docker as pypi_docker
 import pytest
 
 from score.itf.core.com.ssh import Ssh
 from score.itf.core.process.async_process import AsyncProcess
+from score.itf.core.process.io_hub import io_hub
+from score.itf.core.process.output_capture import OutputCapture
+from score.itf.core.utils.tar_stream import ChunkReader, extract_stream, iter_tar_chunks, write_tree
 
 from score.itf.plugins.core import determine_target_scope
 from score.itf.plugins.core import Target
+from score.itf.plugins.docker_pool import ContainerPool
 
 
 logger = logging.getLogger(__name__)
@@ -33,6 +38,12 @@ logger = logging.getLogger(__name__)
 # Default timeout (seconds) for Docker client operations.
 DOCKER_CLIENT_TIMEOUT = 180
 
+# Directory bit of the Go os.FileMode reported in the stat of Docker archive requests.
+_GO_MODE_DIR = 1 << 31
+_COPY_BUFFER_SIZE = 1024 * 1024
+# Repository of the temporary images used by the snapshot reset strategy.
+_SNAPSHOT_REPOSITORY = "score_itf_snapshot"
+
 
 def pytest_addoption(parser):
     parser.addoption(
@@ -62,18 +73,85 @@ def pytest_addoption(parser):
         help="Directory to write extracted coverage files. "
         "Defaults to $TEST_UNDECLARED_OUTPUTS_DIR/sysroot or /tmp/sysroot.",
     )
+    parser.addoption(
+        "--docker-pool-size",
+        action="store",
+        type=int,
+        default=0,
+        help="Number of containers pre-started in the background and handed out to tests. "
+        "Used containers are replaced asynchronously. Disabled by default and ignored with --keep-target.",
+    )
+    parser.addoption(
+        "--docker-reset-strategy",
+        action="store",
+        choices=["recreate", "snapshot"],
+        default="recreate",
+        help="How tests get a clean container: 'recreate' starts a new container and network for every test, "
+        "'snapshot' commits the container file system once after start and restores it between tests. "
+        "Ignored with --keep-target.",
+    )
+
+
+def _raw_socket(sock):
+    """Return the socket object underneath the ``socket.SocketIO`` returned by docker-py for local daemons."""
+    return getattr(sock, "_sock", sock)
+
+
+class _ExecFrames:
+    """Demultiplexes the output frames of a ``docker exec`` socket (8 byte header, then payload)."""
+
+    _HEADER = struct.Struct(">BxxxL")
+
+    def __init__(self, sock):
+        self._sock = sock
+        self._buffer = b""
+        # Output received while reading the PID, not yet handed out by read().
+        self.pending = b""
+
+    def read_stdout_blocking(self) -> bytes:
+        """Return the stdout payload of the next frames; stderr payload is kept in :attr:`pending`."""
+        while True:
+            data = self._sock.recv(4096)
+            if not data:
+                return b""
+            stdout = b""
+            for stream, payload in self._frames(data):
+                if stream == 1:
+                    stdout += payload
+                else:
+                    self.pending += payload
+            if stdout:
+                return stdout
+
+    def read(self, size: int):
+        """Non-blocking read for :class:`IoHub`: payload of stdout and stderr, ``b""`` at the end."""
+        data = self._sock.recv(size)
+        if not data:
+            return b""
+        return b"".join(payload for _, payload in self._frames(data)) or None
+
+    def _frames(self, data):
+        self._buffer += data
+        while len(self._buffer) >= self._HEADER.size:
+            stream, size = self._HEADER.unpack_from(self._buffer)
+            end = self._HEADER.size + size
+            if len(self._buffer) < end:
+                break
+            yield stream, self._buffer[self._HEADER.size : end]
+            self._buffer = self._buffer[end:]
 
 
 class DockerAsyncProcess(AsyncProcess):
     """Handle for a non-blocking command execution inside a Docker container."""
 
-    def __init__(self, container, client, exec_id, pid, output_thread, output_lines):
+    def __init__(self, container, client, exec_id, pid, output_stream, output):
         self._container = container
         self._client = client
         self.exec_id = exec_id
         self._pid = pid
-        self._output_thread = output_thread
-        self._output_lines = output_lines
+        self._output_stream = output_stream
+        # OutputCapture with the output; its bytes and lines counts are available without reading it.
+        self.output = output
         self._logger = logging.getLogger(f"async_exec.{pid}")
 
     def pid(self) -> int:
@@ -96,13 +174,15 @@ class DockerAsyncProcess(AsyncProcess):
         :raises RuntimeError: on timeout.
         """
         start_time = time.time()
+        # The output stream ends with the command, so only the exec state has to be polled afterwards.
+        self._output_stream.join(timeout_s)
         while self.is_running():
             if time.time() - start_time > timeout_s:
                 raise RuntimeError(
                     f"Waiting for process with PID [{self._pid}] to terminate timed out after {timeout_s} seconds"
                 )
             time.sleep(0.1)
-        self._output_thread.join()
+        self._output_stream.join()
         return self.get_exit_code()
 
     def stop(self) -> int:
@@ -119,7 +199,7 @@ class DockerAsyncProcess(AsyncProcess):
             self._logger.error(f"Process with PID [{self._pid}] did not terminate properly, sending SIGKILL.")
             self._kill()
             self.wait()
-        self._output_thread.join()
+        self._output_stream.join()
         return self.get_exit_code()
 
     def _terminate(self):
@@ -128,17 +208,22 @@ class DockerAsyncProcess(AsyncProcess):
     def _kill(self):
         self._container.exec_run(["/bin/bash", "-c", f"kill -9 {self._pid}"])
 
-    def get_output(self) -> str:
-        """Return the captured stdout of the command."""
-        return "\n".join(self._output_lines) + ("\n" if self._output_lines else "")
+    def get_output(self, since: int = 0) -> str:
+        """Return the captured stdout of the command, from byte offset *since* on."""
+        return self.output.get_output(since)
 
 
 class DockerTarget(Target):
-    def __init__(self, container, network=None):
+    def __init__(self, container, network=None, run_kwargs=None):
         super().__init__()
         self.container = container
         self.network = network
         self._client = pypi_docker.from_env(timeout=DOCKER_CLIENT_TIMEOUT)
+        # Arguments the container was started with (besides the image), needed by reset().
+        self._run_kwargs = run_kwargs
+        self._snapshot_image = None
+        self.creation_time = None
+        self.last_reset_time = None
 
     def __getattr__(self, name):
         return getattr(self.container, name)
@@ -146,6 +231,20 @@ class DockerTarget(Target):
     def execute(self, command: str):
         return self.container.exec_run(f"/bin/sh -c {shlex.quote(command)}")
 
+    def execute_many(self, commands, concurrency=4):
+        """Execute independent commands concurrently, each in its own ``docker exec`` instance.
+
+        :param commands: shell commands to execute.
+        :param concurrency: maximum number of exec instances running at once.
+        :return: list of :class:`Bunch` results (see :meth:`Target.execute_many`), in input order.
+        """
+
+        def run(command):
+            exit_code, (stdout, stderr) = self.container.exec_run(f"/bin/sh -c {shlex.quote(command)}", demux=True)
+            return exit_code, stdout or b"", stderr or b""
+
+        return self._run_many(run, commands, concurrency)
+
     def execute_async(self, binary_path, args=None, cwd="/", **kwargs) -> DockerAsyncProcess:
         """Start a binary without blocking and return a :class:`DockerAsyncProcess` handle.
 
@@ -174,81 +273,143 @@ class DockerTarget(Target):
             workdir=cwd,
         )
         exec_id = exec_instance["Id"]
-        # demux=True delivers stdout/stderr as separate (bytes|None, bytes|None)
-        # tuples, preventing early stderr from the child from masking the PID.
-        stream = self._client.api.exec_start(exec_id, stream=True, demux=True)
+        # The raw socket carries stdout and stderr as multiplexed frames. Demultiplexing them
+        # keeps early stderr from the child from masking the PID.
+        sock = _raw_socket(self._client.api.exec_start(exec_id, socket=True))
+        frames = _ExecFrames(sock)
 
         cmd_logger = logging.getLogger(os.path.basename(command.split()[0]))
-        output_lines = []
-
-        def _process_text(text):
-            for line in text.strip().split("\n"):
-                if line:
-                    cmd_logger.info(line)
-                    output_lines.append(line)
-
-        pid = None
-        for stdout_chunk, stderr_chunk in stream:
-            if stderr_chunk:
-                _process_text(stderr_chunk.decode())
-            if stdout_chunk:
-                pid_line, _, remainder = stdout_chunk.decode().partition("\n")
-                pid = int(pid_line.strip())
-                if remainder.strip():
-                    _process_text(remainder)
-                break
-
-        if pid is None:
-            raise RuntimeError(f"Failed to extract PID from stdout for '{command}'")
-
-        def _async_log(log_stream):
-            for stdout_chunk, stderr_chunk in log_stream:
-                if stdout_chunk:
-                    _process_text(stdout_chunk.decode())
-                if stderr_chunk:
-                    _process_text(stderr_chunk.decode())
-
-        output_thread = threading.Thread(target=_async_log, args=(stream,), daemon=True)
-        output_thread.start()
+        output = OutputCapture(f"docker-exec-{os.path.basename(binary_path)}")
+
+        def _process_line(line):
+            if line:
+                cmd_logger.info(line)
+                output.append_line(line)
+
+        def _close():
+            sock.close()
+            output.close()
+
+        sock.settimeout(DOCKER_CLIENT_TIMEOUT)
+        stdout = b""
+        while b"\n" not in stdout:
+            chunk = frames.read_stdout_blocking()
+            if not chunk:
+                raise RuntimeError(f"Failed to extract PID from stdout for '{command}'")
+            stdout += chunk
+        pid_line, _, remainder = stdout.partition(b"\n")
+        try:
+            pid = int(pid_line.strip())
+        except ValueError as error:
+            raise RuntimeError(f"Failed to extract PID from stdout for '{command}'") from error
+
+        # The rest of the output is read by the I/O hub.
+        sock.setblocking(False)
+        output_stream = io_hub().register(
+            f"docker exec {exec_id[:12]}",
+            sock,
+            _process_line,
+            read=frames.read,
+            on_close=_close,
+            initial=frames.pending + remainder,
+        )
 
-        return DockerAsyncProcess(self.container, self._client, exec_id, pid, output_thread, output_lines)
+        return DockerAsyncProcess(self.container, self._client, exec_id, pid, output_stream, output)
 
     def upload(self, local_path: str, remote_path: str) -> None:
-        if not os.path.isfile(local_path):
+        """Upload a file or a directory to *remote_path* in the container.
+
+        The tar archive expected by the Docker API is generated on the fly while it is sent.
+        """
+        if not os.path.exists(local_path):
             raise FileNotFoundError(local_path)
 
         remote_dir = os.path.dirname(remote_path) or "/"
         remote_name = os.path.basename(remote_path)
 
-        tar_stream = io.BytesIO()
-        with tarfile.open(fileobj=tar_stream, mode="w", dereference=True) as tar:
-            tar.add(local_path, arcname=remote_name)
-        tar_stream.seek(0)
+        def write(fileobj):
+            with tarfile.open(fileobj=fileobj, mode="w|", dereference=True) as tar:
+                tar.add(local_path, arcname=remote_name)
 
-        ok = self.container.put_archive(remote_dir, tar_stream.getvalue())
-        if not ok:
-            raise RuntimeError(f"Failed to upload '{local_path}' to '{remote_path}'")
+        self._put_archive(remote_dir, write, f"Failed to upload '{local_path}' to '{remote_path}'")
+
+    def upload_tree(self, local_dir: str, remote_dir: str) -> None:
+        """Upload the content of a directory into *remote_dir*, streamed as a single tar archive."""
+        exit_code, output = self.execute(f"mkdir -p {shlex.quote(remote_dir)}")
+        if exit_code != 0:
+            raise RuntimeError(f"Could not create '{remote_dir}': {output.decode(errors='replace')}")
+        self._put_archive(remote_dir, lambda f: write_tree(f, local_dir), f"Failed to upload '{local_dir}'")
+
+    def _put_archive(self, remote_dir, write, error_message):
+        if not self.container.put_archive(remote_dir, iter_tar_chunks(write)):
+            raise RuntimeError(error_message)
 
     def download(self, remote_path: str, local_path: str) -> None:
-        stream, _ = self.container.get_archive(remote_path)
-        tar_bytes = b"".join(stream)
+        """Download a file or a directory from the container to *local_path*.
 
-        os.makedirs(os.path.dirname(local_path) or ".", exist_ok=True)
-        with tarfile.open(fileobj=io.BytesIO(tar_bytes), mode="r:*") as tar:
-            members = tar.getmembers()
-            if not members:
-                raise FileNotFoundError(remote_path)
+        The archive returned by the Docker API is extracted while it is received.
+        """
+        stream, stat = self.container.get_archive(remote_path)
+        reader = ChunkReader(stream)
+        if stat["mode"] & _GO_MODE_DIR:
+            extract_stream(reader, local_path, strip_components=1)
+            return
 
-            member = members[0]
-            extracted = tar.extractfile(member)
+        os.makedirs(os.path.dirname(local_path) or ".", exist_ok=True)
+        with tarfile.open(fileobj=reader, mode="r|") as tar:
+            member = tar.next()
+            extracted = tar.extractfile(member) if member is not None else None
             if extracted is None:
                 raise FileNotFoundError(remote_path)
             with open(local_path, "wb") as f:
-                f.write(extracted.read())
+                shutil.copyfileobj(extracted, f, _COPY_BUFFER_SIZE)
+
+    def download_tree(self, remote_dir: str, local_dir: str) -> None:
+        """Download the content of *remote_dir* into *local_dir*, streamed as a single tar archive."""
+        self.download(remote_dir, local_dir)
+
+    def deployment_key(self):
+        """Files deployed to the container stay until the container is removed."""
+        return f"docker:{self.container.id}"
 
     def restart(self) -> None:
         self.container.restart()
 
+    def snapshot(self) -> None:
+        """Commit the container file system to a temporary image that :meth:`reset` restores.
+
+        Running processes, memory and mounted volumes are not part of the snapshot.
+        """
+        if self._run_kwargs is None:
+            raise RuntimeError("Only containers started by the docker plugin can be snapshotted")
+        start = time.monotonic()
+        self.discard_snapshot()
+        self._snapshot_image = self.container.commit(repository=_SNAPSHOT_REPOSITORY, tag=self.container.short_id)
+        logger.info(f"Snapshot of container {self.container.short_id} taken in {time.monotonic() - start:.2f}s")
+
+    def reset(self) -> None:
+        """Replace the container by a new one started from the image taken by :meth:`snapshot`.
+
+        The new container is attached to the same network, but gets a new id and IP address.
+        """
+        if self._snapshot_image is None:
+            raise RuntimeError("No snapshot to reset to, call snapshot() first")
+        start = time.monotonic()
+        self.container.remove(force=True)
+        self.container = self._client.containers.run(self._snapshot_image.id, **self._run_kwargs)
+        self.last_reset_time = time.monotonic() - start
+        comparison = f" (creating the container took {self.creation_time:.2f}s)" if self.creation_time else ""
+        logger.info(f"Reset container from snapshot in {self.last_reset_time:.2f}s{comparison}")
+
+    def discard_snapshot(self) -> None:
+        """Remove the image taken by :meth:`snapshot`, if any."""
+        if self._snapshot_image is not None:
+            try:
+                self._client.images.remove(self._snapshot_image.id, force=True)
+            except Exception:
+                logger.warning(f"Failed to remove snapshot image {self._snapshot_image.short_id}", exc_info=True)
+            self._snapshot_image = None
+
     def _network_attr(self, key, network=None):
         """Return a NetworkSettings attribute for the given Docker network.
 
@@ -335,10 +496,7 @@ def _extract_coverage_from_container(target, output_base):
             logger.warning(f"Failed to extract {remote_path}", exc_info=True)
 
 
-@pytest.fixture(scope=determine_target_scope)
-def target_init(request, _docker_configuration):
-    print(_docker_configuration)
-
+def _run_bootstrap(request):
     docker_image_bootstrap = request.config.getoption("docker_image_bootstrap")
     if docker_image_bootstrap:
         logger.info(f"Executing custom image bootstrap command: {docker_image_bootstrap}")
@@ -351,14 +509,18 @@ def target_init(request, _docker_configuration):
             logger.error(f"Bootstrap failed with exit code {result.returncode}")
             raise subprocess.CalledProcessError(result.returncode, docker_image_bootstrap)
 
-    docker_image = request.config.getoption("docker_image")
-    client = pypi_docker.from_env(timeout=DOCKER_CLIENT_TIMEOUT)
 
+def _create_target(client, docker_image, docker_configuration, snapshot=False):
+    """Start a container on a new, dedicated bridge network and wrap it in a :class:`DockerTarget`.
+
+    :param bool snapshot: Take a snapshot of the started container for :meth:`DockerTarget.reset`.
+    """
+    start = time.monotonic()
     known_keys = {"command", "init", "environment", "volumes", "shm_size", "detach", "auto_remove"}
-    reserved_overrides = {k for k in ("detach", "auto_remove") if k in _docker_configuration}
+    reserved_overrides = {k for k in ("detach", "auto_remove") if k in docker_configuration}
     if reserved_overrides:
         logger.warning(f"docker_configuration contains reserved keys {reserved_overrides} which will be ignored")
-    extra_kwargs = {k: v for k, v in _docker_configuration.items() if k not in known_keys}
+    extra_kwargs = {k: v for k, v in docker_configuration.items() if k not in known_keys}
 
     # Create a per-container bridge network so that get_ip() / get_gateway()
     # return addresses unique to this container.
@@ -367,44 +529,108 @@ def target_init(request, _docker_configuration):
         driver="bridge",
     )
 
+    run_kwargs = dict(
+        command=docker_configuration["command"],
+        detach=True,
+        auto_remove=False,
+        init=docker_configuration["init"],
+        environment=docker_configuration["environment"],
+        volumes=docker_configuration["volumes"],
+        shm_size=docker_configuration["shm_size"],
+        network=network.name,
+        **extra_kwargs,
+    )
     try:
-        container = client.containers.run(
-            docker_image,
-            _docker_configuration["command"],
-            detach=True,
-            auto_remove=False,
-            init=_docker_configuration["init"],
-            environment=_docker_configuration["environment"],
-            volumes=_docker_configuration["volumes"],
-            shm_size=_docker_configuration["shm_size"],
-            network=network.name,
-            **extra_kwargs,
-        )
+        container = client.containers.run(docker_image, **run_kwargs)
     except Exception:
         network.remove()
         raise
 
-    target = None
+    target = DockerTarget(container, network=network, run_kwargs=run_kwargs)
+    target.creation_time = time.monotonic() - start
+    if snapshot:
+        try:
+            target.snapshot()
+        except Exception:
+            _remove_target(target)
+            raise
+    return target
+
+
+def _remove_target(target):
+    try:
+        try:
+            target.container.stop(timeout=1)
+        finally:
+            # Ensure restart() doesn't accidentally delete the container mid-test.
+            target.container.remove(force=True)
+    finally:
+        try:
+            target.network.remove()
+        except Exception:
+            logger.warning(f"Failed to remove network {target.network.name}", exc_info=True)
+        target.discard_snapshot()
+
+
+@pytest.fixture(scope="session")
+def _docker_container_pools():
+    """Container pools of the session, one per image and configuration."""
+    pools = {}
+    yield pools
+    for pool in pools.values():
+        pool.close()
+
+
+def _acquire_pooled_target(request, pools, docker_image, docker_configuration, size, snapshot):
+    key = json.dumps({"image": docker_image, "snapshot": snapshot, **docker_configuration}, sort_keys=True, default=str)
+    pool = pools.get(key)
+    if pool is None:
+        _run_bootstrap(request)
+        client = pypi_docker.from_env(timeout=DOCKER_CLIENT_TIMEOUT)
+        pool = ContainerPool(
+            create=lambda: _create_target(client, docker_image, docker_configuration, snapshot=snapshot),
+            destroy=_remove_target,
+            size=size,
+            recycle=DockerTarget.reset if snapshot else None,
+        )
+        pools[key] = pool
+
+    target, wait_time = pool.acquire(timeout=DOCKER_CLIENT_TIMEOUT)
+    logger.info(f"Waited {wait_time:.3f}s for a pooled container")
+    request.node.user_properties.append(("docker_pool_wait_s", round(wait_time, 3)))
+    request.node.user_properties.append(("docker_create_s", round(target.creation_time, 3)))
+    if target.last_reset_time is not None:
+        request.node.user_properties.append(("docker_reset_s", round(target.last_reset_time, 3)))
+    return target, pool.release
+
+
+@pytest.fixture(scope=determine_target_scope)
+def target_init(request, _docker_configuration, _docker_container_pools):
+    print(_docker_configuration)
+
+    docker_image = request.config.getoption("docker_image")
+    pool_size = request.config.getoption("docker_pool_size")
+    snapshot = request.config.getoption("docker_reset_strategy") == "snapshot"
+    # Pooling and resetting only pay off when every test gets its own container.
+    if (pool_size or snapshot) and request.scope == "function":
+        target, release = _acquire_pooled_target(
+            request, _docker_container_pools, docker_image, _docker_configuration, max(pool_size, 1), snapshot
+        )
+    else:
+        _run_bootstrap(request)
+        client = pypi_docker.from_env(timeout=DOCKER_CLIENT_TIMEOUT)
+        target = _create_target(client, docker_image, _docker_configuration)
+        release = _remove_target
+
     try:
-        target = DockerTarget(container, network=network)
         yield target
     finally:
         try:
-            if target is not None and request.config.getoption("extract_coverage"):
+            if request.config.getoption("extract_coverage"):
                 _extract_coverage_from_container(
                     target,
                     request.config.getoption("coverage_output_dir"),
                 )
         except Exception:
             logger.warning("Coverage extraction failed", exc_info=True)
-        try:
-            try:
-                container.stop(timeout=1)
-            finally:
-                # Ensure restart() doesn't accidentally delete the container mid-test.
-                container.remove(force=True)
-        finally:
-            try:
-                network.remove()
-            except Exception:
-                logger.warning(f"Failed to remove network {network.name}", exc_info=True)
+        release(target)
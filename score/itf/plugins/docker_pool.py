@@ -0,0 +1,121 @@
+# *******************************************************************************
+# Copyright (c) 2026 Contributors to the Eclipse Foundation
+#
+# See the NOTICE file(s) distributed with this work for additional
+# information regarding copyright ownership.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Apache License Version 2.0 which is available at
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# SPDX-License-Identifier: Apache-2.0
+# *******************************************************************************
+import logging
+import queue
+import threading
+import time
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional
+
+
+logger = logging.getLogger(__name__)
+
+
+class ContainerPool:
+    """Keeps a number of started containers ready to be handed out to tests.
+
+    Containers are created in background threads. A released container is reset
+    for reuse, or discarded and replaced, in the background as well, so the next
+    test only waits if it asks for a container faster than the pool can produce them.
+    """
+
+    def __init__(self, create: Callable, destroy: Callable, size: int, recycle: Optional[Callable] = None):
+        """
+        :param callable create: Creates and starts a new container, returns an opaque item.
+        :param callable destroy: Stops and removes an item returned by *create*.
+        :param int size: Number of containers kept ready.
+        :param Optional[callable] recycle: Resets a released item so that it can be handed out
+            again. If None or if it fails, released items are destroyed and replaced. Default is None.
+        """
+        if size < 1:
+            raise ValueError("Container pool size must be at least 1")
+        self._create = create
+        self._destroy = destroy
+        self._recycle = recycle
+        self._ready = queue.Queue()
+        self._lock = threading.Lock()
+        self._closed = False
+        self._executor = ThreadPoolExecutor(max_workers=size, thread_name_prefix="docker-pool")
+        for _ in range(size):
+            self._executor.submit(self._fill)
+
+    def acquire(self, timeout: Optional[float] = None):
+        """Take a ready container out of the pool.
+
+        :param Optional[float] timeout: Maximum seconds to wait. None waits forever.
+        :return: tuple ``(item, wait_time)`` with the time spent waiting in seconds.
+        :raises Exception: if creating the container failed; a replacement is started.
+        """
+        start = time.monotonic()
+        try:
+            item = self._ready.get(timeout=timeout)
+        except queue.Empty:
+            raise TimeoutError(f"No pooled container became ready within {timeout} seconds") from None
+        wait_time = time.monotonic() - start
+        if isinstance(item, Exception):
+            with self._lock:
+                if not self._closed:
+                    self._executor.submit(self._fill)
+            raise item
+        return item, wait_time
+
+    def release(self, item) -> None:
+        """Return a used container; it is recycled or replaced in the background."""
+        with self._lock:
+            if not self._closed:
+                self._executor.submit(self._recycle_or_replace, item)
+                return
+        self._destroy_quietly(item)
+
+    def close(self) -> None:
+        """Wait for pending work, then remove all containers that are still ready."""
+        with self._lock:
+            self._closed = True
+        self._executor.shutdown(wait=True)
+        while True:
+            try:
+                item = self._ready.get_nowait()
+            except queue.Empty:
+                break
+            if not isinstance(item, Exception):
+                self._destroy_quietly(item)
+
+    def _recycle_or_replace(self, item):
+        if self._recycle is not None:
+            try:
+                self._recycle(item)
+            except Exception:
+                logger.warning("Resetting a pooled container failed, replacing it", exc_info=True)
+            else:
+                self._ready.put(item)
+                return
+        self._destroy_quietly(item)
+        self._fill()
+
+    def _fill(self):
+        start = time.monotonic()
+        try:
+            item = self._create()
+        except Exception as ex:
+            logger.warning("Creating a pooled container failed", exc_info=True)
+            self._ready.put(ex)
+            return
+        logger.debug(f"Pooled container ready after {time.monotonic() - start:.2f}s")
+        self._ready.put(item)
+
+    def _destroy_quietly(self, item):
+        try:
+            self._destroy(item)
+        except Exception:
+            logger.warning("Removing a pooled container failed", exc_info=True)
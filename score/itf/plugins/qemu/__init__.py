@@ -12,48 +12,26 @@
 # *******************************************************************************
 import logging
 import os
-import subprocess
 import socket
-import tempfile
+import threading
+from contextlib import ExitStack, contextmanager
+
 import pytest
 
 from score.itf.plugins.qemu.qemu_target import qemu_target
+from score.itf.plugins.core import determine_target_scope
 from score.itf.plugins.qemu.checks import pre_tests_phase
-from score.itf.plugins.qemu.image_format import get_image_format
+from score.itf.plugins.qemu.fleet import QemuFleet, instance_config, worker_share
+from score.itf.plugins.qemu.images import create_overlay
 from score.itf.core.utils import padder
 from score.itf.core.utils.bunch import Bunch
 from score.itf.plugins.qemu.config import load_configuration
+from score.itf.plugins.qemu.qemu import _SUPPORTED_MACHINES, _get_qemu_path
+from score.itf.plugins.qemu.vm_state_cache import READY_STATE, VmStateCache
 
 logger = logging.getLogger(__name__)
 
 
-def _create_overlay(base_image: str) -> str:
-    """Create a temporary qcow2 overlay backed by *base_image*.
-
-    All writes go to the ephemeral overlay so the original image is never
-    modified.  The caller is responsible for cleaning up the returned path.
-    """
-    overlay_fd, overlay_path = tempfile.mkstemp(suffix=".qcow2", prefix="qemu_overlay_")
-    os.close(overlay_fd)
-    subprocess.run(
-        [
-            "qemu-img",
-            "create",
-            "-f",
-            "qcow2",
-            "-b",
-            base_image,
-            "-F",
-            get_image_format(base_image),
-            overlay_path,
-        ],
-        check=True,
-        capture_output=True,
-    )
-    logger.info(f"Created qcow2 overlay: {overlay_path} (backing: {base_image})")
-    return overlay_path
-
-
 def pytest_addoption(parser):
     parser.addoption(
         "--qemu-config",
@@ -80,6 +58,21 @@ def pytest_addoption(parser):
         help="Path to a QEMU disk image (qcow2, wic, or img). "
         "An ephemeral overlay is created so the original image is not modified.",
     )
+    parser.addoption(
+        "--qemu-snapshot-cache",
+        action="store",
+        default=None,
+        help="Directory for saved VM states. The first session of a configuration saves the booted VM, "
+        "later sessions and restarts restore it instead of booting. Requires --qemu-rootfs.",
+    )
+    parser.addoption(
+        "--qemu-fleet-size",
+        action="store",
+        type=int,
+        default=0,
+        help="Number of QEMU instances booted in parallel and shared by the tests, each with its own overlay "
+        "and host ports. Split across pytest-xdist workers. Requires port_forwarding in the configuration.",
+    )
 
 
 @pytest.fixture(scope="session")
@@ -111,22 +104,168 @@ def config(request):
     )
 
 
-@pytest.fixture(scope="session")
-def target_init(config, request, dlt):
-    logger.info(f"Starting tests on host: {socket.gethostname()}")
+def _target_init_scope(fixture_name, config):
+    # A fleet hands every test its own instance unless --keep-target is given.
+    if config.getoption("qemu_fleet_size", 0):
+        return determine_target_scope(fixture_name, config)
+    return "session"
+
+
+def _vm_state_cache(config, request):
+    """Return the VM state cache and the key of the configuration, or ``(None, None)`` if not enabled."""
+    state_cache_dir = request.config.getoption("qemu_snapshot_cache")
+    if not state_cache_dir:
+        return None, None
+    if not config.qemu_rootfs:
+        logger.warning("--qemu-snapshot-cache requires --qemu-rootfs, VM states are not cached")
+        return None, None
+    state_cache = VmStateCache(state_cache_dir)
+    architecture = _SUPPORTED_MACHINES[config.qemu_config.qemu_machine]["architecture"]
+    state_key = state_cache.key(
+        config.qemu_kernel, os.path.abspath(config.qemu_rootfs), config.qemu_config, _get_qemu_path(architecture)
+    )
+    return state_cache, state_key
+
+
+@contextmanager
+def _rootfs_overlay(config, state_cache=None, state_key=None):
+    """Provide a fresh overlay of the rootfs, removed again on exit.
+
+    Yields the overlay path and the VM state to start from: with a VM state cache, the
+    overlay holds the cached state of the configuration if there is one. Both are None
+    without a rootfs.
+    """
     overlay_path = None
+    loadvm = None
     if config.qemu_rootfs:
-        overlay_path = _create_overlay(os.path.abspath(config.qemu_rootfs))
+        if state_cache is not None:
+            overlay_path = state_cache.restore(state_key)
+            loadvm = READY_STATE if overlay_path else None
+        if overlay_path is None:
+            overlay_path = create_overlay(config.qemu_rootfs)
     try:
-        with qemu_target(
-            Bunch(
-                qemu_config=config.qemu_config,
-                qemu_kernel=config.qemu_kernel,
-                qemu_rootfs=overlay_path,
-            )
-        ) as qemu:
-            pre_tests_phase(qemu)
-            yield qemu
+        yield overlay_path, loadvm
     finally:
         if overlay_path and os.path.exists(overlay_path):
             os.unlink(overlay_path)
+
+
+@contextmanager
+def _started_target(
+    config, qemu_config, overlay_path, loadvm, state_cache=None, state_key=None, save_state=True, on_started=None
+):
+    """Start a QEMU target on *overlay_path* and run the startup checks.
+
+    Without *loadvm* the booted VM state is saved into the cache if *save_state*.
+    *on_started* is called once QEMU runs, before the startup checks.
+    """
+    with qemu_target(
+        Bunch(
+            qemu_config=qemu_config,
+            qemu_kernel=config.qemu_kernel,
+            qemu_rootfs=overlay_path,
+            qemu_loadvm=loadvm,
+        )
+    ) as qemu:
+        if on_started is not None:
+            on_started()
+        pre_tests_phase(qemu)
+        if state_cache is not None and loadvm is None and save_state:
+            try:
+                qemu.save_state(READY_STATE, on_saved=lambda: state_cache.store(state_key, overlay_path))
+            except Exception:
+                logger.warning("Saving the VM state failed, later sessions will boot again", exc_info=True)
+        yield qemu
+
+
+@contextmanager
+def _booted_target(config, qemu_config, state_cache=None, state_key=None):
+    """Boot a QEMU target on a fresh overlay of the rootfs and run the startup checks.
+
+    With a VM state cache, the target starts from the cached state of the configuration
+    if there is one. Otherwise the booted VM state is saved into the cache.
+    """
+    with _rootfs_overlay(config, state_cache, state_key) as (overlay_path, loadvm):
+        with _started_target(config, qemu_config, overlay_path, loadvm, state_cache, state_key) as qemu:
+            yield qemu
+
+
+@contextmanager
+def _fleet_instance(config, state_cache, state_key, ports, saving):
+    """Boot a fleet instance on free host ports.
+
+    The ports are chosen and bound by QEMU while holding *ports*, so that instances
+    booting in parallel cannot pick the same ones. The overlay is prepared before, so
+    parallel boots only serialize on the QEMU start. Ports taken by other processes in
+    the meantime fail the boot, which the fleet retries on new ports. The instance
+    holding *saving* saves the booted VM state; it releases *saving* if its boot fails.
+    """
+    save_state = saving.acquire(blocking=False)
+    booted = False
+    try:
+        with _rootfs_overlay(config, state_cache, state_key) as (overlay_path, loadvm), ExitStack() as allocation:
+            ports.acquire()
+            allocation.callback(ports.release)
+            with _started_target(
+                config,
+                instance_config(config.qemu_config),
+                overlay_path,
+                loadvm,
+                state_cache,
+                state_key,
+                save_state=save_state,
+                on_started=allocation.close,
+            ) as qemu:
+                booted = True
+                yield qemu
+    finally:
+        if save_state and not booted:
+            saving.release()
+
+
+@pytest.fixture(scope="session")
+def _qemu_fleet(config, request, dlt):
+    """QEMU fleet of the session (or of this xdist worker), None if --qemu-fleet-size is not given."""
+    size = request.config.getoption("qemu_fleet_size")
+    if not size:
+        yield None
+        return
+    state_cache, state_key = _vm_state_cache(config, request)
+    ports = threading.Lock()
+    # Only one instance saves the booted VM state, the others start from the cache next time.
+    saving = threading.Lock()
+
+    def launch(index):
+        return _fleet_instance(config, state_cache, state_key, ports, saving)
+
+    indexes = worker_share(size)
+    logger.info(f"Starting QEMU fleet instances {indexes} on host: {socket.gethostname()}")
+    fleet = QemuFleet(launch, indexes, health_check=lambda target: target.is_healthy())
+    try:
+        yield fleet
+    finally:
+        stats = fleet.stats()
+        logger.info(
+            f"QEMU fleet: {stats.tests} tests on {len(indexes)} instances, {stats.replacements} instances replaced"
+        )
+        fleet.close()
+
+
+@pytest.fixture(scope=_target_init_scope)
+def target_init(config, request, dlt, record_testsuite_property, _qemu_fleet):
+    if _qemu_fleet is not None:
+        target, wait_time = _qemu_fleet.acquire()
+        logger.info(f"Waited {wait_time:.3f}s for an idle QEMU fleet instance")
+        if request.scope == "function":
+            request.node.user_properties.append(("qemu_fleet_wait_s", round(wait_time, 3)))
+        try:
+            yield target
+        finally:
+            _qemu_fleet.release(target)
+        return
+
+    logger.info(f"Starting tests on host: {socket.gethostname()}")
+    state_cache, state_key = _vm_state_cache(config, request)
+    with _booted_target(config, config.qemu_config, state_cache, state_key) as qemu:
+        record_testsuite_property("qemu_boot_to_ready_s", f"{qemu.boot_time:.3f}")
+        yield qemu
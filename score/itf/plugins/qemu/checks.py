@@ -20,23 +20,20 @@ logger = logging.getLogger(__name__)
 
 
 def pre_tests_phase(target):
-    _check_ping(target, check_timeout=10)
+    _check_ready(target)
     _check_ssh_is_up(target, check_timeout=5, check_n_retries=5)
     _check_sftp_is_up(target)
     # TODO Add more checks in pre_tests_phase
 
 
-def _check_ping(target, check_timeout: int = 180):
-    """Checks whether the target can be pinged.
+def _check_ready(target):
+    """Checks whether the SSH server of the target answers within the configured boot timeout.
 
-    :param Target target: Target to ping.
-    :param boolext_ip: Use external IP address. Default: False.
-    :param int check_timeout: How long to wait for check to succeed. Default: 180.
-    :raises AssertionError: If the target cannot be pinged within the specified time-frame.
+    :param QemuTarget target: Target to wait for.
+    :raises AssertionError: If the target does not become ready in time.
     """
-    result = target.ping(timeout=check_timeout)
-    assert result, f"Target is not pingable within expected time frame"
-    logger.info("Check target ping: OK")
+    assert target.wait_until_ready(), "Target is not ready within expected time frame"
+    logger.info(f"Check target ready: OK ({target.boot_time:.2f}s after start)")
 
 
 def _check_ssh_is_up(target, check_timeout: int = 15, check_n_retries: int = 5):
@@ -29,6 +29,9 @@ Optional top-level keys:
         - `qemu_machine` (`pc-x86_64` or `virt-aarch64`, default `pc-x86_64`)
         - `qemu_kernel_cmdline` (string)
     - `port_forwarding` (array of objects with `host_port` and `guest_port`)
+    - `boot_markers` (array of strings printed on the serial console when the
+      target is about to become reachable, e.g. `"Started OpenSSH"`)
+    - `boot_timeout` (int seconds >= 1, default 180)
 
 Each entry in `networks` must contain:
     - `name` (string)
@@ -124,6 +127,8 @@ class QemuConfigModel(BaseModel):
     qemu_machine: Literal["pc-x86_64", "virt-aarch64"] = "pc-x86_64"
     qemu_kernel_cmdline: str | None = None
     port_forwarding: list[PortForwarding] = Field(default_factory=list)
+    boot_markers: list[str] = Field(default_factory=list)
+    boot_timeout: int = Field(default=180, ge=1)
 
 
 def load_configuration(config_file: str) -> QemuConfigModel:
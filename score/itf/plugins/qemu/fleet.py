@@ -0,0 +1,216 @@
+# *******************************************************************************
+# Copyright (c) 2026 Contributors to the Eclipse Foundation
+#
+# See the NOTICE file(s) distributed with this work for additional
+# information regarding copyright ownership.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Apache License Version 2.0 which is available at
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# SPDX-License-Identifier: Apache-2.0
+# *******************************************************************************
+"""Several QEMU VMs of the same configuration, shared by the tests of a session.
+
+Every instance runs on its own qcow2 overlay with its own host ports. Tests take
+an idle instance and give it back afterwards; instances that are no longer
+healthy are stopped and replaced in the background.
+
+With pytest-xdist, the instances are split across the workers (see
+:func:`worker_share`), so xdist's scheduler hands tests to idle VMs.
+"""
+
+import contextlib
+import logging
+import os
+import queue
+import socket
+import threading
+import time
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Optional
+
+from score.itf.core.utils.bunch import Bunch
+
+
+logger = logging.getLogger(__name__)
+
+# Attempts to boot an instance slot before it is given up.
+_MAX_BOOT_ATTEMPTS = 3
+
+
+def allocate_ports(count: int) -> List[int]:
+    """Return *count* distinct TCP ports that are currently free on the host."""
+    sockets = []
+    try:
+        for _ in range(count):
+            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            sockets.append(sock)
+            sock.bind(("", 0))
+        return [sock.getsockname()[1] for sock in sockets]
+    finally:
+        for sock in sockets:
+            sock.close()
+
+
+def instance_config(qemu_config):
+    """Return a copy of *qemu_config* with every forwarded host port replaced by a free one.
+
+    :raises ValueError: if the configuration does not use port forwarding, since
+        several VMs cannot share bridged network adapters and addresses.
+    """
+    if not qemu_config.port_forwarding:
+        raise ValueError("A QEMU fleet requires a configuration with port_forwarding")
+    ports = allocate_ports(len(qemu_config.port_forwarding))
+    mapping = {forward.host_port: port for forward, port in zip(qemu_config.port_forwarding, ports)}
+    return qemu_config.model_copy(
+        update={
+            "port_forwarding": [
+                forward.model_copy(update={"host_port": mapping[forward.host_port]})
+                for forward in qemu_config.port_forwarding
+            ],
+            "ssh_port": mapping.get(qemu_config.ssh_port, qemu_config.ssh_port),
+        }
+    )
+
+
+def worker_share(size: int, worker: Optional[str] = None, worker_count: Optional[int] = None) -> List[int]:
+    """Return the indexes of the fleet instances managed by this pytest-xdist worker.
+
+    The instances are split round-robin; every worker gets at least one.
+
+    :param int size: Total number of instances.
+    :param Optional[str] worker: xdist worker id such as ``gw2``. Default is ``$PYTEST_XDIST_WORKER``.
+    :param Optional[int] worker_count: Number of workers. Default is ``$PYTEST_XDIST_WORKER_COUNT``.
+    """
+    worker = worker if worker is not None else os.environ.get("PYTEST_XDIST_WORKER")
+    if worker_count is None:
+        worker_count = int(os.environ.get("PYTEST_XDIST_WORKER_COUNT", "1"))
+    if not worker or worker_count <= 1:
+        return list(range(size))
+    worker_index = int(worker.lstrip("gw"))
+    share = list(range(worker_index, size, worker_count))
+    return share or [worker_index]
+
+
+class QemuFleet:
+    """Boots a set of QEMU instances in parallel and hands idle, healthy ones out to tests."""
+
+    def __init__(self, launch: Callable, indexes: List[int], health_check: Callable):
+        """
+        :param callable launch: ``launch(index)`` returns a context manager that boots an instance
+            and yields its target; leaving it stops the instance and removes its files.
+        :param list indexes: Indexes of the instances to run.
+        :param callable health_check: ``health_check(target)`` returns True if the instance can be reused.
+        """
+        if not indexes:
+            raise ValueError("A QEMU fleet needs at least one instance")
+        self._launch = launch
+        self._health_check = health_check
+        self._idle = queue.Queue()
+        self._lock = threading.Lock()
+        self._closed = False
+        self._instances = {}
+        self._alive = len(indexes)
+        self._replacements = 0
+        self._tests = 0
+        self._executor = ThreadPoolExecutor(max_workers=len(indexes), thread_name_prefix="qemu-fleet")
+        for index in indexes:
+            self._executor.submit(self._boot, index)
+
+    def acquire(self, timeout: Optional[float] = None):
+        """Take an idle instance.
+
+        :param Optional[float] timeout: Maximum seconds to wait. None waits forever.
+        :return: tuple ``(target, wait_time)`` with the time spent waiting in seconds.
+        :raises RuntimeError: if no instance could be booted.
+        """
+        start = time.monotonic()
+        deadline = None if timeout is None else start + timeout
+        while True:
+            with self._lock:
+                if self._alive == 0 and self._idle.empty():
+                    raise RuntimeError("No QEMU fleet instance could be booted")
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                raise TimeoutError(f"No QEMU fleet instance became idle within {timeout} seconds")
+            try:
+                # Wake up regularly to notice when the last instance slot was given up.
+                index = self._idle.get(timeout=1 if remaining is None else min(remaining, 1))
+            except queue.Empty:
+                continue
+            with self._lock:
+                instance = self._instances[index]
+                instance.tests += 1
+                self._tests += 1
+            return instance.target, time.monotonic() - start
+
+    def release(self, target) -> None:
+        """Give back an instance; it is checked and made idle again or replaced in the background."""
+        with self._lock:
+            instance = next(instance for instance in self._instances.values() if instance.target is target)
+            if not self._closed:
+                self._executor.submit(self._check, instance)
+                return
+        self._idle.put(instance.index)
+
+    def close(self) -> None:
+        """Wait for pending boots and checks, then stop all instances."""
+        with self._lock:
+            self._closed = True
+        self._executor.shutdown(wait=True)
+        with ThreadPoolExecutor(max_workers=max(len(self._instances), 1)) as executor:
+            executor.map(self._stop, list(self._instances.values()))
+        self._instances.clear()
+
+    def stats(self) -> Bunch:
+        """Return the number of ``instances``, ``tests`` run on them and ``replacements`` of failed ones."""
+        with self._lock:
+            return Bunch(
+                instances=len(self._instances),
+                tests=self._tests,
+                replacements=self._replacements,
+            )
+
+    def _boot(self, index):
+        for attempt in range(1, _MAX_BOOT_ATTEMPTS + 1):
+            stack = contextlib.ExitStack()
+            start = time.monotonic()
+            try:
+                target = stack.enter_context(self._launch(index))
+            except Exception:
+                stack.close()
+                logger.warning(f"Booting QEMU fleet instance {index} failed (attempt {attempt})", exc_info=True)
+                continue
+            logger.info(f"QEMU fleet instance {index} ready after {time.monotonic() - start:.2f}s")
+            with self._lock:
+                self._instances[index] = Bunch(index=index, target=target, stack=stack, tests=0)
+            self._idle.put(index)
+            return
+        logger.error(f"Giving up QEMU fleet instance {index} after {_MAX_BOOT_ATTEMPTS} failed boots")
+        with self._lock:
+            self._alive -= 1
+
+    def _check(self, instance):
+        try:
+            healthy = self._health_check(instance.target)
+        except Exception:
+            logger.debug(f"Health check of QEMU fleet instance {instance.index} failed", exc_info=True)
+            healthy = False
+        if healthy:
+            self._idle.put(instance.index)
+            return
+        logger.warning(f"QEMU fleet instance {instance.index} is unhealthy after {instance.tests} tests, replacing it")
+        with self._lock:
+            self._instances.pop(instance.index, None)
+            self._replacements += 1
+        self._stop(instance)
+        self._boot(instance.index)
+
+    @staticmethod
+    def _stop(instance):
+        try:
+            instance.stack.close()
+        except Exception:
+            logger.warning(f"Stopping QEMU fleet instance {instance.index} failed", exc_info=True)
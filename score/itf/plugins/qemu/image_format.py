@@ -12,11 +12,43 @@
 # *******************************************************************************
 
 import json
+import os
 import subprocess
+import threading
+
+_QCOW2_MAGIC = b"QFI\xfb"
+
+_probed_formats = {}
+_probed_formats_lock = threading.Lock()
 
 
 def get_image_format(path_to_image: str) -> str:
-    """Determine the disk image format by probing image metadata."""
+    """Determine the disk image format by probing image metadata.
+
+    qcow2 images are recognized from their header, other formats are probed with
+    ``qemu-img info``. Results are cached by path, size and modification time.
+    """
+    try:
+        st = os.stat(path_to_image)
+    except OSError:
+        return _probe_image_format(path_to_image)
+    key = (os.path.abspath(path_to_image), st.st_size, st.st_mtime_ns)
+    with _probed_formats_lock:
+        image_format = _probed_formats.get(key)
+    if image_format is None:
+        image_format = _probe_image_format(path_to_image)
+        with _probed_formats_lock:
+            _probed_formats[key] = image_format
+    return image_format
+
+
+def _probe_image_format(path_to_image):
+    try:
+        with open(path_to_image, "rb") as f:
+            if f.read(len(_QCOW2_MAGIC)) == _QCOW2_MAGIC:
+                return "qcow2"
+    except OSError:
+        pass
     result = subprocess.run(
         ["qemu-img", "info", "--output=json", path_to_image],
         check=True,
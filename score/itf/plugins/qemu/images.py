@@ -0,0 +1,144 @@
+# *******************************************************************************
+# Copyright (c) 2026 Contributors to the Eclipse Foundation
+#
+# See the NOTICE file(s) distributed with this work for additional
+# information regarding copyright ownership.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Apache License Version 2.0 which is available at
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# SPDX-License-Identifier: Apache-2.0
+# *******************************************************************************
+"""Creation of the ephemeral qcow2 overlays QEMU targets run on.
+
+Overlays backed by raw or qcow2 images are written directly: an empty qcow2 v3
+image only consists of a header naming the backing file, a refcount table with
+one refcount block and an all-zero L1 table. Other backing formats are handled
+by ``qemu-img create``.
+"""
+
+import json
+import logging
+import os
+import struct
+import subprocess
+import tempfile
+
+from score.itf.plugins.qemu.image_format import get_image_format
+
+
+logger = logging.getLogger(__name__)
+
+_QCOW2_MAGIC = b"QFI\xfb"
+_QCOW2_VERSION = 3
+_QCOW2_HEADER = struct.Struct(">4sIQIIQIIQQIIQQQQII")
+_CLUSTER_BITS = 16
+_CLUSTER_SIZE = 1 << _CLUSTER_BITS
+# Refcount entries are 16 bits wide (refcount_order 4), as in images created by qemu-img.
+_REFCOUNT_ORDER = 4
+_BACKING_FORMAT_EXTENSION = 0xE2792ACA
+_END_OF_EXTENSIONS = 0
+
+
+def create_overlay(base_image: str) -> str:
+    """Create a temporary qcow2 overlay backed by *base_image*.
+
+    All writes go to the ephemeral overlay so the original image is never
+    modified. The caller is responsible for cleaning up the returned path.
+    """
+    base_image = os.path.abspath(base_image)
+    backing_format = get_image_format(base_image)
+    overlay_fd, overlay_path = tempfile.mkstemp(suffix=".qcow2", prefix="qemu_overlay_")
+    os.close(overlay_fd)
+    try:
+        if backing_format in ("raw", "qcow2"):
+            write_qcow2_overlay(overlay_path, base_image, backing_format, virtual_size(base_image, backing_format))
+        else:
+            subprocess.run(
+                ["qemu-img", "create", "-f", "qcow2", "-b", base_image, "-F", backing_format, overlay_path],
+                check=True,
+                capture_output=True,
+            )
+    except BaseException:
+        os.unlink(overlay_path)
+        raise
+    logger.info(f"Created qcow2 overlay: {overlay_path} (backing: {base_image})")
+    return overlay_path
+
+
+def virtual_size(image: str, image_format: str) -> int:
+    """Return the size in bytes of the disk presented to the guest by *image*."""
+    if image_format == "raw":
+        return os.path.getsize(image)
+    if image_format == "qcow2":
+        with open(image, "rb") as f:
+            header = f.read(32)
+        if header[:4] != _QCOW2_MAGIC:
+            raise ValueError(f"{image} is not a qcow2 image")
+        return struct.unpack(">Q", header[24:32])[0]
+    result = subprocess.run(
+        ["qemu-img", "info", "--output=json", image],
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    return json.loads(result.stdout)["virtual-size"]
+
+
+def write_qcow2_overlay(path: str, backing_file: str, backing_format: str, size: int) -> None:
+    """Write an empty qcow2 v3 image of *size* bytes backed by *backing_file*.
+
+    Layout: header cluster (header, extensions, backing file name), refcount table,
+    refcount block, L1 table. Every cluster of the file has a refcount of 1.
+    """
+    l2_entries = _CLUSTER_SIZE // 8
+    l1_size = max(1, -(-size // (_CLUSTER_SIZE * l2_entries)))
+    l1_clusters = -(-(l1_size * 8) // _CLUSTER_SIZE)
+    refcount_table_offset = _CLUSTER_SIZE
+    refcount_block_offset = 2 * _CLUSTER_SIZE
+    l1_table_offset = 3 * _CLUSTER_SIZE
+    clusters = 3 + l1_clusters
+    if clusters > _CLUSTER_SIZE * 8 // (1 << _REFCOUNT_ORDER):
+        raise ValueError(f"Virtual size {size} is too large for a single refcount block")
+
+    extensions = _header_extension(_BACKING_FORMAT_EXTENSION, backing_format.encode())
+    extensions += _header_extension(_END_OF_EXTENSIONS, b"")
+    backing_name = backing_file.encode()
+    backing_offset = _QCOW2_HEADER.size + len(extensions)
+    if backing_offset + len(backing_name) > _CLUSTER_SIZE:
+        raise ValueError(f"Backing file name is too long: {backing_file}")
+
+    header = _QCOW2_HEADER.pack(
+        _QCOW2_MAGIC,
+        _QCOW2_VERSION,
+        backing_offset,
+        len(backing_name),
+        _CLUSTER_BITS,
+        size,
+        0,  # crypt_method
+        l1_size,
+        l1_table_offset,
+        refcount_table_offset,
+        1,  # refcount_table_clusters
+        0,  # nb_snapshots
+        0,  # snapshots_offset
+        0,  # incompatible_features
+        0,  # compatible_features
+        0,  # autoclear_features
+        _REFCOUNT_ORDER,
+        _QCOW2_HEADER.size,
+    )
+    with open(path, "wb") as f:
+        f.write(header + extensions + backing_name)
+        f.seek(refcount_table_offset)
+        f.write(struct.pack(">Q", refcount_block_offset))
+        f.seek(refcount_block_offset)
+        f.write(struct.pack(f">{clusters}H", *([1] * clusters)))
+        # The L1 table is all zeros: no cluster is allocated, all reads go to the backing file.
+        f.truncate(l1_table_offset + l1_clusters * _CLUSTER_SIZE)
+
+
+def _header_extension(kind, data):
+    padding = b"\0" * (-len(data) % 8)
+    return struct.pack(">II", kind, len(data)) + data + padding
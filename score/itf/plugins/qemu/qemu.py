@@ -55,6 +55,8 @@ class Qemu:
         port_forwarding,
         rootfs,
         kernel_cmdline,
+        qmp_socket=None,
+        loadvm=None,
     ):
         """Create a QEMU instance with the specified parameters.
 
@@ -67,6 +69,8 @@ class Qemu:
         :param list port_forwarding: List of port forwarding configurations.
         :param str rootfs: Optional path to a qcow2 disk image.
         :param str kernel_cmdline: Optional kernel command line string.
+        :param str qmp_socket: Optional path of a UNIX socket on which QMP is served.
+        :param str loadvm: Optional name of a VM state snapshot in *rootfs* to start from instead of booting.
         """
         if machine not in _SUPPORTED_MACHINES:
             raise ValueError("machine must be one of: " + ", ".join(sorted(_SUPPORTED_MACHINES)))
@@ -78,6 +82,8 @@ class Qemu:
         self.__port_forwarding = port_forwarding
         self.__rootfs = rootfs
         self.__kernel_cmdline = kernel_cmdline
+        self.__qmp_socket = qmp_socket
+        self.__loadvm = loadvm
 
         self.__check_qemu_is_installed()
 
@@ -97,7 +103,19 @@ class Qemu:
         self._subprocess = subprocess.Popen(**subprocess_args)
         return self._subprocess
 
-    def stop(self):
+    def is_running(self):
+        return self._subprocess is not None and self._subprocess.poll() is None
+
+    def stop(self, grace=0):
+        """Stop QEMU, terminating and finally killing it if it does not exit.
+
+        :param float grace: Seconds to wait for QEMU to exit on its own first. Default is 0.
+        """
+        if grace and self._subprocess.poll() is None:
+            try:
+                self._subprocess.wait(grace)
+            except subprocess.TimeoutExpired:
+                pass
         if self._subprocess.poll() is None:
             self._subprocess.terminate()
             self._subprocess.wait(2)
@@ -148,6 +166,7 @@ class Qemu:
             + self.__port_forwarding_args()
             + self.__kernel_args()
             + self.__rootfs_args()
+            + self.__state_args()
         )
 
     def __kernel_args(self):
@@ -168,6 +187,14 @@ class Qemu:
             f"if=none,format=qcow2,file={self.__rootfs},id=vd0",
         ]
 
+    def __state_args(self):
+        args = []
+        if self.__qmp_socket:
+            args.extend(["-qmp", f"unix:{self.__qmp_socket},server=on,wait=off"])
+        if self.__loadvm:
+            args.extend(["-loadvm", self.__loadvm])
+        return args
+
     def __network_devices_args(self):
         def get_netdev_args(adapter, id):
             return [
@@ -11,10 +11,15 @@
 # SPDX-License-Identifier: Apache-2.0
 # *******************************************************************************
 import logging
+import os
+import shutil
 import subprocess
+import tempfile
+import time
 
 from score.itf.core.process.console import PipeConsole
 from score.itf.plugins.qemu.qemu import Qemu
+from score.itf.plugins.qemu.qmp import QmpClient, QmpError
 
 logger = logging.getLogger(__name__)
 
@@ -30,7 +35,12 @@ class QemuProcess:
         machine,
         rootfs,
         kernel_cmdline,
+        loadvm=None,
     ):
+        """
+        :param str loadvm: Optional name of a VM state saved in *rootfs* (see :meth:`save_state`)
+            to start from instead of booting. Restarts restore it as well.
+        """
         self._path_to_qemu_kernel_image = path_to_qemu_kernel_image
         self._available_ram = available_ram
         self._available_cores = available_cores
@@ -39,6 +49,11 @@ class QemuProcess:
         self._machine = machine
         self._rootfs = rootfs
         self._kernel_cmdline = kernel_cmdline
+        self._loadvm = loadvm
+        # Created by start() and removed by __exit__, so an instance that is never entered leaves nothing behind.
+        self._qmp_dir = os.path.join(tempfile.gettempdir(), f"qemu_qmp_{os.urandom(8).hex()}")
+        self._qmp_socket = os.path.join(self._qmp_dir, "qmp.sock")
+        self._qmp = None
         self._qemu = Qemu(
             self._path_to_qemu_kernel_image,
             self._available_ram,
@@ -48,14 +63,20 @@ class QemuProcess:
             machine=self._machine,
             rootfs=self._rootfs,
             kernel_cmdline=self._kernel_cmdline,
+            qmp_socket=self._qmp_socket,
+            loadvm=self._loadvm,
         )
         self._console = None
+        self._started_at = None
 
     def __enter__(self):
         return self.start()
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        self.stop()
+        try:
+            self.stop()
+        finally:
+            shutil.rmtree(self._qmp_dir, ignore_errors=True)
 
     def start(self):
         logger.info("Starting Qemu...")
@@ -65,24 +86,151 @@ class QemuProcess:
             logger.info(f"Using QEMU kernel command line: {self._kernel_cmdline}")
         if self._rootfs is not None:
             logger.info(f"Using QEMU root filesystem image: {self._rootfs}")
+        if self._loadvm is not None:
+            logger.info(f"Starting from saved VM state: {self._loadvm}")
         subprocess_params = {
             "stdin": subprocess.PIPE,
             "stdout": subprocess.PIPE,
             "stderr": subprocess.STDOUT,
         }
         # pylint: disable=too-many-function-args
-        qemu_subprocess = self._qemu.start(subprocess_params)
-        self._console = PipeConsole("QEMU", qemu_subprocess)
+        self._started_at = time.monotonic()
+        os.makedirs(self._qmp_dir, mode=0o700, exist_ok=True)
+        try:
+            qemu_subprocess = self._qemu.start(subprocess_params)
+        except BaseException:
+            shutil.rmtree(self._qmp_dir, ignore_errors=True)
+            raise
+        try:
+            self._console = PipeConsole("QEMU", qemu_subprocess)
+            self._qmp = QmpClient(self._qmp_socket, is_alive=self._qemu.is_running)
+            self._qmp.connect()
+            self._qmp.add_event_listener(lambda event: logger.info(f"QEMU event: {event['event']}"))
+        except BaseException as error:
+            self._abort_start(qemu_subprocess, error)
+            raise
         return self
 
-    def stop(self):
+    def _abort_start(self, qemu_subprocess, error):
+        """Tear down a QEMU whose start failed after spawning it.
+
+        :raises RuntimeError: with the output of QEMU if it exited on its own.
+        """
+        exited = qemu_subprocess.poll() is not None
+        if self._qmp is not None:
+            self._qmp.close()
+            self._qmp = None
+        try:
+            self._qemu.stop()
+        except Exception:  # pylint: disable=broad-except
+            logger.debug("QEMU exited with an error", exc_info=True)
+        finally:
+            shutil.rmtree(self._qmp_dir, ignore_errors=True)
+        if not exited or self._console is None:
+            return
+        # The pipe is closed now, so the reader gets to the end of the output quickly.
+        self._console.line_reader.join(timeout=2)
+        output = "\n".join(self._console.line_reader.lines())
+        raise RuntimeError(
+            f"QEMU exited with code {qemu_subprocess.returncode} before serving QMP:\n{output}"
+        ) from error
+
+    def stop(self, graceful=False, timeout=30):
+        """Stop QEMU.
+
+        :param bool graceful: Ask the guest to power off (see :meth:`powerdown`) before quitting. Default is False.
+        :param float timeout: Maximum seconds to wait for a graceful power off. Default is 30.
+        """
         logger.info("Stopping Qemu...")
-        self._qemu.stop()
+        if self._qmp is not None:
+            try:
+                if graceful and self.is_running():
+                    self.powerdown(timeout)
+                if self.is_running():
+                    self._qmp.quit()
+            except (QmpError, OSError):
+                logger.debug("Quitting QEMU over QMP failed, terminating the process", exc_info=True)
+            finally:
+                self._qmp.close()
+                self._qmp = None
+        self._qemu.stop(grace=2)
 
     def restart(self):
-        self.stop()
-        self.start()
+        """Restart the VM without respawning QEMU.
+
+        Restores the saved VM state if there is one, otherwise resets the VM. A stopped
+        QEMU process is started again.
+        """
+        if not self.is_running():
+            self.stop()
+            self.start()
+            return
+        start = time.monotonic()
+        self._started_at = start
+        if self._loadvm is not None:
+            self._qmp.human_monitor_command(f"loadvm {self._loadvm}", timeout=300)
+            logger.info(f"Restored VM state {self._loadvm} in {time.monotonic() - start:.2f}s")
+            return
+        reset = self._qmp.expect_event("RESET")
+        self._qmp.system_reset()
+        if reset.wait(timeout=10) is None:
+            logger.warning("QEMU did not report the reset of the VM")
+        logger.info(f"Reset VM in {time.monotonic() - start:.2f}s")
+
+    def is_running(self):
+        return self._qemu.is_running()
+
+    def powerdown(self, timeout=30) -> bool:
+        """Request a graceful power off from the guest and wait for it.
+
+        :param float timeout: Maximum seconds to wait for the guest to shut down. Default is 30.
+        :return: True if the guest shut down within *timeout*.
+        """
+        shutdown = self._qmp.expect_event("SHUTDOWN")
+        self._qmp.system_powerdown()
+        return shutdown.wait(timeout) is not None
+
+    def pause(self):
+        """Pause the VM."""
+        self._qmp.stop()
+
+    def resume(self):
+        """Resume a paused VM."""
+        self._qmp.cont()
+
+    def status(self) -> dict:
+        """Return the QMP run state of the VM, e.g. ``{"running": True, "status": "running"}``."""
+        return self._qmp.query_status()
+
+    @property
+    def qmp(self):
+        """The :class:`QmpClient` connected to the running QEMU, e.g. to wait for or listen to events."""
+        return self._qmp
+
+    def save_state(self, tag, on_saved=None):
+        """Save the VM state (CPU, memory, devices and disk) as internal snapshot *tag* of the rootfs image.
+
+        Later restarts restore this state instead of booting.
+
+        :param str tag: Name of the snapshot.
+        :param callable on_saved: Called after saving while the VM is still paused, e.g. to copy the image.
+        """
+        start = time.monotonic()
+        self.pause()
+        try:
+            self._qmp.human_monitor_command(f"savevm {tag}", timeout=300)
+            logger.info(f"Saved VM state {tag} in {time.monotonic() - start:.2f}s")
+            if on_saved is not None:
+                on_saved()
+        finally:
+            self.resume()
+        self._loadvm = tag
 
     @property
     def console(self):
         return self._console
+
+    @property
+    def started_at(self):
+        """``time.monotonic()`` value of the last start, reset or state restore of the VM."""
+        return self._started_at
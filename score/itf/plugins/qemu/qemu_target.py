@@ -18,27 +18,35 @@ import time
 from contextlib import contextmanager, nullcontext
 
 from score.itf.core.process.async_process import AsyncProcess
+from score.itf.core.process.io_hub import io_hub
+from score.itf.core.process.output_capture import OutputCapture
 from score.itf.plugins.core import Target
 from score.itf.plugins.qemu.qemu_process import QemuProcess
+from score.itf.plugins.qemu.readiness import probe_ssh, wait_until_ready
 
 from score.itf.core.com.ssh import Ssh
 from score.itf.core.com.sftp import Sftp
+from score.itf.core.com.ssh_pool import SshPool
 from score.itf.core.com.ping import ping, ping_lost
+from score.itf.core.utils.tar_stream import extract_stream, write_tree
 
 
+logger = logging.getLogger(__name__)
+
 QEMU_CAPABILITIES = ["ssh", "sftp"]
 
 
 class QemuAsyncProcess(AsyncProcess):
     """Handle for a non-blocking command execution on a QEMU target via SSH."""
 
-    def __init__(self, target, ssh_ctx, channel, pid, output_thread, output_lines):
+    def __init__(self, target, ssh_ctx, channel, pid, output_stream, output):
         self._target = target
         self._ssh_ctx = ssh_ctx
         self._channel = channel
         self._pid = pid
-        self._output_thread = output_thread
-        self._output_lines = output_lines
+        self._output_stream = output_stream
+        # OutputCapture with the output; its bytes and lines counts are available without reading it.
+        self.output = output
         self._logger = logging.getLogger(f"async_exec.{pid}")
         self._closed = False
 
@@ -61,14 +69,11 @@ class QemuAsyncProcess(AsyncProcess):
         :return: exit code of the command.
         :raises RuntimeError: on timeout.
         """
-        start_time = time.time()
-        while self.is_running():
-            if time.time() - start_time > timeout_s:
-                raise RuntimeError(
-                    f"Waiting for process with PID [{self._pid}] to terminate timed out after {timeout_s} seconds"
-                )
-            time.sleep(0.1)
-        self._output_thread.join()
+        if not self._channel.status_event.wait(timeout_s):
+            raise RuntimeError(
+                f"Waiting for process with PID [{self._pid}] to terminate timed out after {timeout_s} seconds"
+            )
+        self._output_stream.join()
         exit_code = self.get_exit_code()
         self._close_ssh()
         return exit_code
@@ -87,7 +92,7 @@ class QemuAsyncProcess(AsyncProcess):
             self._logger.error(f"Process with PID [{self._pid}] did not terminate properly, sending SIGKILL.")
             self._kill()
             self.wait()
-        self._output_thread.join()
+        self._output_stream.join()
         exit_code = self.get_exit_code()
         self._close_ssh()
         return exit_code
@@ -106,32 +111,62 @@ class QemuAsyncProcess(AsyncProcess):
     def _kill(self):
         self._target.execute(f"kill -9 {self._pid}")
 
-    def get_output(self) -> str:
-        """Return the captured stdout of the command."""
-        return "\n".join(self._output_lines) + ("\n" if self._output_lines else "")
+    def get_output(self, since: int = 0) -> str:
+        """Return the captured stdout of the command, from byte offset *since* on."""
+        return self.output.get_output(since)
 
 
 class QemuTarget(Target):
-    def __init__(self, process, config):
+    def __init__(self, process, config, ssh_pool_size=1):
         super().__init__(capabilities=QEMU_CAPABILITIES)
         self._process = process
         self._config = config
+        # Connections used by execute/upload/download are kept alive and shared, so
+        # that only the first call pays for the TCP connect, key exchange and auth.
+        self._ssh_pool = SshPool(lambda: self.ssh(timeout=30), size=ssh_pool_size)
+        self._tar_available = None
+        self._boot_id = os.urandom(8).hex()
+        self.boot_time = None
 
     def kill_process(self):
+        self._ssh_pool.invalidate()
+        self._boot_id = os.urandom(8).hex()
         self._process.stop()
 
     def restart_process(self):
+        self._ssh_pool.invalidate()
+        self._boot_id = os.urandom(8).hex()
         self._process.restart()
 
     def restart(self) -> None:
         self.restart_process()
 
+    def save_state(self, tag, on_saved=None):
+        """Save the running VM state so that :meth:`restart` restores it instead of rebooting.
+
+        See :meth:`QemuProcess.save_state`.
+        """
+        self._process.save_state(tag, on_saved=on_saved)
+
+    def close(self) -> None:
+        """Close the pooled SSH connections."""
+        self._ssh_pool.close()
+
+    def ssh_pool_stats(self):
+        """Return the hit/miss/reconnect counters of the pooled SSH connections."""
+        return self._ssh_pool.stats()
+
+    def deployment_key(self):
+        """Deployed files may live on a tmpfs, so every boot counts as a new deployment."""
+        config = self._config
+        return f"qemu:{config.networks[0].ip_address}:{config.ssh_port}:{self._boot_id}"
+
     def execute(self, command: str):
         timeout = 30
         max_exec_time = 180
         verbose = True
 
-        with self.ssh(timeout=timeout) as ssh:
+        with self._ssh_pool.connection() as ssh:
             exit_code, output_lines, _ = ssh.execute_command_output(
                 command,
                 timeout=timeout,
@@ -141,14 +176,115 @@ class QemuTarget(Target):
         output = "".join(output_lines).encode()
         return exit_code, output
 
+    def execute_many(self, commands, concurrency=4):
+        """Execute independent commands concurrently as parallel channels on one SSH transport.
+
+        The SSH server limits the number of sessions per connection (``MaxSessions``,
+        10 by default for OpenSSH), so *concurrency* should stay below that limit.
+
+        :param commands: shell commands to execute.
+        :param concurrency: maximum number of commands in flight at once.
+        :return: list of :class:`Bunch` results (see :meth:`Target.execute_many`), in input order.
+        """
+        with self._ssh_pool.connection() as ssh:
+
+            def run(command):
+                exit_code, stdout_lines, stderr_lines = ssh.execute_command_output(
+                    command,
+                    timeout=30,
+                    max_exec_time=180,
+                    verbose=False,
+                    separate_stderr=True,
+                )
+                return exit_code, "".join(stdout_lines).encode(), "".join(stderr_lines).encode()
+
+            return self._run_many(run, commands, concurrency)
+
     def upload(self, local_path: str, remote_path: str) -> None:
-        with self.sftp() as sftp:
+        with self._ssh_pool.connection() as ssh, self.sftp(ssh) as sftp:
             sftp.upload(local_path, remote_path)
 
     def download(self, remote_path: str, local_path: str) -> None:
-        with self.sftp() as sftp:
+        with self._ssh_pool.connection() as ssh, self.sftp(ssh) as sftp:
             sftp.download(remote_path, local_path)
 
+    def upload_tree(self, local_dir: str, remote_dir: str) -> None:
+        """Upload a directory tree as a single tar stream over one SSH exec channel.
+
+        The archive is produced on the fly from the host filesystem and unpacked by
+        ``tar`` on the target, so per-file round trips are avoided. Falls back to
+        :meth:`Sftp.upload_dir` when ``tar`` is not available on the target.
+        """
+        if not self._has_tar():
+            with self._ssh_pool.connection() as ssh, self.sftp(ssh) as sftp:
+                sftp.upload_dir(local_dir, remote_dir, verbose=False)
+            return
+
+        start = time.monotonic()
+        remote = shlex.quote(remote_dir)
+        with self._exec_channel(f"mkdir -p {remote} && tar -x -C {remote} -f -") as channel:
+            with channel.makefile("wb") as stream:
+                files = write_tree(stream, local_dir)
+            channel.shutdown_write()
+        logger.info(f"Uploaded {files} files as tar stream in {time.monotonic() - start:.2f}s")
+
+    def download_tree(self, remote_dir: str, local_dir: str) -> None:
+        """Download a directory tree as a single tar stream over one SSH exec channel.
+
+        Falls back to :meth:`Sftp.download_dir` when ``tar`` is not available on the target.
+        """
+        if not self._has_tar():
+            with self._ssh_pool.connection() as ssh, self.sftp(ssh) as sftp:
+                sftp.download_dir(remote_dir, local_dir, verbose=False)
+            return
+
+        start = time.monotonic()
+        with self._exec_channel(f"tar -c -C {shlex.quote(remote_dir)} -f - .") as channel:
+            files = extract_stream(channel.makefile("rb"), local_dir)
+        logger.info(f"Downloaded {files} files as tar stream in {time.monotonic() - start:.2f}s")
+
+    def _has_tar(self):
+        if self._tar_available is None:
+            with self._ssh_pool.connection() as ssh:
+                self._tar_available = ssh.execute_command("command -v tar", verbose=False) == 0
+            if not self._tar_available:
+                logger.info("'tar' is not available on the target, directory transfers use SFTP")
+        return self._tar_available
+
+    @contextmanager
+    def _exec_channel(self, command):
+        """Run *command* on a new channel of a pooled connection and yield the channel.
+
+        Stderr is read in the background, so that a command printing many warnings
+        cannot stall the transfer. On exit the remaining output is drained, and a
+        non-zero exit status or a failed transfer raises :class:`RuntimeError` with
+        the exit status and stderr of the command.
+        """
+        failure = None
+        with self._ssh_pool.connection() as ssh:
+            channel = ssh.get_paramiko_client().get_transport().open_session()
+            stderr = bytearray()
+            reader = threading.Thread(
+                target=lambda: stderr.extend(channel.makefile_stderr("rb").read()), name="exec-stderr", daemon=True
+            )
+            try:
+                channel.exec_command(command)
+                reader.start()
+                try:
+                    yield channel
+                    channel.makefile("rb").read()
+                except OSError as error:
+                    # E.g. a broken pipe because the command exited early; report its stderr instead.
+                    failure = error
+                    channel.shutdown_write()
+                exit_code = channel.recv_exit_status()
+                reader.join()
+            finally:
+                channel.close()
+        if exit_code != 0 or failure is not None:
+            message = stderr.decode(errors="replace").strip()
+            raise RuntimeError(f"Command '{command}' failed with exit code {exit_code}: {message}") from failure
+
     def execute_async(self, binary_path, args=None, cwd="/", **kwargs) -> QemuAsyncProcess:
         """Start a binary without blocking and return a :class:`QemuAsyncProcess` handle.
 
@@ -188,38 +324,52 @@ class QemuTarget(Target):
             pid = int(pid_line.decode().strip())
 
             cmd_logger = logging.getLogger(os.path.basename(command.split()[0]))
-            output_lines = []
-
-            def _async_log():
-                def _recv_and_process():
-                    data = channel.recv(4096)
-                    if not data:
-                        return False
-                    for line in data.decode(errors="replace").strip().split("\n"):
-                        cmd_logger.info(line)
-                        output_lines.append(line)
-                    return True
-
-                while True:
-                    if channel.recv_ready():
-                        if not _recv_and_process():
-                            break
-                    elif channel.exit_status_ready():
-                        while channel.recv_ready():
-                            if not _recv_and_process():
-                                break
-                        break
-                    else:
-                        time.sleep(0.1)
-
-            output_thread = threading.Thread(target=_async_log, daemon=True)
-            output_thread.start()
-
-            return QemuAsyncProcess(self, ssh_ctx, channel, pid, output_thread, output_lines)
+            output = OutputCapture(f"ssh-exec-{os.path.basename(binary_path)}")
+
+            def _process_line(line):
+                cmd_logger.info(line)
+                output.append_line(line)
+
+            # The rest of the output is read by the I/O hub; the channel's fileno() becomes
+            # readable when data or the end of the stream arrives.
+            channel.setblocking(False)
+            output_stream = io_hub().register(
+                f"ssh exec {pid}", channel, _process_line, read=channel.recv, on_close=output.close
+            )
+
+            return QemuAsyncProcess(self, ssh_ctx, channel, pid, output_stream, output)
         except Exception:
             ssh_ctx.__exit__(None, None, None)
             raise
 
+    def wait_until_ready(self, timeout=None) -> bool:
+        """Wait until the SSH server of the target answers.
+
+        Probes the SSH port while watching the QEMU console for the configured
+        ``boot_markers``, see :func:`score.itf.plugins.qemu.readiness.wait_until_ready`.
+        The time from the start of the VM until it was ready is stored in :attr:`boot_time`.
+
+        :param float timeout: Maximum seconds to wait. Default is ``boot_timeout`` of the configuration.
+        :return: True if the target became ready in time.
+        """
+        result = wait_until_ready(
+            self._config.networks[0].ip_address,
+            self._config.ssh_port,
+            console=self._process.console if self._process else None,
+            markers=self._config.boot_markers,
+            timeout=timeout if timeout is not None else self._config.boot_timeout,
+            started_at=self._process.started_at if self._process else None,
+        )
+        if result.ready:
+            self.boot_time = result.boot_time
+        return result.ready
+
+    def is_healthy(self, timeout=5) -> bool:
+        """Return True if QEMU is running and the SSH server of the target answers within *timeout* seconds."""
+        if self._process is not None and not self._process.is_running():
+            return False
+        return probe_ssh(self._config.networks[0].ip_address, self._config.ssh_port, timeout=timeout)
+
     def ssh(
         self,
         timeout: int = 15,
@@ -267,6 +417,7 @@ class QemuTarget(Target):
             address=self._config.networks[0].ip_address,
             timeout=timeout,
             wait_ms_precision=wait_ms_precision,
+            port=self._config.ssh_port,
         )
 
     def ping_lost(self, timeout, interval=1, wait_ms_precision=None):
@@ -275,6 +426,7 @@ class QemuTarget(Target):
             timeout=timeout,
             interval=interval,
             wait_ms_precision=wait_ms_precision,
+            port=self._config.ssh_port,
         )
 
 
@@ -293,10 +445,14 @@ def qemu_target(test_config):
             machine=test_config.qemu_config.qemu_machine,
             rootfs=test_config.qemu_rootfs,
             kernel_cmdline=test_config.qemu_config.qemu_kernel_cmdline,
+            loadvm=test_config.get("qemu_loadvm"),
         )
     else:
         process_ctx = nullcontext()
 
     with process_ctx as qemu_process:
         target = QemuTarget(qemu_process, test_config.qemu_config)
-        yield target
+        try:
+            yield target
+        finally:
+            target.close()
@@ -0,0 +1,264 @@
+# *******************************************************************************
+# Copyright (c) 2026 Contributors to the Eclipse Foundation
+#
+# See the NOTICE file(s) distributed with this work for additional
+# information regarding copyright ownership.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Apache License Version 2.0 which is available at
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# SPDX-License-Identifier: Apache-2.0
+# *******************************************************************************
+"""Client for the QEMU Machine Protocol (QMP), the JSON monitor of QEMU.
+
+QEMU has to be started with ``-qmp unix:<path>,server=on,wait=off``.
+"""
+
+import collections
+import itertools
+import json
+import logging
+import socket
+import threading
+import time
+
+from typing import Callable, Optional
+
+
+logger = logging.getLogger(__name__)
+
+# Number of received events kept for EventWaiter lookups.
+_EVENT_HISTORY = 256
+
+
+class QmpError(RuntimeError):
+    """Raised when QEMU answers a command with an error."""
+
+
+class EventWaiter:
+    """Waits for a QMP event emitted after the waiter was created, see :meth:`QmpClient.expect_event`."""
+
+    def __init__(self, client, name, start):
+        self._client = client
+        self._name = name
+        self._start = start
+
+    def wait(self, timeout: float) -> Optional[dict]:
+        """Return the event, or None if it was not received within *timeout* seconds."""
+        return self._client._wait_for_event(self._name, self._start, timeout)
+
+
+class QmpClient:
+    """Thread-safe QMP connection.
+
+    Commands may be issued from several threads; responses are matched by id.
+    Events are received asynchronously by a reader thread and can be awaited
+    with :meth:`expect_event` or handled by listeners.
+    """
+
+    def __init__(self, socket_path: str, connect_timeout: float = 10, is_alive: Optional[Callable[[], bool]] = None):
+        """
+        :param str socket_path: Path of the QMP UNIX socket.
+        :param float connect_timeout: How long to wait for QEMU to create the socket. Default is 10 seconds.
+        :param callable is_alive: Optional check whether QEMU still runs. :meth:`connect` gives up
+            as soon as it returns False instead of waiting for *connect_timeout*.
+        """
+        self._socket_path = socket_path
+        self._connect_timeout = connect_timeout
+        self._is_alive = is_alive
+        self._socket = None
+        self._reader = None
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._send_lock = threading.Lock()
+        self._pending = {}
+        self._events = collections.deque(maxlen=_EVENT_HISTORY)
+        self._event_count = 0
+        self._event_condition = threading.Condition(self._lock)
+        self._listeners = []
+        self._closed = False
+
+    def __enter__(self):
+        return self.connect()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def connect(self):
+        """Connect, wait for the greeting and enter command mode.
+
+        :raises ConnectionError: if QEMU exited before serving QMP.
+        """
+        deadline = time.monotonic() + self._connect_timeout
+        while True:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                sock.connect(self._socket_path)
+                break
+            except (FileNotFoundError, ConnectionRefusedError):
+                sock.close()
+                if self._is_alive is not None and not self._is_alive():
+                    raise ConnectionError("QEMU exited before serving QMP") from None
+                if time.monotonic() > deadline:
+                    raise
+                time.sleep(0.05)
+        self._socket = sock
+        stream = sock.makefile("rb")
+        greeting = json.loads(stream.readline() or b"{}")
+        if "QMP" not in greeting:
+            sock.close()
+            raise ConnectionError(f"Unexpected QMP greeting: {greeting}")
+        version = greeting["QMP"].get("version", {}).get("qemu", {})
+        logger.debug(f"Connected to QMP of QEMU {version.get('major')}.{version.get('minor')}.{version.get('micro')}")
+        self._reader = threading.Thread(target=self._read_messages, args=(stream,), name="qmp-reader", daemon=True)
+        self._reader.start()
+        self.execute("qmp_capabilities")
+        return self
+
+    def close(self):
+        with self._lock:
+            self._closed = True
+        if self._socket is not None:
+            try:
+                self._socket.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            self._socket.close()
+        if self._reader is not None:
+            self._reader.join(timeout=1)
+
+    def execute(self, command: str, arguments: Optional[dict] = None, timeout: float = 30):
+        """Execute a QMP command and return its result.
+
+        :param str command: Command name, e.g. ``query-status``.
+        :param Optional[dict] arguments: Command arguments.
+        :param float timeout: Maximum seconds to wait for the response. Default is 30.
+        :raises QmpError: if QEMU reports an error.
+        :raises ConnectionError: if the connection is closed before the response arrives.
+        """
+        message_id = next(self._ids)
+        response = {"event": threading.Event(), "message": None}
+        with self._lock:
+            if self._closed:
+                raise ConnectionError("QMP connection is closed")
+            self._pending[message_id] = response
+        message = {"execute": command, "id": message_id}
+        if arguments:
+            message["arguments"] = arguments
+        logger.debug(f"QMP: {command} {arguments or ''}")
+        try:
+            with self._send_lock:
+                self._socket.sendall(json.dumps(message).encode() + b"\n")
+            if not response["event"].wait(timeout):
+                raise TimeoutError(f"QMP command '{command}' did not complete within {timeout} seconds")
+        finally:
+            with self._lock:
+                self._pending.pop(message_id, None)
+
+        reply = response["message"]
+        if reply is None:
+            raise ConnectionError(f"QMP connection closed while executing '{command}'")
+        if "error" in reply:
+            raise QmpError(f"QMP command '{command}' failed: {reply['error'].get('desc', reply['error'])}")
+        return reply.get("return")
+
+    def human_monitor_command(self, command_line: str, timeout: float = 30) -> str:
+        """Run a human monitor (HMP) command through QMP, for commands without a QMP equivalent.
+
+        :raises QmpError: if the command prints an error.
+        """
+        output = self.execute("human-monitor-command", {"command-line": command_line}, timeout=timeout) or ""
+        output = output.replace("\r", "").strip()
+        if output.startswith("Error") or "\nError" in output:
+            raise QmpError(f"QEMU monitor command '{command_line}' failed: {output}")
+        return output
+
+    def add_event_listener(self, callback: Callable[[dict], None]) -> None:
+        """Call *callback(event)* from the reader thread for every received event."""
+        with self._lock:
+            self._listeners.append(callback)
+
+    def expect_event(self, name: str) -> EventWaiter:
+        """Return a waiter for the next event *name*; create it before triggering the event."""
+        with self._lock:
+            return EventWaiter(self, name, self._event_count)
+
+    def query_status(self) -> dict:
+        """Return the run state, e.g. ``{"running": True, "status": "running"}``."""
+        return self.execute("query-status")
+
+    def stop(self):
+        """Pause the VM."""
+        self.execute("stop")
+
+    def cont(self):
+        """Resume a paused VM."""
+        self.execute("cont")
+
+    def system_reset(self):
+        """Reset the VM, like pressing the reset button."""
+        self.execute("system_reset")
+
+    def system_powerdown(self):
+        """Request a graceful shutdown from the guest (ACPI power button)."""
+        self.execute("system_powerdown")
+
+    def quit(self):
+        """Terminate QEMU immediately."""
+        try:
+            self.execute("quit", timeout=5)
+        except ConnectionError:
+            # QEMU may close the socket before the response is delivered.
+            pass
+
+    def _wait_for_event(self, name, start, timeout):
+        deadline = time.monotonic() + timeout
+        with self._event_condition:
+            while True:
+                for index, event in self._events:
+                    if index >= start and event.get("event") == name:
+                        return event
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or self._closed:
+                    return None
+                self._event_condition.wait(remaining)
+
+    def _read_messages(self, stream):
+        try:
+            for line in stream:
+                try:
+                    message = json.loads(line)
+                except ValueError:
+                    logger.warning(f"Ignoring malformed QMP message: {line!r}")
+                    continue
+                if "event" in message:
+                    self._dispatch_event(message)
+                    continue
+                with self._lock:
+                    response = self._pending.get(message.get("id"))
+                if response is not None:
+                    response["message"] = message
+                    response["event"].set()
+        except OSError:
+            pass
+        finally:
+            with self._lock:
+                self._closed = True
+                pending = list(self._pending.values())
+                self._event_condition.notify_all()
+            for response in pending:
+                response["event"].set()
+
+    def _dispatch_event(self, event):
+        logger.debug(f"QMP event: {event['event']}")
+        with self._lock:
+            self._events.append((self._event_count, event))
+            self._event_count += 1
+            self._event_condition.notify_all()
+            listeners = list(self._listeners)
+        for listener in listeners:
+            try:
+                listener(event)
+            except Exception:
+                logger.warning(f"QMP event listener failed on {event['event']}", exc_info=True)
@@ -0,0 +1,144 @@
+# *******************************************************************************
+# Copyright (c) 2026 Contributors to the Eclipse Foundation
+#
+# See the NOTICE file(s) distributed with this work for additional
+# information regarding copyright ownership.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Apache License Version 2.0 which is available at
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# SPDX-License-Identifier: Apache-2.0
+# *******************************************************************************
+"""Detection of the moment a booting QEMU target becomes usable.
+
+The SSH port of the target is probed with non-blocking connects, starting a few
+milliseconds apart and backing off exponentially. A probe only succeeds once the
+SSH server sends its banner, since with user-mode networking QEMU accepts
+connections on forwarded ports long before the guest listens on them.
+
+In parallel, the serial console is watched for configurable boot markers such as
+a line printed when sshd has started. A marker triggers an immediate probe, so
+the target is detected as soon as it is up, without waiting for a backoff period.
+"""
+
+import errno
+import functools
+import logging
+import select
+import socket
+import threading
+import time
+
+from typing import Iterable, Optional
+
+from score.itf.core.utils.bunch import Bunch
+
+
+logger = logging.getLogger(__name__)
+
+_MIN_PROBE_INTERVAL = 0.005
+_MAX_PROBE_INTERVAL = 1.0
+
+
+def probe_ssh(host: str, port: int, timeout: float = 1.0) -> bool:
+    """Return True if an SSH server at *host*:*port* sends its banner within *timeout* seconds."""
+    deadline = time.monotonic() + timeout
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    with socket.socket(family, socket.SOCK_STREAM) as sock:
+        sock.setblocking(False)
+        result = sock.connect_ex((host, port))
+        if result not in (0, errno.EINPROGRESS, errno.EWOULDBLOCK):
+            return False
+        if not select.select([], [sock], [], max(deadline - time.monotonic(), 0))[1]:
+            return False
+        if sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR) != 0:
+            return False
+        banner = b""
+        while not banner.endswith(b"\n") and len(banner) < 255:
+            if not select.select([sock], [], [], max(deadline - time.monotonic(), 0))[0]:
+                return False
+            try:
+                data = sock.recv(255)
+            except OSError:
+                return False
+            if not data:
+                return False
+            banner += data
+        return banner.startswith(b"SSH-")
+
+
+def wait_until_ready(
+    host: str,
+    port: int,
+    console=None,
+    markers: Iterable[str] = (),
+    timeout: float = 180,
+    started_at: Optional[float] = None,
+) -> Bunch:
+    """Wait until the SSH server of a booting target answers.
+
+    :param str host: Address of the target.
+    :param int port: SSH port of the target.
+    :param console: Optional console of the target (see :class:`Console`) to watch for *markers*.
+    :param Iterable[str] markers: Console output substrings showing that the target is (almost) up.
+    :param float timeout: Maximum seconds to wait. Default is 180.
+    :param Optional[float] started_at: ``time.monotonic()`` value the boot started at, used for
+        the reported boot time. Default is the time of the call.
+    :return: Bunch with ``ready`` (bool), ``boot_time`` (seconds from *started_at* until the target
+        was ready or the wait gave up), ``marker`` (first marker seen, or None), ``marker_time``
+        (seconds from *started_at* until it was seen, or None) and ``probes`` (number of probes).
+    """
+    start = time.monotonic()
+    started_at = start if started_at is None else started_at
+    woken = threading.Event()
+    seen = []
+    callbacks = []
+
+    def on_marker(marker):
+        if not seen:
+            seen.append((marker, time.monotonic()))
+            logger.info(f"Boot marker '{marker}' seen after {seen[0][1] - started_at:.2f}s")
+        woken.set()
+
+    if console is not None:
+        for marker in markers:
+            callback = functools.partial(on_marker, marker)
+            console.add_expr_cbk(marker, callback)
+            callbacks.append((marker, callback))
+
+    deadline = start + timeout
+    interval = _MIN_PROBE_INTERVAL
+    probes = 0
+    ready = False
+    try:
+        while True:
+            probes += 1
+            remaining = deadline - time.monotonic()
+            if probe_ssh(host, port, timeout=min(_MAX_PROBE_INTERVAL, max(remaining, 0))):
+                ready = True
+                break
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            if woken.wait(min(interval, remaining)):
+                woken.clear()
+                interval = _MIN_PROBE_INTERVAL
+            else:
+                interval = min(interval * 2, _MAX_PROBE_INTERVAL)
+    finally:
+        for marker, callback in callbacks:
+            console.remove_expr_cbk(marker, callback)
+
+    result = Bunch(
+        ready=ready,
+        boot_time=time.monotonic() - started_at,
+        marker=seen[0][0] if seen else None,
+        marker_time=seen[0][1] - started_at if seen else None,
+        probes=probes,
+    )
+    if ready:
+        logger.info(f"Target {host}:{port} ready after {result.boot_time:.2f}s ({probes} probes)")
+    else:
+        logger.warning(f"Target {host}:{port} not ready after {result.boot_time:.2f}s ({probes} probes)")
+    return result
@@ -0,0 +1,146 @@
+# *******************************************************************************
+# Copyright (c) 2026 Contributors to the Eclipse Foundation
+#
+# See the NOTICE file(s) distributed with this work for additional
+# information regarding copyright ownership.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Apache License Version 2.0 which is available at
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# SPDX-License-Identifier: Apache-2.0
+# *******************************************************************************
+"""Cache of booted QEMU VM states, shared between test sessions.
+
+After the first boot of a configuration, the VM state (CPU, memory, devices and
+disk) is saved with ``savevm`` as an internal snapshot of the session's qcow2
+overlay, and the overlay is copied into the cache directory. Later sessions with
+the same kernel, rootfs, configuration and QEMU binary start from a copy of that
+overlay with ``-loadvm`` instead of booting.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import subprocess
+import tempfile
+import threading
+
+from typing import Optional
+
+
+logger = logging.getLogger(__name__)
+
+# Name of the internal snapshot holding the state of a booted and checked VM.
+READY_STATE = "itf_ready"
+
+_CHUNK_SIZE = 1024 * 1024
+_DIGESTS_FILE = "digests.json"
+
+
+class VmStateCache:
+    """Stores qcow2 overlays holding a saved VM state, keyed by the VM configuration."""
+
+    def __init__(self, cache_dir: str):
+        """
+        :param str cache_dir: Directory holding the cached overlays. Created if missing.
+        """
+        self._cache_dir = os.path.abspath(cache_dir)
+        self._lock = threading.Lock()
+        os.makedirs(self._cache_dir, exist_ok=True)
+
+    def key(self, kernel: Optional[str], rootfs: str, qemu_config, qemu_binary: Optional[str] = None) -> str:
+        """Return the cache key of a VM configuration.
+
+        :param Optional[str] kernel: Path of the kernel image, if any.
+        :param str rootfs: Path of the root file system image the overlays are backed by.
+        :param qemu_config: Validated QEMU configuration model.
+        :param Optional[str] qemu_binary: Path of the QEMU binary; its size and modification time
+            are part of the key, as saved states are not portable between QEMU versions.
+        """
+        fingerprint = {
+            "kernel": self._digest(kernel) if kernel else None,
+            # Cached overlays reference their backing file by path.
+            "rootfs": [os.path.abspath(rootfs), self._digest(rootfs)],
+            "config": qemu_config.model_dump(mode="json"),
+            "qemu": _stat_signature(qemu_binary) if qemu_binary and os.path.exists(qemu_binary) else None,
+        }
+        return hashlib.sha256(json.dumps(fingerprint, sort_keys=True).encode()).hexdigest()[:32]
+
+    def restore(self, key: str) -> Optional[str]:
+        """Copy the cached overlay for *key* to a new temporary file.
+
+        :return: path of the copy, to be removed by the caller, or None if nothing is cached.
+        """
+        cached = self._path(key)
+        if not os.path.exists(cached):
+            logger.info(f"No cached VM state for key {key}, booting")
+            return None
+        overlay_fd, overlay_path = tempfile.mkstemp(suffix=".qcow2", prefix="qemu_overlay_")
+        os.close(overlay_fd)
+        _copy(cached, overlay_path)
+        logger.info(f"Restored cached VM state {cached} to {overlay_path}")
+        return overlay_path
+
+    def store(self, key: str, overlay_path: str) -> None:
+        """Copy an overlay holding a :data:`READY_STATE` snapshot into the cache.
+
+        The VM using the overlay must be paused while it is copied.
+        """
+        cached = self._path(key)
+        partial = f"{cached}.{os.getpid()}.partial"
+        try:
+            _copy(overlay_path, partial)
+            os.replace(partial, cached)
+        finally:
+            if os.path.exists(partial):
+                os.unlink(partial)
+        logger.info(f"Stored VM state in {cached}")
+
+    def _path(self, key):
+        return os.path.join(self._cache_dir, f"{key}.qcow2")
+
+    def _digest(self, path):
+        """Return the SHA-256 of a file, memoized across sessions by path, size and modification time."""
+        path = os.path.abspath(path)
+        signature = _stat_signature(path)
+        digests_path = os.path.join(self._cache_dir, _DIGESTS_FILE)
+        with self._lock:
+            digests = _load_json(digests_path)
+            known = digests.get(path)
+            if known and known["signature"] == signature:
+                return known["sha256"]
+
+            sha = hashlib.sha256()
+            with open(path, "rb") as f:
+                for chunk in iter(lambda: f.read(_CHUNK_SIZE), b""):
+                    sha.update(chunk)
+            digests[path] = {"signature": signature, "sha256": sha.hexdigest()}
+            partial = f"{digests_path}.{os.getpid()}.partial"
+            with open(partial, "w") as f:
+                json.dump(digests, f)
+            os.replace(partial, digests_path)
+            return digests[path]["sha256"]
+
+
+def _stat_signature(path):
+    st = os.stat(path)
+    return [st.st_size, st.st_mtime_ns]
+
+
+def _load_json(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def _copy(source, destination):
+    # Copy-on-write clones make this nearly free on btrfs/xfs; sparse copies keep holes.
+    subprocess.run(
+        ["cp", "--reflink=auto", "--sparse=always", source, destination],
+        check=True,
+        capture_output=True,
+    )
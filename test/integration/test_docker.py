@@ -11,9 +11,11 @@
 # SPDX-License-Identifier: Apache-2.0
 # *******************************************************************************
 import os
+import docker
 import pytest
 
 import score.itf
+from score.itf.plugins.docker import _create_target, _remove_target
 
 
 def check_command_exec(target, message):
@@ -56,6 +58,33 @@ def test_target_file_transfer_and_restart(target, tmp_path):
     assert local_dst.read_text(encoding="utf-8") == content
 
 
+def test_directory_transfer(target, tmp_path):
+    local_src = tmp_path / "src"
+    (local_src / "nested").mkdir(parents=True)
+    (local_src / "nested" / "data.bin").write_bytes(os.urandom(3 * 1024 * 1024))
+    (local_src / "top.txt").write_text("top\n", encoding="utf-8")
+
+    target.upload(str(local_src), "/tmp/itf_dir_upload")
+    exit_code, output = target.execute("cat /tmp/itf_dir_upload/top.txt")
+    assert exit_code == 0
+    assert output.decode() == "top\n"
+
+    target.download("/tmp/itf_dir_upload", str(tmp_path / "dst"))
+    assert (tmp_path / "dst" / "nested" / "data.bin").read_bytes() == (local_src / "nested" / "data.bin").read_bytes()
+
+    target.upload_tree(str(local_src), "/tmp/itf_tree_upload/deeper")
+    target.download_tree("/tmp/itf_tree_upload/deeper", str(tmp_path / "tree"))
+    assert (tmp_path / "tree" / "top.txt").read_text(encoding="utf-8") == "top\n"
+
+
+def test_execute_many(target):
+    results = target.execute_many(["echo -n one", "echo -n two 1>&2; exit 3", "echo -n three"], concurrency=3)
+
+    assert [r.exit_code for r in results] == [0, 3, 0]
+    assert [r.stdout for r in results] == [b"one", b"", b"three"]
+    assert results[1].stderr == b"two"
+
+
 def test_restart(target, tmp_path):
     target.restart()
     exit_code, output = target.execute("echo -n restarted")
@@ -63,6 +92,23 @@ def test_restart(target, tmp_path):
     assert output == b"restarted"
 
 
+def test_snapshot_reset(request, _docker_configuration):
+    # Snapshot a container of its own; the snapshot of a pooled target must stay as it was after start.
+    client = docker.from_env()
+    target = _create_target(client, request.config.getoption("docker_image"), _docker_configuration)
+    try:
+        target.execute("touch /tmp/itf_before_snapshot")
+        target.snapshot()
+        target.execute("touch /tmp/itf_after_snapshot")
+
+        target.reset()
+
+        assert target.execute("test -e /tmp/itf_before_snapshot").exit_code == 0
+        assert target.execute("test -e /tmp/itf_after_snapshot").exit_code != 0
+    finally:
+        _remove_target(target)
+
+
 CONTAINER_EXTRA_MNT_PATH = "/extra/mount/directory"
 
 
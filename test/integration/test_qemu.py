@@ -47,6 +47,25 @@ def test_upload_download(target, tmp_path):
     target.execute(f"rm -f {remote_path}")
 
 
+@score.itf.plugins.core.requires_capabilities("file_transfer")
+def test_upload_download_tree(target, tmp_path):
+    local_src = tmp_path / "src"
+    (local_src / "nested").mkdir(parents=True)
+    (local_src / "a.txt").write_text("a\n", encoding="utf-8")
+    (local_src / "nested" / "b.bin").write_bytes(os.urandom(256 * 1024))
+    remote_dir = "/tmp/itf_tree_test"
+
+    target.upload_tree(str(local_src), remote_dir)
+    exit_code, output = target.execute(f"cat {remote_dir}/a.txt")
+    assert exit_code == 0
+    assert output.decode("utf-8") == "a\n"
+
+    target.download_tree(remote_dir, str(tmp_path / "dst"))
+    assert (tmp_path / "dst" / "nested" / "b.bin").read_bytes() == (local_src / "nested" / "b.bin").read_bytes()
+
+    target.execute(f"rm -rf {remote_dir}")
+
+
 def _wait_for_target_up(target, *, timeout_s: int = 120) -> None:
     assert target.ping(timeout=timeout_s), "Target did not become pingable in time"
     with target.ssh(timeout=10, n_retries=max(1, int(timeout_s / 2)), retry_interval=2) as ssh:
@@ -11,9 +11,16 @@
 # SPDX-License-Identifier: Apache-2.0
 # *******************************************************************************
 
+import logging
+import statistics
+import time
+
 import pytest
 
 
+logger = logging.getLogger(__name__)
+
+
 @pytest.fixture(scope="session")
 def docker_configuration():
     return {
@@ -123,3 +130,19 @@ def test_execute_command_output_captures_large_stdout(target):
     assert stderr_lines == []
     stdout = "".join(stdout_lines)
     assert len(stdout) > 200_000
+
+
+def test_echo_command_latency(target):
+    """Micro-benchmark: per-command latency of short commands over an established connection."""
+    latencies = []
+    with target.ssh() as ssh:
+        for _ in range(20):
+            start = time.monotonic()
+            exit_code, stdout_lines, _ = ssh.execute_command_output("echo latency", verbose=False)
+            latencies.append(time.monotonic() - start)
+            assert exit_code == 0
+            assert stdout_lines == ["latency\n"]
+
+    median = statistics.median(latencies)
+    logger.info(f"echo latency: median={median * 1000:.1f}ms min={min(latencies) * 1000:.1f}ms")
+    assert median < 0.5
@@ -0,0 +1,50 @@
+# *******************************************************************************
+# Copyright (c) 2026 Contributors to the Eclipse Foundation
+#
+# See the NOTICE file(s) distributed with this work for additional
+# information regarding copyright ownership.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Apache License Version 2.0 which is available at
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# SPDX-License-Identifier: Apache-2.0
+# *******************************************************************************
+"""DLT messages for the unit tests of the DLT plugin."""
+
+import struct
+
+from typing import Optional
+
+
+def dlt_message(
+    apid: str,
+    ctid: str,
+    text: str,
+    seconds: int = 1700000000,
+    microseconds: int = 0,
+    level: int = 4,
+    tmsp: Optional[int] = None,
+    counter: int = 0,
+    ecu: bytes = b"ECU1",
+    extended: bool = True,
+    storage: bool = True,
+) -> bytes:
+    """Return a verbose DLT log message with the string argument *text*.
+
+    :param int level: Log level in the extended header.
+    :param Optional[int] tmsp: Timestamp of the standard header in units of 0.1 ms, none if None.
+    :param bytes ecu: ECU id of the standard header, none if empty.
+    :param bool extended: Add the extended header with *apid*, *ctid* and *level*.
+    :param bool storage: Prefix a storage header with *seconds* and *microseconds*, as in DLT files.
+    """
+    argument = text.encode() + b"\0"
+    payload = struct.pack("<IH", 0x200, len(argument)) + argument
+    header = struct.pack(">BB4s4s", 0x01 | (level << 4), 1, apid.encode(), ctid.encode()) if extended else b""
+    optional = ecu + (b"" if tmsp is None else struct.pack(">I", tmsp))
+    htyp = 0x20 | (0x01 if extended else 0) | (0x04 if ecu else 0) | (0x10 if tmsp is not None else 0)
+    message = struct.pack(">BBH", htyp, counter, 4 + len(optional) + len(header) + len(payload))
+    message += optional + header + payload
+    if storage:
+        message = struct.pack("<4sII4s", b"DLT\x01", seconds, microseconds, b"ECU1") + message
+    return message
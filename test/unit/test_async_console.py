@@ -0,0 +1,134 @@
+# *******************************************************************************
+# Copyright (c) 2026 Contributors to the Eclipse Foundation
+#
+# See the NOTICE file(s) distributed with this work for additional
+# information regarding copyright ownership.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Apache License Version 2.0 which is available at
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# SPDX-License-Identifier: Apache-2.0
+# *******************************************************************************
+import asyncio
+import subprocess
+import threading
+
+import pytest
+
+from score.itf.core.process.console import PipeConsole
+from score.itf.core.process.event_loop import run_coroutine, shared_loop
+from score.itf.core.process.local_process import LocalAsyncProcess
+
+
+_ECHO_LOOP = 'while read line; do echo "got $line"; done'
+
+
+@pytest.fixture
+def shell():
+    process = subprocess.Popen(
+        ["sh", "-c", _ECHO_LOOP],
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+    )
+    yield process
+    process.kill()
+    process.wait()
+
+
+def test_pipe_console_reads_on_the_shared_loop(shell):
+    threads = threading.active_count()
+    console = PipeConsole("shell", shell, print_logger=False)
+
+    assert threading.active_count() <= threads + 1  # at most the event loop thread
+    assert console.expect_any("hello", "got hello", timeout=5)
+    console.write("again")
+    assert console.readline(block=True, timeout=5) == "got again"
+
+    shell.stdin.close()
+    console.line_reader.join(timeout=5)
+    assert not console.line_reader.is_alive()
+
+
+def test_pipe_console_coroutines_from_another_loop(shell):
+    console = PipeConsole("shell", shell, print_logger=False)
+
+    async def dialog():
+        await console.aio.write("one")
+        first = await console.aio.readline(timeout=5)
+        await console.aio.expect_all(["got two", "got three"], timeout=5, cmd="two\nthree")
+        with pytest.raises(TimeoutError):
+            await console.aio.readline(timeout=0.05)
+        return first
+
+    assert asyncio.run(dialog()) == "got one"
+
+
+def test_callbacks_run_off_the_shared_loop(shell):
+    console = PipeConsole("shell", shell, print_logger=False)
+    fired = threading.Event()
+    results = []
+
+    async def answer():
+        return 42
+
+    def callback():
+        # Synchronous facades of the framework may be used from callbacks.
+        results.append(run_coroutine(answer(), timeout=5))
+        fired.set()
+
+    console.add_expr_cbk("got ping", callback)
+    console.write("ping")
+    assert fired.wait(5)
+    assert results == [42]
+
+
+def test_slow_callback_does_not_stall_other_consoles(shell):
+    other = subprocess.Popen(
+        ["sh", "-c", _ECHO_LOOP], stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.STDOUT
+    )
+    release = threading.Event()
+    try:
+        slow = PipeConsole("slow", shell, print_logger=False)
+        fast = PipeConsole("fast", other, print_logger=False)
+        slow.add_expr_cbk("got ping", lambda: release.wait(10))
+        slow.write("ping")
+        slow.write("pong")
+        # The history of the blocked console is still updated.
+        assert slow.line_reader.read_until("got pong", timeout=5)
+        fast.write("ping")
+        assert fast.line_reader.read_until("got ping", timeout=5)
+    finally:
+        release.set()
+        other.kill()
+        other.wait()
+
+
+def test_local_process_output_and_exit_code():
+    process = LocalAsyncProcess.start(["sh", "-c", "echo first; echo second >&2; exit 3"], print_logger=False)
+
+    assert process.wait(timeout_s=5) == 3
+    assert not process.is_running()
+    assert process.get_exit_code() == 3
+    assert process.get_output() == "first\nsecond\n"
+    assert process.get_output(since=len("first\n")) == "second\n"
+    assert (process.output.bytes, process.output.lines) == (13, 2)
+
+
+def test_local_process_stop_and_wait_timeout():
+    process = LocalAsyncProcess.start(["sleep", "30"], print_logger=False)
+
+    assert process.is_running()
+    with pytest.raises(RuntimeError, match="did not finish"):
+        process.wait(timeout_s=0.1)
+    assert process.stop() == -15
+    assert not process.is_running()
+
+
+def test_run_coroutine_refuses_to_block_the_shared_loop():
+    async def nested():
+        run_coroutine(asyncio.sleep(0))
+
+    with pytest.raises(RuntimeError, match="must not be called"):
+        run_coroutine(nested(), timeout=5)
@@ -0,0 +1,135 @@
+# *******************************************************************************
+# Copyright (c) 2026 Contributors to the Eclipse Foundation
+#
+# See the NOTICE file(s) distributed with this work for additional
+# information regarding copyright ownership.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Apache License Version 2.0 which is available at
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# SPDX-License-Identifier: Apache-2.0
+# *******************************************************************************
+import os
+import re
+
+import pytest
+
+from dlt_messages import dlt_message
+
+from score.itf.plugins.dlt import dlt_index
+from score.itf.plugins.dlt.dlt_index import DltIndex, sidecar_path
+
+
+@pytest.fixture
+def trace(tmp_path):
+    path = tmp_path / "trace.dlt"
+    path.write_bytes(
+        dlt_message("APP1", "CTX1", "starting", seconds=100, level=4)
+        + dlt_message("APP2", "CTX1", "failed", seconds=101, level=2)
+        + dlt_message("APP1", "CTX2", "connected", seconds=102, level=5)
+        + dlt_message("", "", "plain", seconds=103, extended=False)
+        + dlt_message("APP2", "CTX2", "stopped", seconds=104, level=4)
+    )
+    return path
+
+
+def test_index_columns(trace):
+    with DltIndex(str(trace)) as index:
+        assert index.total_count() == len(index) == 5
+        assert [index.ids[code] for code in index.apids] == ["APP1", "APP2", "APP1", "", "APP2"]
+        assert list(index.seconds) == [100, 101, 102, 103, 104]
+        assert index.code("CTX2") is not None
+        assert index.code("NONE") is None
+
+
+def test_select_on_header_fields(trace):
+    with DltIndex(str(trace)) as index:
+        assert index.select(apid="APP1") == [0, 2]
+        assert index.select(apid=b"APP2", ctid="CTX2") == [4]
+        assert index.select(ctid=re.compile(r"2$")) == [2, 4]
+        assert index.select(apid="NONE") == []
+        assert index.select(log_level=2) == [1]
+        assert index.select(since=101, until=104) == [1, 2]
+        assert index.select(include_ext=False, include_non_ext=True) == [3]
+
+
+def test_find_matches_dlt_log_record_results(trace):
+    with DltIndex(str(trace)) as index:
+        results = index.find(dict(apid="APP1", payload=re.compile("conn")))
+        assert [(result.apid, result.ctid, result.payload) for result in results] == [("APP1", "CTX2", "connected")]
+        assert results[0].epoch_time == "102.000000"
+        assert index.queried_count() == 4
+
+        assert len(index.find(full_match=False)) == 1
+        assert [result.raw_msg.offset for result in index.find(include_non_ext=True, include_ext=False)] == [
+            index.offsets[3]
+        ]
+        assert index.find(include_ext=False) == []
+
+
+def test_filters_keep_non_extended_messages(trace):
+    with DltIndex(str(trace), filters=[("APP2", "")]) as index:
+        assert index.total_count() == 5
+        assert index.filtered_count() == 3
+        assert [result.apid for result in index.find(include_non_ext=True)] == ["APP2", "", "APP2"]
+
+
+def test_update_adds_appended_messages(trace):
+    with DltIndex(str(trace)) as index:
+        with open(trace, "ab") as file:
+            file.write(dlt_message("APP3", "CTX3", "late", seconds=105))
+        assert index.update() == 1
+        assert index.update() == 0
+        assert index.find(dict(apid="APP3"))[0].payload == "late"
+
+
+def test_sidecar_is_reused_while_file_is_unchanged(trace, monkeypatch):
+    with DltIndex(str(trace), sidecar=True) as index:
+        expected = [result.payload for result in index.find(dict(ctid="CTX2"))]
+    assert os.path.exists(sidecar_path(str(trace)))
+
+    def fail(*_):
+        raise AssertionError("headers parsed again")
+
+    monkeypatch.setattr(dlt_index, "parse_header", fail)
+    with DltIndex(str(trace), sidecar=True) as index:
+        assert len(index) == 5
+        assert [result.payload for result in index.find(dict(ctid="CTX2"))] == expected
+        assert index.select(apid="APP2", since=101, until=105) == [1, 4]
+    monkeypatch.undo()
+
+    with open(trace, "ab") as file:
+        file.write(dlt_message("APP3", "CTX3", "late", seconds=105))
+    with DltIndex(str(trace), sidecar=True) as index:
+        assert len(index) == 6
+    with DltIndex(str(trace), sidecar=True) as index:
+        assert index.find(dict(apid="APP3"))[0].payload == "late"
+
+
+def test_damaged_sidecar_is_ignored(trace):
+    with DltIndex(str(trace), sidecar=True):
+        pass
+    path = sidecar_path(str(trace))
+    with open(path, "rb") as file:
+        content = file.read()
+
+    # Truncated after the columns, at the boundary of an item of the postings.
+    for damaged in (content[:-4], content[:-4] + b"\0\0"):
+        with open(path, "wb") as file:
+            file.write(damaged)
+        with DltIndex(str(trace), sidecar=True) as index:
+            assert len(index) == 5
+            assert index.select(apid="APP2") == [1, 4]
+
+
+def test_time_buckets_answer_unsorted_ranges(tmp_path):
+    path = tmp_path / "trace.dlt"
+    path.write_bytes(
+        dlt_message("APP1", "CTX1", "b", seconds=1000)
+        + dlt_message("APP1", "CTX1", "a", seconds=10)
+        + dlt_message("APP1", "CTX1", "c", seconds=2000)
+    )
+    with DltIndex(str(path)) as index:
+        assert index.select(since=5, until=1500) == [0, 1]
+        assert index.select(since=1500) == [2]
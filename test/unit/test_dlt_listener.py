@@ -0,0 +1,81 @@
+# *******************************************************************************
+# Copyright (c) 2026 Contributors to the Eclipse Foundation
+#
+# See the NOTICE file(s) distributed with this work for additional
+# information regarding copyright ownership.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Apache License Version 2.0 which is available at
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# SPDX-License-Identifier: Apache-2.0
+# *******************************************************************************
+import socket
+import time
+
+from dlt_messages import dlt_message
+
+from score.itf.plugins.dlt.dlt_index import DltIndex
+from score.itf.plugins.dlt.dlt_listener import DltListener
+from score.itf.plugins.dlt.dlt_receive import Protocol
+
+
+def _wait_until(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "condition not met in time"
+        time.sleep(0.01)
+
+
+def test_udp_messages_are_queryable_and_stored(tmp_path):
+    path = tmp_path / "trace.dlt"
+    with DltListener(Protocol.UDP, file_name=str(path), port=0, flush_interval=60) as listener:
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sender:
+            sender.sendto(
+                dlt_message("APP1", "CTX1", "one", storage=False) + dlt_message("APP2", "CTX2", "two", storage=False),
+                ("127.0.0.1", listener.port),
+            )
+            sender.sendto(dlt_message("APP1", "CTX1", "three", ecu=b"", storage=False), ("127.0.0.1", listener.port))
+            _wait_until(lambda: listener.count() == 3)
+
+        assert [result.payload for result in listener.find(dict(apid="APP1"))] == ["one", "three"]
+        assert listener.message(listener.select(ctid="CTX2")[0]).ecu == "ECU1"
+        assert path.stat().st_size == 0
+
+        listener.flush()
+        with DltIndex(str(path)) as index:
+            assert [index.ids[code] for code in index.ecus] == ["ECU1", "ECU1", "RECV"]
+            assert index.find(dict(ctid="CTX2"))[0].payload == "two"
+
+
+def test_filters_drop_other_messages():
+    with DltListener(Protocol.UDP, port=0, filters=[("APP2", "")]) as listener:
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sender:
+            for apid in ("APP1", "APP2", "APP1", "APP2"):
+                sender.sendto(dlt_message(apid, "CTX1", apid, storage=False), ("127.0.0.1", listener.port))
+            _wait_until(lambda: listener.received == 4)
+
+        assert [result.payload for result in listener.find()] == ["APP2", "APP2"]
+
+
+def test_tcp_stream_is_split_into_messages(tmp_path):
+    path = tmp_path / "trace.dlt"
+    with socket.create_server(("127.0.0.1", 0)) as server:
+        listener = DltListener(Protocol.TCP, target_ip="127.0.0.1", port=server.getsockname()[1], file_name=str(path))
+        listener.start()
+        connection, _ = server.accept()
+        with connection:
+            stream = (
+                b"DLS\x01"
+                + dlt_message("APP1", "CTX1", "first", storage=False)
+                + dlt_message("APP1", "CTX1", "second", storage=False)
+            )
+            connection.sendall(stream[:7])
+            time.sleep(0.05)
+            connection.sendall(stream[7:])
+            _wait_until(lambda: listener.count() == 2)
+        listener.stop()
+
+    assert [result.payload for result in listener.find()] == ["first", "second"]
+    with DltIndex(str(path)) as index:
+        assert len(index) == 2
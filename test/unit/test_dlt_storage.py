@@ -0,0 +1,119 @@
+# *******************************************************************************
+# Copyright (c) 2026 Contributors to the Eclipse Foundation
+#
+# See the NOTICE file(s) distributed with this work for additional
+# information regarding copyright ownership.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Apache License Version 2.0 which is available at
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# SPDX-License-Identifier: Apache-2.0
+# *******************************************************************************
+import re
+import struct
+import threading
+
+from dlt_messages import dlt_message
+
+from score.itf.plugins.dlt.dlt_storage import DltStorageTail, decode_payload, parse_message, scan
+
+
+def test_parse_verbose_message():
+    data = dlt_message("APP1", "CTX1", "hello world", level=3, tmsp=12345)
+    found, end = scan(data, 0, len(data))
+    assert found == [(0, len(data))]
+    assert end == len(data)
+
+    message = parse_message(data, 0, len(data))
+    assert (message.ecu, message.apid, message.ctid) == ("ECU1", "APP1", "CTX1")
+    assert message.use_extended_header and message.verbose
+    assert message.log_level == 3
+    assert message.tmsp == 1.2345
+    assert message.payload == "hello world"
+    assert message.compare(dict(apid="APP1", ctid=b"CTX1", payload=re.compile(r"lo w")))
+    assert not message.compare(dict(apid=re.compile(r"^X")))
+
+
+def test_decode_numeric_arguments():
+    payload = struct.pack("<IiI?Id", 0x23, -7, 0x11, True, 0x84, 0.5)
+    assert decode_payload(payload, verbose=True, big_endian=False, noar=3) == "-7 True 0.5"
+    assert decode_payload(struct.pack(">IH", 0x42, 513), verbose=True, big_endian=True, noar=1) == "513"
+    assert decode_payload(struct.pack("<I", 42) + b"\x01\x02", verbose=False, big_endian=False, noar=0) == "[42] 01 02"
+
+
+def test_scan_skips_garbage_and_stops_at_incomplete_message():
+    first, second = dlt_message("APP1", "CTX1", "one"), dlt_message("APP2", "CTX2", "two")
+    data = first + b"garbage" + second[:-3]
+
+    found, end = scan(data, 0, len(data))
+    assert found == [(0, len(first))]
+    assert end == len(first) + len(b"garbage")
+
+
+def test_tail_parses_only_appended_messages(tmp_path):
+    path = tmp_path / "trace.dlt"
+    path.write_bytes(dlt_message("APP1", "CTX1", "one"))
+    tail = DltStorageTail(str(path))
+
+    assert [message.payload for message in tail.read_new()] == ["one"]
+    assert tail.read_new() == []
+
+    partial = dlt_message("APP1", "CTX1", "two")
+    with open(path, "ab") as file:
+        file.write(partial[:10])
+    assert tail.read_new() == []
+    with open(path, "ab") as file:
+        file.write(partial[10:] + dlt_message("APP2", "CTX2", "three"))
+
+    assert [message.payload for message in tail.read_new()] == ["two", "three"]
+    assert tail.count == 3
+    assert tail.position == path.stat().st_size
+
+
+def test_tail_restarts_after_truncation(tmp_path):
+    path = tmp_path / "trace.dlt"
+    path.write_bytes(dlt_message("APP1", "CTX1", "one") + dlt_message("APP1", "CTX1", "two"))
+    tail = DltStorageTail(str(path), from_end=True)
+
+    path.write_bytes(dlt_message("APP1", "CTX1", "new"))
+    assert [message.payload for message in tail.read_new()] == ["new"]
+
+
+def test_wait_for_blocks_until_matching_message_is_appended(tmp_path):
+    path = tmp_path / "trace.dlt"
+    tail = DltStorageTail(str(path), poll_interval=0.01)
+
+    def append():
+        with open(path, "ab") as file:
+            file.write(dlt_message("APP1", "CTX1", "noise"))
+            file.flush()
+            file.write(dlt_message("APP2", "CTX2", "ready", seconds=1700000001, microseconds=42))
+
+    writer = threading.Timer(0.05, append)
+    writer.start()
+    result = tail.wait_for(dict(apid="APP2", payload=re.compile("ready")), timeout=5)
+    writer.join()
+
+    assert (result.apid, result.ctid, result.payload) == ("APP2", "CTX2", "ready")
+    assert result.epoch_time == "1700000001.000042"
+    assert tail.wait_for(dict(apid="APP2"), timeout=0.05) is None
+
+
+def test_wait_for_keeps_the_messages_read_after_the_match(tmp_path):
+    path = tmp_path / "trace.dlt"
+    path.write_bytes(dlt_message("APP1", "CTX1", "one") + dlt_message("APP2", "CTX2", "two"))
+    tail = DltStorageTail(str(path))
+
+    assert tail.wait_for(dict(apid="APP1"), timeout=0).payload == "one"
+    assert tail.wait_for(dict(apid="APP2"), timeout=0).payload == "two"
+
+
+def test_wait_for_sleeps_while_the_file_ends_in_an_incomplete_message(tmp_path, mocker):
+    path = tmp_path / "trace.dlt"
+    path.write_bytes(dlt_message("APP1", "CTX1", "one")[:-3])
+    tail = DltStorageTail(str(path), poll_interval=0.05)
+    reads = mocker.spy(tail, "read_new")
+
+    assert tail.wait_for(dict(apid="APP1"), timeout=0.3) is None
+    assert reads.call_count <= 2
@@ -0,0 +1,115 @@
+# *******************************************************************************
+# Copyright (c) 2026 Contributors to the Eclipse Foundation
+#
+# See the NOTICE file(s) distributed with this work for additional
+# information regarding copyright ownership.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Apache License Version 2.0 which is available at
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# SPDX-License-Identifier: Apache-2.0
+# *******************************************************************************
+import re
+import socket
+
+import pytest
+
+from dlt_messages import dlt_message
+
+from score.itf.plugins.dlt import dlt_storage, dlt_subscription
+from score.itf.plugins.dlt.dlt_listener import DltListener
+from score.itf.plugins.dlt.dlt_receive import Protocol
+from score.itf.plugins.dlt.dlt_subscription import DltSubscriptions
+
+
+@pytest.fixture
+def decoded(monkeypatch):
+    """Payloads decoded during the test."""
+    payloads = []
+    decode_payload = dlt_storage.decode_payload
+
+    def counting(payload, *args):
+        payloads.append(payload)
+        return decode_payload(payload, *args)
+
+    monkeypatch.setattr(dlt_storage, "decode_payload", counting)
+    return payloads
+
+
+def test_only_messages_with_matching_headers_are_decoded(decoded):
+    subscriptions = DltSubscriptions()
+    received = []
+    subscriptions.subscribe(dict(apid="APP1", payload=re.compile("ready")), callback=received.append)
+    subscriptions.subscribe(dict(apid="APP1", ctid="CTX2"), callback=received.append)
+
+    subscriptions.dispatch_record(dlt_message("APP2", "CTX2", "ready"))
+    assert decoded == []
+    subscriptions.dispatch_record(dlt_message("APP1", "CTX3", "other"))
+    assert len(decoded) == 1
+    subscriptions.dispatch_record(dlt_message("APP1", "CTX2", "ready"))
+
+    # Decoded once for both subscriptions.
+    assert len(decoded) == 2
+    assert [(result.apid, result.ctid, result.payload) for result in received] == [("APP1", "CTX2", "ready")] * 2
+
+
+def test_header_predicates():
+    subscriptions = DltSubscriptions()
+    errors = subscriptions.subscribe(dict(log_level=2))
+    contexts = subscriptions.subscribe(dict(ecu=b"ECU1", ctid=re.compile(r"^NET")))
+
+    for record in (
+        dlt_message("APP1", "CTX1", "info", level=4),
+        dlt_message("APP2", "NETW", "error", level=2),
+        dlt_message("APP3", "NETX", "verbose", level=6),
+    ):
+        subscriptions.dispatch_record(record)
+
+    assert errors.get(timeout=0).payload == "error"
+    assert [contexts.get(timeout=0).apid for _ in range(2)] == ["APP2", "APP3"]
+    with pytest.raises(TimeoutError):
+        errors.get(timeout=0.01)
+
+
+def test_cancelled_subscription_receives_nothing():
+    subscriptions = DltSubscriptions()
+    with subscriptions.subscribe(dict(apid="APP1")) as subscription:
+        assert len(subscriptions) == 1
+    subscriptions.dispatch_record(dlt_message("APP1", "CTX1", "late"))
+
+    assert len(subscriptions) == 0
+    assert subscription.matched == 0
+
+
+def test_follow_file(tmp_path, monkeypatch):
+    parsed = []
+    parse_message = dlt_subscription.parse_message
+    monkeypatch.setattr(dlt_subscription, "parse_message", lambda *args: parsed.append(args) or parse_message(*args))
+    path = tmp_path / "trace.dlt"
+    old = dlt_message("APP1", "CTX1", "old")
+    path.write_bytes(old)
+    subscriptions = DltSubscriptions()
+    subscription = subscriptions.subscribe(dict(apid="APP1"))
+    subscriptions.follow(str(path), poll_interval=0.01)
+    try:
+        other = dlt_message("APP2", "CTX1", "other")
+        with open(path, "ab") as file:
+            file.write(other + dlt_message("APP1", "CTX1", "new"))
+        result = subscription.get(timeout=5)
+        assert result.payload == "new"
+        assert result.raw_msg.offset == len(old) + len(other)
+        # Messages of other applications are not parsed.
+        assert len(parsed) == 1
+    finally:
+        subscriptions.stop_following()
+
+
+def test_listener_dispatches_received_messages():
+    subscriptions = DltSubscriptions()
+    subscription = subscriptions.subscribe(dict(ctid="CTX2"))
+    with DltListener(Protocol.UDP, port=0, on_message=subscriptions.dispatch_record) as listener:
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sender:
+            for ctid in ("CTX1", "CTX2"):
+                sender.sendto(dlt_message("APP1", ctid, ctid, storage=False), ("127.0.0.1", listener.port))
+            assert subscription.get(timeout=5).payload == "CTX2"
@@ -0,0 +1,115 @@
+# *******************************************************************************
+# Copyright (c) 2026 Contributors to the Eclipse Foundation
+#
+# See the NOTICE file(s) distributed with this work for additional
+# information regarding copyright ownership.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Apache License Version 2.0 which is available at
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# SPDX-License-Identifier: Apache-2.0
+# *******************************************************************************
+import itertools
+import threading
+
+import pytest
+
+from score.itf.plugins.docker_pool import ContainerPool
+
+
+class _Factory:
+    def __init__(self):
+        self._ids = itertools.count()
+        self._lock = threading.Lock()
+        self.created = []
+        self.destroyed = []
+
+    def create(self):
+        with self._lock:
+            item = f"container-{next(self._ids)}"
+            self.created.append(item)
+        return item
+
+    def destroy(self, item):
+        with self._lock:
+            self.destroyed.append(item)
+
+
+def test_released_containers_are_replaced_not_reused():
+    factory = _Factory()
+    pool = ContainerPool(factory.create, factory.destroy, size=2)
+
+    first, wait = pool.acquire(timeout=5)
+    pool.release(first)
+    seen = {first}
+    for _ in range(3):
+        item, _ = pool.acquire(timeout=5)
+        assert item not in seen
+        seen.add(item)
+        pool.release(item)
+    pool.close()
+
+    assert wait >= 0
+    assert sorted(factory.destroyed) == sorted(factory.created)
+
+
+def test_creation_error_is_raised_and_replaced():
+    factory = _Factory()
+    calls = itertools.count()
+
+    def create():
+        if next(calls) == 0:
+            raise RuntimeError("image pull failed")
+        return factory.create()
+
+    pool = ContainerPool(create, factory.destroy, size=1)
+    with pytest.raises(RuntimeError, match="image pull failed"):
+        pool.acquire(timeout=5)
+    item, _ = pool.acquire(timeout=5)
+    pool.release(item)
+    pool.close()
+
+    assert item in factory.destroyed
+
+
+def test_acquire_times_out():
+    started = threading.Event()
+    release = threading.Event()
+
+    def create():
+        started.set()
+        release.wait(5)
+        return "late"
+
+    pool = ContainerPool(create, lambda item: None, size=1)
+    started.wait(5)
+    with pytest.raises(TimeoutError):
+        pool.acquire(timeout=0.05)
+    release.set()
+    pool.close()
+
+
+def test_released_containers_are_recycled_when_possible():
+    factory = _Factory()
+    recycled = []
+
+    def recycle(item):
+        if recycled:
+            raise RuntimeError("reset failed")
+        recycled.append(item)
+
+    pool = ContainerPool(factory.create, factory.destroy, size=1, recycle=recycle)
+    first, _ = pool.acquire(timeout=5)
+    pool.release(first)
+    second, _ = pool.acquire(timeout=5)
+    assert second == first
+
+    # A container that cannot be reset is replaced by a new one.
+    pool.release(second)
+    third, _ = pool.acquire(timeout=5)
+    pool.close()
+
+    assert recycled == [first]
+    assert first in factory.destroyed
+    assert third != first
@@ -0,0 +1,101 @@
+# *******************************************************************************
+# Copyright (c) 2026 Contributors to the Eclipse Foundation
+#
+# See the NOTICE file(s) distributed with this work for additional
+# information regarding copyright ownership.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Apache License Version 2.0 which is available at
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# SPDX-License-Identifier: Apache-2.0
+# *******************************************************************************
+import os
+import socket
+import struct
+import threading
+import time
+
+from score.itf.core.process.io_hub import IoHub
+from score.itf.plugins.docker import _ExecFrames
+
+
+def _pipe_stream(hub, name, **kwargs):
+    read_fd, write_fd = os.pipe()
+    lines = []
+    stream = hub.register(name, read_fd, lines.append, on_close=lambda: os.close(read_fd), **kwargs)
+    return stream, write_fd, lines
+
+
+def test_lines_are_split_across_chunks_and_flushed_at_the_end():
+    hub = IoHub()
+    stream, write_fd, lines = _pipe_stream(hub, "pipe", initial=b"first\nsec")
+
+    os.write(write_fd, b"ond\nthi")
+    os.write(write_fd, "rd ä".encode())
+    os.close(write_fd)
+
+    assert stream.join(timeout=5)
+    assert lines == ["first", "second", "third ä"]
+    assert (stream.bytes, stream.lines) == (21, 3)
+    assert stream.rate() > 0
+
+
+def test_many_streams_share_one_thread():
+    hub = IoHub()
+    threads = threading.active_count()
+    streams = [_pipe_stream(hub, f"pipe{index}") for index in range(50)]
+
+    for _, write_fd, _ in streams:
+        os.write(write_fd, b"hello\n")
+    assert threading.active_count() == threads
+    stats = hub.stats()
+    assert len(stats.streams) == 50
+    assert stats.threads == threads
+
+    for stream, write_fd, lines in streams:
+        os.close(write_fd)
+        assert stream.join(timeout=5)
+        assert lines == ["hello"]
+    assert hub.stats().streams == []
+
+
+def test_unregister_delivers_the_partial_line():
+    hub = IoHub()
+    stream, write_fd, lines = _pipe_stream(hub, "pipe")
+    os.write(write_fd, b"no line break")
+    # Unregistering stops reading, so the data has to be read first.
+    deadline = time.monotonic() + 5
+    while stream.bytes < len(b"no line break"):
+        assert time.monotonic() < deadline, "data not read in time"
+        time.sleep(0.01)
+
+    hub.unregister(stream)
+    assert stream.join(timeout=5)
+    assert lines == ["no line break"]
+    os.close(write_fd)
+
+
+def test_docker_exec_frames_are_demultiplexed():
+    hub = IoHub()
+    ours, theirs = socket.socketpair()
+
+    def frame(stream, payload):
+        return struct.pack(">BxxxL", stream, len(payload)) + payload
+
+    theirs.sendall(frame(2, b"early warning\n") + frame(1, b"42\nout"))
+    frames = _ExecFrames(ours)
+    stdout = frames.read_stdout_blocking()
+    assert (stdout, frames.pending) == (b"42\nout", b"early warning\n")
+
+    ours.setblocking(False)
+    lines = []
+    stream = hub.register("exec", ours, lines.append, read=frames.read, on_close=ours.close, initial=b"out")
+    # A frame split across reads is only handed out once it is complete.
+    data = frame(1, b"put\n") + frame(2, b"err\n")
+    theirs.sendall(data[:5])
+    theirs.sendall(data[5:])
+    theirs.close()
+
+    assert stream.join(timeout=5)
+    assert lines == ["output", "err"]
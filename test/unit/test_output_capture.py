@@ -0,0 +1,63 @@
+# *******************************************************************************
+# Copyright (c) 2026 Contributors to the Eclipse Foundation
+#
+# See the NOTICE file(s) distributed with this work for additional
+# information regarding copyright ownership.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Apache License Version 2.0 which is available at
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# SPDX-License-Identifier: Apache-2.0
+# *******************************************************************************
+from score.itf.core.process.output_capture import OutputCapture
+
+
+def _lines(count):
+    return [f"line {index:04d}" for index in range(count)]
+
+
+def test_small_output_stays_in_memory():
+    capture = OutputCapture("small", tail_bytes=100, spill_bytes=1000)
+    for line in ["one", "twö"]:
+        capture.append_line(line)
+
+    assert capture.get_output() == "one\ntwö\n"
+    assert capture.get_output(since=4) == "twö\n"
+    assert capture.get_output(since=capture.bytes) == ""
+    assert (capture.bytes, capture.lines) == (9, 2)
+    assert capture.spill_path is None
+
+
+def test_large_output_is_spilled_and_read_back(tmp_path):
+    capture = OutputCapture("daemon [1]", tail_bytes=100, spill_bytes=1000, spill_dir=str(tmp_path))
+    lines = _lines(500)
+    for line in lines:
+        capture.append_line(line)
+    expected = "".join(f"{line}\n" for line in lines)
+
+    assert capture.spill_path.startswith(str(tmp_path / "daemon__1_-"))
+    assert len(capture._buffer) <= 1000
+    assert capture.get_output() == expected
+    assert capture.get_output(since=4000) == expected[4000:]
+    assert capture.get_output(since=len(expected) - 20) == expected[-20:]
+
+    capture.close()
+    assert capture.get_output() == expected
+    with open(capture.spill_path, encoding="utf-8") as spilled:
+        assert spilled.read() == expected
+
+
+def test_only_the_tail_is_kept_without_an_output_directory(monkeypatch):
+    monkeypatch.delenv("TEST_UNDECLARED_OUTPUTS_DIR", raising=False)
+    monkeypatch.delenv("BUILD_WORKSPACE_DIRECTORY", raising=False)
+    capture = OutputCapture("tail", tail_bytes=100, spill_bytes=1000)
+    for line in _lines(500):
+        capture.append_line(line)
+
+    output = capture.get_output()
+    assert capture.spill_path is None
+    assert capture.lines == 500
+    assert output.endswith("line 0499\n")
+    assert output.startswith("line ")
+    assert len(output) <= 1000
@@ -0,0 +1,113 @@
+# *******************************************************************************
+# Copyright (c) 2026 Contributors to the Eclipse Foundation
+#
+# See the NOTICE file(s) distributed with this work for additional
+# information regarding copyright ownership.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Apache License Version 2.0 which is available at
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# SPDX-License-Identifier: Apache-2.0
+# *******************************************************************************
+import queue
+import re
+import timeit
+
+import pytest
+
+from score.itf.core.process.console import LineReader
+from score.itf.core.process.pattern_set import AUTOMATON_MIN_LITERALS, PatternSet
+
+
+# Console line that matches none of the benchmarked patterns.
+_BENCHMARK_LINE = "[   12.345678] systemd[1]: Started Journal Service, waiting for the network to come up on eth0."
+
+
+def _literals(count):
+    return [f"marker-{index:04d}-never-printed" for index in range(count)]
+
+
+@pytest.mark.parametrize("padding", [0, AUTOMATON_MIN_LITERALS], ids=["in", "automaton"])
+def test_literals_match_overlapping_and_nested_occurrences(padding):
+    exprs = ["he", "she", "hers", "his", ""] + _literals(padding)
+    patterns = PatternSet([(expr, False) for expr in exprs])
+
+    assert patterns.matches("ushers") == {0, 1, 2, 4}
+    assert patterns.matches("this") == {3, 4}
+    assert patterns.search("anything")
+    assert PatternSet([(expr, False) for expr in exprs[:4] + exprs[5:]]).search("nothing") is False
+
+
+def test_regexes_match_like_re_search():
+    exprs = [r"boot\s+done", r"(?P<code>\d+) errors", r"(a)\1", r"^login:", r"\d+ errors"]
+    patterns = PatternSet([(expr, True) for expr in exprs])
+
+    for line in ["boot  done with 3 errors", "aa login:", "login: 12 errors", "nothing"]:
+        expected = {pid for pid, expr in enumerate(exprs) if re.search(expr, line)}
+        assert patterns.matches(line) == expected
+        assert patterns.search(line) == bool(expected)
+
+
+def test_regexes_are_matched_independently():
+    patterns = PatternSet([(r"(?P<x>a)", True), (r"(?P<x>b)", True), ("c", False)])
+
+    assert patterns.matches("abc") == {0, 1, 2}
+    assert patterns.matches("b") == {1}
+
+
+def test_automaton_beats_substring_checks_on_large_literal_sets():
+    literals = _literals(5 * AUTOMATON_MIN_LITERALS)
+    patterns = PatternSet([(expr, False) for expr in literals])
+    assert patterns._automaton is not None
+
+    def best(func):
+        return min(timeit.repeat(func, number=200, repeat=5))
+
+    automaton = best(lambda: patterns.search(_BENCHMARK_LINE))
+    substrings = best(lambda: any(expr in _BENCHMARK_LINE for expr in literals))
+    assert automaton < substrings
+
+
+def test_small_sets_use_precompiled_checks_only():
+    patterns = PatternSet([(expr, False) for expr in _literals(AUTOMATON_MIN_LITERALS - 1)] + [(r"\d+ errors", True)])
+
+    assert patterns._automaton is None
+    assert patterns.matches("3 errors") == {AUTOMATON_MIN_LITERALS - 1}
+
+
+def test_invalid_regex_raises():
+    with pytest.raises(re.error):
+        PatternSet([("(", True)])
+
+
+def _line_reader(lines):
+    reader = LineReader(readline_func=iter(lines).__next__, name="pattern_test", print_logger=False)
+    return reader
+
+
+def test_read_cond_any_and_all():
+    reader = _line_reader([])
+    for line in ["eth0 up", "sshd started", "ready"]:
+        reader._add_log(line)
+    assert reader.read_until_all(["ready", "eth0"], timeout=1)
+
+    for line in ["eth0 up", "sshd started"]:
+        reader._add_log(line)
+    assert not reader.read_until_all(["ready", "eth0"], timeout=0.1)
+    reader._add_log("pid 42")
+    assert reader.read_until_one_of_expr([r"pid \d+", "never"], timeout=1)
+    with pytest.raises(queue.Empty):
+        reader.get_line()
+
+
+def test_callbacks_are_dispatched_in_registration_order():
+    calls = []
+    reader = _line_reader(["kernel panic", "login: root"])
+    reader.add_expr_cbk("login", lambda: calls.append("login"))
+    reader.add_expr_cbk(r"^kernel", lambda: calls.append("kernel"), regex=True)
+    reader.add_expr_cbk("panic", lambda: calls.append("panic"))
+    reader.start()
+    reader.join(timeout=5)
+
+    assert calls == ["kernel", "panic", "login"]
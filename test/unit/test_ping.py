@@ -11,24 +11,138 @@
 # SPDX-License-Identifier: Apache-2.0
 # *******************************************************************************
 
+import socket
+import struct
+import threading
+
 import pytest
 
-from score.itf.core.com.ping import ping
+from score.itf.core.com import ping as ping_module
+from score.itf.core.com.ping import Prober, ping, ping_lost
+
+
+@pytest.fixture
+def listening_port():
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as server:
+        server.bind(("127.0.0.1", 0))
+        server.listen(16)
+        yield server.getsockname()[1]
+
+
+@pytest.fixture
+def closed_port():
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def test_tcp_probe_counts_accepted_and_refused_connections_as_reachable(listening_port, closed_port):
+    assert Prober("tcp", port=listening_port).probe("127.0.0.1") is not None
+    assert Prober("tcp", port=closed_port).probe("127.0.0.1") is not None
+
+
+def test_tcp_probe_times_out_on_silent_host(mocker):
+    mocker.patch("score.itf.core.com.ping.socket.create_connection", side_effect=socket.timeout)
+    assert Prober("tcp").probe("192.0.2.1") is None
+
+
+def test_unknown_probe_method_is_rejected():
+    with pytest.raises(ValueError, match="Unknown probe method"):
+        Prober("udp")
+
+
+def test_method_falls_back_to_tcp_without_icmp_permission(mocker):
+    mocker.patch("score.itf.core.com.ping.icmp_available", return_value=False)
+    assert Prober().method == "tcp"
+    mocker.patch("score.itf.core.com.ping.icmp_available", return_value=True)
+    assert Prober().method == "icmp"
+
+
+class _FakeIcmpSocket:
+    """Answers every echo request with a matching echo reply."""
+
+    def __init__(self, *args):
+        self._reply = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+    def sendto(self, packet, destination):
+        kind, code, _, _, sequence = struct.unpack("!BBHHH", packet[:8])
+        assert kind == 8 and code == 0
+        assert ping_module._checksum(packet) == 0
+        self._reply = struct.pack("!BBHHH", 0, 0, 0, 1234, sequence) + packet[8:]
+
+    def recvfrom(self, size):
+        return self._reply, (None, 0)
 
 
-def test_ping_raises_when_ping_utility_is_missing(mocker):
-    mocker.patch("score.itf.core.com.ping.shutil.which", return_value=None)
-    with pytest.raises(RuntimeError, match="'ping' utility is not installed"):
-        ping("127.0.0.1")
+def test_icmp_probe_matches_echo_reply(mocker):
+    mocker.patch("score.itf.core.com.ping.socket.socket", _FakeIcmpSocket)
+    mocker.patch("score.itf.core.com.ping.select.select", side_effect=lambda r, w, x, t: (r, w, x))
+
+    assert Prober("icmp").probe("127.0.0.1") is not None
+
+
+def test_statistics_report_loss_and_rtt(mocker):
+    prober = Prober("tcp")
+    mocker.patch.object(prober, "probe", side_effect=[0.01, None, 0.03, None])
+
+    stats = prober.statistics("10.0.0.1", count=4, interval=0)
+
+    assert (stats.sent, stats.received, stats.loss) == (4, 2, 0.5)
+    assert stats.rtt_min == pytest.approx(0.01)
+    assert stats.rtt_avg == pytest.approx(0.02)
+    assert stats.rtt_max == pytest.approx(0.03)
+    assert stats.rtt_mdev == pytest.approx(0.01)
+
+
+def test_statistics_many_probes_addresses_concurrently(mocker):
+    barrier = threading.Barrier(3, timeout=5)
+    prober = Prober("tcp")
+
+    def probe(address, timeout=None):
+        barrier.wait()
+        return None if address == "10.0.0.3" else 0.001
+
+    mocker.patch.object(prober, "probe", side_effect=probe)
+
+    results = prober.statistics_many(["10.0.0.1", "10.0.0.2", "10.0.0.3"], count=1)
+
+    assert [results[address].received for address in ("10.0.0.1", "10.0.0.2", "10.0.0.3")] == [1, 1, 0]
+    assert results["10.0.0.3"].rtt_avg is None
 
 
 def test_ping_returns_true_when_host_is_reachable(mocker):
-    mocker.patch("score.itf.core.com.ping.shutil.which", return_value="/usr/bin/ping")
-    mocker.patch("score.itf.core.com.ping.os.system", return_value=0)
+    mocker.patch("score.itf.core.com.ping.Prober.probe", return_value=0.001)
     assert ping("127.0.0.1") is True
 
 
 def test_ping_returns_false_when_host_is_unreachable(mocker):
-    mocker.patch("score.itf.core.com.ping.shutil.which", return_value="/usr/bin/ping")
-    mocker.patch("score.itf.core.com.ping.os.system", return_value=1)
+    mocker.patch("score.itf.core.com.ping.Prober.probe", return_value=None)
     assert ping("192.0.2.1") is False
+
+
+def test_ping_probes_immediately_and_retries_until_timeout(mocker):
+    probe = mocker.patch("score.itf.core.com.ping.Prober.probe", side_effect=[None, None, 0.001])
+    sleep = mocker.patch("score.itf.core.com.ping.time.sleep")
+
+    assert ping("10.0.0.1", timeout=10, interval=0.05) is True
+    assert probe.call_count == 3
+    assert sleep.call_count == 2
+
+
+def test_ping_lost_returns_when_host_stops_answering(mocker):
+    mocker.patch("score.itf.core.com.ping.Prober.probe", side_effect=[0.001, None])
+    mocker.patch("score.itf.core.com.ping.time.sleep")
+
+    assert ping_lost("10.0.0.1", timeout=10, interval=0.05) is True
+
+
+def test_ping_lost_gives_up_after_timeout(mocker):
+    mocker.patch("score.itf.core.com.ping.Prober.probe", return_value=0.001)
+
+    assert ping_lost("10.0.0.1", timeout=0.2, interval=0.05) is False
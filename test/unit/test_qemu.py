@@ -11,11 +11,16 @@
 # SPDX-License-Identifier: Apache-2.0
 # *******************************************************************************
 
+import io
+import os
+
 from types import SimpleNamespace
 
 import pytest
 
 from score.itf.plugins.qemu.qemu import Qemu
+from score.itf.plugins.qemu.qemu_process import QemuProcess
+from score.itf.plugins.qemu.qemu_target import QemuTarget
 
 
 def _build_qemu(
@@ -27,6 +32,8 @@ def _build_qemu(
     rootfs=None,
     network_adapters=None,
     port_forwarding=None,
+    qmp_socket=None,
+    loadvm=None,
 ):
     if network_adapters is None:
         network_adapters = []
@@ -44,6 +51,8 @@ def _build_qemu(
         port_forwarding=port_forwarding,
         rootfs=rootfs,
         kernel_cmdline=kernel_cmdline,
+        qmp_socket=qmp_socket,
+        loadvm=loadvm,
     )
 
 
@@ -136,3 +145,54 @@ def test_port_forwarding_args_are_built_from_forwarding_entries(mocker):
         "-device",
         "virtio-net-pci,netdev=net1",
     ]
+
+
+def test_state_args_serve_qmp_and_load_saved_state(mocker):
+    qemu = _build_qemu(mocker, qmp_socket="/tmp/qemu/qmp.sock", loadvm="itf_ready")
+
+    assert qemu._Qemu__state_args() == [
+        "-qmp",
+        "unix:/tmp/qemu/qmp.sock,server=on,wait=off",
+        "-loadvm",
+        "itf_ready",
+    ]
+
+
+def test_state_args_are_empty_by_default(mocker):
+    qemu = _build_qemu(mocker)
+
+    assert qemu._Qemu__state_args() == []
+
+
+def test_exec_channel_reports_stderr_of_a_failed_transfer(mocker):
+    channel = mocker.MagicMock()
+    channel.makefile.return_value = io.BytesIO()
+    channel.makefile_stderr.return_value = io.BytesIO(b"mkdir: cannot create directory '/x': Permission denied\n")
+    channel.recv_exit_status.return_value = 1
+    pool = mocker.MagicMock()
+    ssh = pool.connection.return_value.__enter__.return_value
+    ssh.get_paramiko_client.return_value.get_transport.return_value.open_session.return_value = channel
+
+    with pytest.raises(RuntimeError, match="exit code 1: mkdir: .* Permission denied") as error:
+        with QemuTarget._exec_channel(SimpleNamespace(_ssh_pool=pool), "mkdir -p /x && tar -x -C /x -f -"):
+            # The command exited before reading the stream.
+            raise BrokenPipeError("Socket is closed")
+
+    assert isinstance(error.value.__cause__, BrokenPipeError)
+    channel.close.assert_called_once()
+
+
+def test_failed_start_reports_qemu_output_and_cleans_up(mocker):
+    mocker.patch("score.itf.plugins.qemu.qemu.os.path.isfile", return_value=True)
+    mocker.patch.object(
+        Qemu, "_Qemu__build_qemu_command", return_value=["sh", "-c", "echo 'qemu: invalid option'; exit 1"]
+    )
+    process = QemuProcess(None, "1G", 2, [], [], "pc-x86_64", None, None)
+    assert not os.path.exists(process._qmp_dir)
+
+    with pytest.raises(RuntimeError, match="invalid option"):
+        with process:
+            pass
+
+    assert not process.is_running()
+    assert not os.path.exists(process._qmp_dir)
@@ -103,3 +103,17 @@ def test_unknown_keys_are_rejected():
     config = {**_VALID_BRIDGE_CONFIG, "unknown_key": "value"}
     with pytest.raises(Exception):
         QemuConfigModel.model_validate(config)
+
+
+def test_boot_readiness_defaults_and_values():
+    model = QemuConfigModel.model_validate(_VALID_BRIDGE_CONFIG)
+    assert model.boot_markers == []
+    assert model.boot_timeout == 180
+
+    config = {**_VALID_BRIDGE_CONFIG, "boot_markers": ["Started OpenSSH"], "boot_timeout": 60}
+    model = QemuConfigModel.model_validate(config)
+    assert model.boot_markers == ["Started OpenSSH"]
+    assert model.boot_timeout == 60
+
+    with pytest.raises(Exception):
+        QemuConfigModel.model_validate({**_VALID_BRIDGE_CONFIG, "boot_timeout": 0})
@@ -0,0 +1,184 @@
+# *******************************************************************************
+# Copyright (c) 2026 Contributors to the Eclipse Foundation
+#
+# See the NOTICE file(s) distributed with this work for additional
+# information regarding copyright ownership.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Apache License Version 2.0 which is available at
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# SPDX-License-Identifier: Apache-2.0
+# *******************************************************************************
+import threading
+
+from contextlib import contextmanager
+
+import pytest
+
+from score.itf.core.utils.bunch import Bunch
+from score.itf.plugins import qemu as qemu_plugin
+from score.itf.plugins.qemu.config import QemuConfigModel
+from score.itf.plugins.qemu.fleet import QemuFleet, instance_config, worker_share
+
+
+_PORT_FORWARDING_CONFIG = {
+    "networks": [{"name": "lo", "ip_address": "127.0.0.1", "gateway": "127.0.0.1"}],
+    "ssh_port": 2222,
+    "qemu_num_cores": 2,
+    "qemu_ram_size": "1G",
+    "port_forwarding": [{"host_port": 2222, "guest_port": 22}, {"host_port": 3490, "guest_port": 3490}],
+}
+
+
+class _FakeTarget:
+    def __init__(self, name):
+        self.name = name
+        self.healthy = True
+        self.stopped = False
+
+
+class _Launcher:
+    """Launches fake instances; boots listed in *failing* raise."""
+
+    def __init__(self, failing=()):
+        self.failing = set(failing)
+        self.boots = 0
+        self.lock = threading.Lock()
+        self.targets = []
+
+    @contextmanager
+    def __call__(self, index):
+        with self.lock:
+            self.boots += 1
+            boot = self.boots
+        if boot in self.failing:
+            raise RuntimeError(f"boot {boot} failed")
+        target = _FakeTarget(f"vm{index}-boot{boot}")
+        self.targets.append(target)
+        try:
+            yield target
+        finally:
+            target.stopped = True
+
+
+def test_instance_config_allocates_distinct_host_ports():
+    config = QemuConfigModel.model_validate(_PORT_FORWARDING_CONFIG)
+
+    first = instance_config(config)
+    second = instance_config(config)
+
+    first_ports = [forward.host_port for forward in first.port_forwarding]
+    assert first.ssh_port == first_ports[0]
+    assert [forward.guest_port for forward in first.port_forwarding] == [22, 3490]
+    assert first_ports != [2222, 3490]
+    assert first_ports != [forward.host_port for forward in second.port_forwarding]
+    # The session configuration is left untouched.
+    assert config.ssh_port == 2222
+
+
+def test_instance_config_requires_port_forwarding():
+    config = QemuConfigModel.model_validate({**_PORT_FORWARDING_CONFIG, "port_forwarding": []})
+    with pytest.raises(ValueError, match="port_forwarding"):
+        instance_config(config)
+
+
+@pytest.mark.parametrize(
+    "worker, worker_count, expected",
+    [
+        (None, None, [0, 1, 2, 3, 4]),
+        ("gw0", 2, [0, 2, 4]),
+        ("gw1", 2, [1, 3]),
+        ("gw6", 8, [6]),
+    ],
+)
+def test_worker_share_splits_instances_across_xdist_workers(monkeypatch, worker, worker_count, expected):
+    monkeypatch.delenv("PYTEST_XDIST_WORKER", raising=False)
+    monkeypatch.delenv("PYTEST_XDIST_WORKER_COUNT", raising=False)
+    assert worker_share(5, worker, worker_count) == expected
+
+
+def test_fleet_hands_out_idle_instances():
+    launcher = _Launcher()
+    fleet = QemuFleet(launcher, [0, 1], health_check=lambda target: target.healthy)
+
+    first, _ = fleet.acquire(timeout=5)
+    second, _ = fleet.acquire(timeout=5)
+    assert first is not second
+    with pytest.raises(TimeoutError):
+        fleet.acquire(timeout=0.2)
+
+    fleet.release(first)
+    again, _ = fleet.acquire(timeout=5)
+    assert again is first
+
+    fleet.close()
+    assert all(target.stopped for target in launcher.targets)
+    assert fleet.stats().replacements == 0
+
+
+def test_fleet_replaces_unhealthy_instances():
+    launcher = _Launcher()
+    fleet = QemuFleet(launcher, [0], health_check=lambda target: target.healthy)
+
+    broken, _ = fleet.acquire(timeout=5)
+    broken.healthy = False
+    fleet.release(broken)
+    replacement, _ = fleet.acquire(timeout=5)
+
+    assert replacement is not broken
+    assert broken.stopped
+    stats = fleet.stats()
+    assert (stats.tests, stats.replacements) == (2, 1)
+    fleet.close()
+
+
+def test_fleet_retries_failed_boots_and_gives_up_eventually():
+    launcher = _Launcher(failing={1})
+    fleet = QemuFleet(launcher, [0], health_check=lambda target: True)
+    fleet.acquire(timeout=5)
+    assert launcher.boots == 2
+    fleet.close()
+
+    fleet = QemuFleet(_Launcher(failing={1, 2, 3}), [0], health_check=lambda target: True)
+    with pytest.raises(RuntimeError, match="could be booted"):
+        fleet.acquire(timeout=10)
+    fleet.close()
+
+
+def test_fleet_instance_releases_the_locks_of_a_failed_boot(monkeypatch):
+    ports, saving = threading.Lock(), threading.Lock()
+    boots = []
+
+    @contextmanager
+    def rootfs_overlay(config, state_cache, state_key):
+        # Preparing the overlay copies images and must not hold up other instances.
+        assert not ports.locked()
+        yield "overlay.qcow2", None
+
+    @contextmanager
+    def started_target(config, qemu_config, overlay_path, loadvm, state_cache, state_key, save_state, on_started):
+        assert overlay_path == "overlay.qcow2"
+        boots.append(save_state)
+        if len(boots) == 1:
+            raise RuntimeError("Could not set up host forwarding rule")
+        assert ports.locked()
+        on_started()
+        yield _FakeTarget("vm")
+
+    monkeypatch.setattr(qemu_plugin, "_rootfs_overlay", rootfs_overlay)
+    monkeypatch.setattr(qemu_plugin, "_started_target", started_target)
+    monkeypatch.setattr(qemu_plugin, "instance_config", lambda qemu_config: qemu_config)
+    config = Bunch(qemu_config=None)
+
+    with pytest.raises(RuntimeError, match="host forwarding"):
+        with qemu_plugin._fleet_instance(config, None, None, ports, saving):
+            pass
+    assert not ports.locked() and not saving.locked()
+
+    with qemu_plugin._fleet_instance(config, None, None, ports, saving):
+        # The ports are bound once QEMU runs, other instances may allocate theirs.
+        assert not ports.locked()
+    # The second boot saved the VM state and keeps the right to do so.
+    assert boots == [True, True]
+    assert saving.locked()
@@ -66,3 +66,29 @@ def test_raises_on_unexpected_output(mocker):
     )
     with pytest.raises(KeyError):
         get_image_format("/some/image.img")
+
+
+def test_qcow2_is_detected_from_header_without_qemu_img(tmp_path, mocker):
+    run = mocker.patch("score.itf.plugins.qemu.image_format.subprocess.run")
+    image = tmp_path / "disk.img"
+    image.write_bytes(b"QFI\xfb" + b"\0" * 508)
+
+    assert get_image_format(str(image)) == "qcow2"
+    run.assert_not_called()
+
+
+def test_probe_results_are_cached_until_the_image_changes(tmp_path, mocker):
+    run = mocker.patch(
+        "score.itf.plugins.qemu.image_format.subprocess.run",
+        return_value=subprocess.CompletedProcess(args=[], returncode=0, stdout=json.dumps({"format": "raw"})),
+    )
+    image = tmp_path / "disk.wic"
+    image.write_bytes(b"\0" * 512)
+
+    assert get_image_format(str(image)) == "raw"
+    assert get_image_format(str(image)) == "raw"
+    assert run.call_count == 1
+
+    image.write_bytes(b"\0" * 1024)
+    assert get_image_format(str(image)) == "raw"
+    assert run.call_count == 2
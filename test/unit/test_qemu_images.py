@@ -0,0 +1,145 @@
+# *******************************************************************************
+# Copyright (c) 2026 Contributors to the Eclipse Foundation
+#
+# See the NOTICE file(s) distributed with this work for additional
+# information regarding copyright ownership.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Apache License Version 2.0 which is available at
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# SPDX-License-Identifier: Apache-2.0
+# *******************************************************************************
+import json
+import os
+import shutil
+import struct
+import subprocess
+
+import pytest
+
+from score.itf.plugins.qemu.images import create_overlay, virtual_size, write_qcow2_overlay
+
+
+_HAS_QEMU_IMG = shutil.which("qemu-img") is not None
+requires_qemu_img = pytest.mark.skipif(not _HAS_QEMU_IMG, reason="qemu-img is not installed")
+
+_CLUSTER_SIZE = 65536
+
+
+def _read_header(path):
+    with open(path, "rb") as f:
+        data = f.read()
+    fields = struct.unpack(">4sIQIIQIIQQIIQQQQII", data[:104])
+    names = [
+        "magic",
+        "version",
+        "backing_file_offset",
+        "backing_file_size",
+        "cluster_bits",
+        "size",
+        "crypt_method",
+        "l1_size",
+        "l1_table_offset",
+        "refcount_table_offset",
+        "refcount_table_clusters",
+        "nb_snapshots",
+        "snapshots_offset",
+        "incompatible_features",
+        "compatible_features",
+        "autoclear_features",
+        "refcount_order",
+        "header_length",
+    ]
+    return dict(zip(names, fields)), data
+
+
+def _read_extensions(data, offset):
+    extensions = {}
+    while True:
+        kind, length = struct.unpack(">II", data[offset : offset + 8])
+        if kind == 0:
+            return extensions
+        extensions[kind] = data[offset + 8 : offset + 8 + length]
+        offset += 8 + length + (-length % 8)
+
+
+def test_overlay_header_references_backing_file(tmp_path):
+    overlay = tmp_path / "overlay.qcow2"
+    size = 10 * 1024**3
+
+    write_qcow2_overlay(str(overlay), "/images/rootfs.wic", "raw", size)
+
+    header, data = _read_header(overlay)
+    assert header["magic"] == b"QFI\xfb"
+    assert header["version"] == 3
+    assert header["cluster_bits"] == 16
+    assert header["size"] == size
+    assert header["header_length"] == 104
+    assert header["refcount_order"] == 4
+    assert header["l1_size"] == 20  # one L2 table covers 512 MiB
+    backing = data[header["backing_file_offset"] : header["backing_file_offset"] + header["backing_file_size"]]
+    assert backing == b"/images/rootfs.wic"
+    assert _read_extensions(data, header["header_length"]) == {0xE2792ACA: b"raw"}
+
+
+def test_overlay_clusters_are_refcounted_and_unallocated(tmp_path):
+    overlay = tmp_path / "overlay.qcow2"
+
+    write_qcow2_overlay(str(overlay), "/images/base.qcow2", "qcow2", 1024**2)
+
+    header, data = _read_header(overlay)
+    clusters = len(data) // _CLUSTER_SIZE
+    assert len(data) % _CLUSTER_SIZE == 0
+    refcount_block = struct.unpack(">Q", data[header["refcount_table_offset"] :][:8])[0]
+    refcounts = struct.unpack(f">{clusters + 1}H", data[refcount_block : refcount_block + 2 * (clusters + 1)])
+    assert refcounts == (1,) * clusters + (0,)
+    l1_table = data[header["l1_table_offset"] : header["l1_table_offset"] + 8 * header["l1_size"]]
+    assert l1_table == b"\0" * 8 * header["l1_size"]
+
+
+def test_virtual_size_of_raw_and_qcow2_images(tmp_path):
+    raw = tmp_path / "disk.img"
+    raw.write_bytes(b"\0" * 4096)
+    qcow2 = tmp_path / "disk.qcow2"
+    write_qcow2_overlay(str(qcow2), str(raw), "raw", 3 * 1024**3)
+
+    assert virtual_size(str(raw), "raw") == 4096
+    assert virtual_size(str(qcow2), "qcow2") == 3 * 1024**3
+
+
+def test_create_overlay_writes_raw_backed_overlay_without_qemu_img(tmp_path, mocker):
+    base = tmp_path / "rootfs.img"
+    base.write_bytes(b"\0" * 8192)
+    mocker.patch("score.itf.plugins.qemu.images.get_image_format", return_value="raw")
+    run = mocker.patch("score.itf.plugins.qemu.images.subprocess.run")
+
+    overlay = create_overlay(str(base))
+    try:
+        header, data = _read_header(overlay)
+        assert header["size"] == 8192
+        assert _read_extensions(data, header["header_length"]) == {0xE2792ACA: b"raw"}
+        run.assert_not_called()
+    finally:
+        os.unlink(overlay)
+
+
+@requires_qemu_img
+@pytest.mark.parametrize("base_format", ["raw", "qcow2"])
+def test_qemu_img_accepts_overlay(tmp_path, base_format):
+    base = tmp_path / f"base.{base_format}"
+    subprocess.run(["qemu-img", "create", "-f", base_format, str(base), "64M"], check=True, capture_output=True)
+
+    overlay = create_overlay(str(base))
+    try:
+        subprocess.run(["qemu-img", "check", overlay], check=True, capture_output=True)
+        info = json.loads(
+            subprocess.run(
+                ["qemu-img", "info", "--output=json", overlay], check=True, capture_output=True, text=True
+            ).stdout
+        )
+        assert info["virtual-size"] == 64 * 1024**2
+        assert info["backing-filename"] == str(base)
+        assert info["backing-filename-format"] == base_format
+    finally:
+        os.unlink(overlay)
@@ -0,0 +1,138 @@
+# *******************************************************************************
+# Copyright (c) 2026 Contributors to the Eclipse Foundation
+#
+# See the NOTICE file(s) distributed with this work for additional
+# information regarding copyright ownership.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Apache License Version 2.0 which is available at
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# SPDX-License-Identifier: Apache-2.0
+# *******************************************************************************
+import json
+import os
+import socket
+import threading
+import time
+
+import pytest
+
+from score.itf.plugins.qemu.qmp import QmpClient, QmpError
+
+
+def _serve_qmp(socket_path, handlers):
+    """Minimal QMP server: sends the greeting, then answers each command with *handlers[command](arguments)*.
+
+    A handler returns a ``(reply, events)`` tuple; events are sent before the reply.
+    """
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(socket_path)
+    server.listen(1)
+    received = []
+
+    def send(conn, message):
+        conn.sendall(json.dumps(message).encode() + b"\r\n")
+
+    def serve():
+        conn, _ = server.accept()
+        with conn, conn.makefile("rb") as stream:
+            send(conn, {"QMP": {"version": {"qemu": {"major": 8, "minor": 2, "micro": 2}}, "capabilities": []}})
+            for line in stream:
+                message = json.loads(line)
+                received.append(message)
+                command = message["execute"]
+                if command == "qmp_capabilities":
+                    reply, events = {"return": {}}, []
+                else:
+                    reply, events = handlers[command](message.get("arguments"))
+                for event in events:
+                    send(conn, {"event": event, "timestamp": {"seconds": 0, "microseconds": 0}})
+                if reply is None:
+                    break
+                send(conn, dict(reply, id=message["id"]))
+        server.close()
+
+    thread = threading.Thread(target=serve, daemon=True)
+    thread.start()
+    return received
+
+
+@pytest.fixture
+def socket_path():
+    # UNIX socket paths are limited to about 100 characters.
+    path = f"/tmp/itf_qmp_{os.getpid()}_{threading.get_ident()}.sock"
+    yield path
+    if os.path.exists(path):
+        os.unlink(path)
+
+
+def test_execute_negotiates_capabilities_and_returns_result(socket_path):
+    received = _serve_qmp(socket_path, {"query-status": lambda _: ({"return": {"running": True}}, [])})
+
+    with QmpClient(socket_path) as qmp:
+        assert qmp.query_status() == {"running": True}
+
+    assert [message["execute"] for message in received] == ["qmp_capabilities", "query-status"]
+
+
+def test_execute_raises_on_error_reply(socket_path):
+    _serve_qmp(socket_path, {"cont": lambda _: ({"error": {"class": "GenericError", "desc": "VM is broken"}}, [])})
+
+    with QmpClient(socket_path) as qmp:
+        with pytest.raises(QmpError, match="VM is broken"):
+            qmp.cont()
+
+
+def test_human_monitor_command_raises_on_error_output(socket_path):
+    received = _serve_qmp(
+        socket_path,
+        {"human-monitor-command": lambda _: ({"return": "Error: Snapshot 'missing' does not exist\r\n"}, [])},
+    )
+
+    with QmpClient(socket_path) as qmp:
+        with pytest.raises(QmpError, match="does not exist"):
+            qmp.human_monitor_command("loadvm missing")
+
+    assert received[-1]["arguments"] == {"command-line": "loadvm missing"}
+
+
+def test_events_are_delivered_to_waiters_and_listeners(socket_path):
+    _serve_qmp(
+        socket_path,
+        {
+            "system_reset": lambda _: ({"return": {}}, ["RESET"]),
+            "stop": lambda _: ({"return": {}}, ["STOP"]),
+        },
+    )
+    seen = []
+
+    with QmpClient(socket_path) as qmp:
+        qmp.add_event_listener(lambda event: seen.append(event["event"]))
+        qmp.stop()
+        reset = qmp.expect_event("RESET")
+        assert reset.wait(0.1) is None
+        qmp.system_reset()
+        assert reset.wait(5)["event"] == "RESET"
+        # Events received before the waiter was created are not reported.
+        assert qmp.expect_event("STOP").wait(0.1) is None
+
+    assert seen == ["STOP", "RESET"]
+
+
+def test_quit_tolerates_closed_connection(socket_path):
+    _serve_qmp(socket_path, {"quit": lambda _: (None, ["SHUTDOWN"])})
+
+    with QmpClient(socket_path) as qmp:
+        qmp.quit()
+        with pytest.raises(ConnectionError):
+            qmp.query_status()
+
+
+def test_connect_gives_up_once_qemu_exited(socket_path):
+    qmp = QmpClient(socket_path, connect_timeout=30, is_alive=lambda: False)
+
+    start = time.monotonic()
+    with pytest.raises(ConnectionError, match="exited"):
+        qmp.connect()
+    assert time.monotonic() - start < 5
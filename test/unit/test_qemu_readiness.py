@@ -0,0 +1,134 @@
+# *******************************************************************************
+# Copyright (c) 2026 Contributors to the Eclipse Foundation
+#
+# See the NOTICE file(s) distributed with this work for additional
+# information regarding copyright ownership.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Apache License Version 2.0 which is available at
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# SPDX-License-Identifier: Apache-2.0
+# *******************************************************************************
+import socket
+import threading
+import time
+
+from score.itf.core.process.console import Console
+from score.itf.plugins.qemu.readiness import probe_ssh, wait_until_ready
+
+
+def _listen(banner=None, accept_after=0.0):
+    """Listen on a free local port; accepted connections get *banner* (or are closed) after *accept_after* seconds."""
+    server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    server.bind(("127.0.0.1", 0))
+    server.listen(8)
+
+    def serve():
+        time.sleep(accept_after)
+        while True:
+            try:
+                conn, _ = server.accept()
+            except OSError:
+                return
+            with conn:
+                if banner is not None:
+                    conn.sendall(banner)
+                    time.sleep(0.1)
+
+    threading.Thread(target=serve, daemon=True).start()
+    return server, server.getsockname()[1]
+
+
+def _free_port():
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class _LineFeed:
+    """Console reader fed from a list, one line at a time."""
+
+    def __init__(self):
+        self._lines = []
+        self._cond = threading.Condition()
+        self._closed = False
+
+    def push(self, line):
+        with self._cond:
+            self._lines.append(line)
+            self._cond.notify()
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+
+    def readline(self):
+        with self._cond:
+            while not self._lines and not self._closed:
+                self._cond.wait()
+            return self._lines.pop(0) if self._lines else None
+
+
+def test_probe_requires_ssh_banner():
+    server, port = _listen(banner=b"SSH-2.0-OpenSSH_9.6\r\n")
+    with server:
+        assert probe_ssh("127.0.0.1", port, timeout=2)
+
+    # QEMU user-mode networking accepts and closes connections while the guest is not listening.
+    server, port = _listen(banner=None)
+    with server:
+        assert not probe_ssh("127.0.0.1", port, timeout=2)
+
+    assert not probe_ssh("127.0.0.1", _free_port(), timeout=2)
+
+
+def test_wait_until_ready_returns_when_server_answers():
+    server, port = _listen(banner=b"SSH-2.0-dropbear\r\n", accept_after=0.3)
+    with server:
+        result = wait_until_ready("127.0.0.1", port, timeout=10, started_at=time.monotonic() - 1)
+
+    assert result.ready
+    assert 1.3 <= result.boot_time < 5
+    assert result.marker is None
+    assert result.probes >= 1
+
+
+def test_wait_until_ready_gives_up_after_timeout():
+    result = wait_until_ready("127.0.0.1", _free_port(), timeout=0.3)
+
+    assert not result.ready
+    assert 0.3 <= result.boot_time < 2
+    assert result.probes > 3
+
+
+def test_boot_marker_triggers_probe_and_is_reported():
+    port = _free_port()
+    feed = _LineFeed()
+    console = Console("test", feed.readline, lambda _: None, print_logger=False)
+    results = []
+    waiter = threading.Thread(
+        target=lambda: results.append(
+            wait_until_ready("127.0.0.1", port, console=console, markers=["sshd started"], timeout=10)
+        )
+    )
+    waiter.start()
+    # Let the backoff grow, then bring the server up and announce it on the console.
+    time.sleep(2.5)
+    server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    server.bind(("127.0.0.1", port))
+    server.listen(8)
+    threading.Thread(target=lambda: server.accept()[0].sendall(b"SSH-2.0-OpenSSH\r\n"), daemon=True).start()
+    marked = time.monotonic()
+    feed.push("[   2.5] sshd started on port 22")
+    waiter.join(10)
+    ready = time.monotonic()
+    server.close()
+    feed.close()
+
+    assert results[0].ready
+    assert results[0].marker == "sshd started"
+    assert ready - marked < 0.5
+    # The marker callback is removed once the wait is over.
+    assert not console.line_reader._expr_cbks
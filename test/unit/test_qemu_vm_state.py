@@ -0,0 +1,57 @@
+# *******************************************************************************
+# Copyright (c) 2026 Contributors to the Eclipse Foundation
+#
+# See the NOTICE file(s) distributed with this work for additional
+# information regarding copyright ownership.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Apache License Version 2.0 which is available at
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# SPDX-License-Identifier: Apache-2.0
+# *******************************************************************************
+import os
+
+from score.itf.plugins.qemu.config import QemuConfigModel
+from score.itf.plugins.qemu.vm_state_cache import VmStateCache
+
+
+def _config(**overrides):
+    values = {
+        "networks": [{"name": "lo", "ip_address": "127.0.0.1", "gateway": "127.0.0.1"}],
+        "ssh_port": 2222,
+        "qemu_num_cores": 2,
+        "qemu_ram_size": "1G",
+    }
+    values.update(overrides)
+    return QemuConfigModel.model_validate(values)
+
+
+def test_cache_key_depends_on_images_and_configuration(tmp_path):
+    cache = VmStateCache(str(tmp_path / "cache"))
+    kernel = tmp_path / "kernel"
+    rootfs = tmp_path / "rootfs.qcow2"
+    kernel.write_bytes(b"kernel v1")
+    rootfs.write_bytes(b"rootfs")
+
+    key = cache.key(str(kernel), str(rootfs), _config())
+    assert cache.key(str(kernel), str(rootfs), _config()) == key
+    assert cache.key(str(kernel), str(rootfs), _config(qemu_ram_size="2G")) != key
+
+    kernel.write_bytes(b"kernel v2")
+    assert cache.key(str(kernel), str(rootfs), _config()) != key
+
+
+def test_cache_stores_and_restores_overlays(tmp_path):
+    cache = VmStateCache(str(tmp_path / "cache"))
+    overlay = tmp_path / "overlay.qcow2"
+    overlay.write_bytes(b"overlay with saved state")
+
+    assert cache.restore("key") is None
+    cache.store("key", str(overlay))
+    restored = cache.restore("key")
+    try:
+        with open(restored, "rb") as f:
+            assert f.read() == b"overlay with saved state"
+    finally:
+        os.unlink(restored)
@@ -0,0 +1,97 @@
+# *******************************************************************************
+# Copyright (c) 2026 Contributors to the Eclipse Foundation
+#
+# See the NOTICE file(s) distributed with this work for additional
+# information regarding copyright ownership.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Apache License Version 2.0 which is available at
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# SPDX-License-Identifier: Apache-2.0
+# *******************************************************************************
+import queue
+import threading
+import time
+
+import pytest
+
+from score.itf.core.process.console import LineReader
+from score.itf.core.process.ring_buffer import LineRingBuffer
+
+
+def test_lines_wrap_around_the_end_of_the_ring():
+    ring = LineRingBuffer(capacity=20)
+    cursor = ring.cursor()
+
+    for line in ["abcde", "fghij", "klmno", "pqrst"]:
+        ring.append(line)
+
+    assert ring.lines() == ["fghij", "klmno", "pqrst"]
+    assert ring.first == 1
+    assert ring.evicted == 1
+    assert [cursor.get(block=False) for _ in range(3)] == ["fghij", "klmno", "pqrst"]
+    assert cursor.dropped == 1
+
+
+def test_multibyte_and_empty_lines_are_bounded():
+    ring = LineRingBuffer(capacity=8)
+    for _ in range(100):
+        ring.append("")
+    ring.append("äöü")
+
+    # Every line is charged one byte on top of its UTF-8 encoding.
+    assert ring.lines() == ["", "äöü"]
+    assert ring.evicted == 99
+
+
+def test_cursors_read_independently():
+    ring = LineRingBuffer()
+    first = ring.cursor()
+    ring.append("one")
+    second = ring.cursor()
+    ring.append("two")
+
+    assert first.get(block=False) == "one"
+    assert second.get(block=False) == "two"
+    assert first.pending() == 1
+    assert ring.cursor(from_start=True).get(block=False) == "one"
+
+    first.seek_end()
+    with pytest.raises(queue.Empty):
+        first.get(block=False)
+    # Skipping ahead does not take lines away from other cursors.
+    assert ring.cursor(from_start=True).pending() == 2
+
+
+def test_blocking_get_waits_for_lines_and_times_out():
+    ring = LineRingBuffer()
+    cursor = ring.cursor()
+
+    timer = threading.Timer(0.05, ring.append, args=("late",))
+    timer.start()
+    assert cursor.get(timeout=5) == "late"
+    timer.join()
+
+    start = time.monotonic()
+    with pytest.raises(queue.Empty):
+        cursor.get(timeout=0.05)
+    assert time.monotonic() - start >= 0.05
+
+
+def test_line_reader_history():
+    lines = iter(["a", "b", "c"])
+    reader = LineReader(readline_func=lambda: next(lines), name="ring_test", print_logger=False, history_bytes=4)
+    observer = reader.reader()
+
+    for line in ["a", "b", "c"]:
+        reader._add_log(line)
+
+    # Two bytes per line fit twice into the history; "a" was overwritten before it was read.
+    assert reader.get_line() == "b"
+    assert reader.dropped_lines == 1
+    reader.clear_history()
+    with pytest.raises(queue.Empty):
+        reader.get_line()
+    assert observer.get(block=False) == "b"
+    assert observer.get(block=False) == "c"
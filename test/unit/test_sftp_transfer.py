@@ -0,0 +1,117 @@
+# *******************************************************************************
+# Copyright (c) 2026 Contributors to the Eclipse Foundation
+#
+# See the NOTICE file(s) distributed with this work for additional
+# information regarding copyright ownership.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Apache License Version 2.0 which is available at
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# SPDX-License-Identifier: Apache-2.0
+# *******************************************************************************
+import os
+import shutil
+import subprocess
+
+import paramiko
+import pytest
+
+from score.itf.core.com.sftp_transfer import SftpTransfer
+
+
+class _LocalSftp:
+    """SFTP client stand-in working on the local file system."""
+
+    def __init__(self, opened):
+        opened.append(self)
+        self.transferred = []
+
+    def put(self, local_path, remote_path):
+        shutil.copyfile(local_path, remote_path)
+        self.transferred.append(remote_path)
+
+    def get(self, remote_path, local_path):
+        shutil.copyfile(remote_path, local_path)
+        self.transferred.append(local_path)
+
+    def listdir_attr(self, path):
+        return [paramiko.SFTPAttributes.from_stat(os.stat(os.path.join(path, n)), n) for n in os.listdir(path)]
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def ssh(mocker):
+    ssh = mocker.MagicMock()
+    ssh.opened = []
+    ssh.get_paramiko_client.return_value.open_sftp.side_effect = lambda: _LocalSftp(ssh.opened)
+    ssh.execute_command.side_effect = lambda cmd, **kwargs: subprocess.run(cmd, shell=True, check=False).returncode
+    return ssh
+
+
+def _make_tree(root):
+    files = {"a.bin": 3000, "sub/b.txt": 10, "sub/deeper/c.txt": 200, "other dir/d.txt": 0, "e.txt": 50}
+    for name, size in files.items():
+        path = os.path.join(root, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(os.urandom(size))
+    return files
+
+
+def _read_tree(root):
+    content = {}
+    for dirpath, _, filenames in os.walk(root):
+        for filename in filenames:
+            path = os.path.join(dirpath, filename)
+            with open(path, "rb") as f:
+                content[os.path.relpath(path, root)] = f.read()
+    return content
+
+
+def test_upload_dir_copies_tree_over_several_channels(ssh, tmp_path):
+    files = _make_tree(tmp_path / "local")
+
+    stats = SftpTransfer(ssh, workers=3).upload_dir(str(tmp_path / "local"), str(tmp_path / "remote"))
+
+    assert _read_tree(tmp_path / "remote") == _read_tree(tmp_path / "local")
+    assert stats.files == len(files)
+    assert stats.bytes == sum(files.values())
+    assert len(ssh.opened) == 3
+    # Directories are created with a single command, listing only the leaves of the tree.
+    ssh.execute_command.assert_called_once()
+    assert "sub/deeper" in ssh.execute_command.call_args.args[0]
+    assert "'sub'" not in ssh.execute_command.call_args.args[0]
+
+
+def test_download_dir_copies_tree_and_preserves_mtime(ssh, tmp_path):
+    files = _make_tree(tmp_path / "remote")
+    os.utime(tmp_path / "remote" / "e.txt", (1000000000, 1000000000))
+
+    stats = SftpTransfer(ssh, workers=2).download_dir(str(tmp_path / "remote"), str(tmp_path / "local"))
+
+    assert _read_tree(tmp_path / "local") == _read_tree(tmp_path / "remote")
+    assert stats.files == len(files)
+    assert os.stat(tmp_path / "local" / "e.txt").st_mtime == 1000000000
+
+
+def test_transfer_error_is_raised(ssh, tmp_path, mocker):
+    _make_tree(tmp_path / "local")
+    mocker.patch.object(_LocalSftp, "put", side_effect=OSError("link down"))
+
+    with pytest.raises(OSError, match="link down"):
+        SftpTransfer(ssh, workers=2).upload_dir(str(tmp_path / "local"), str(tmp_path / "remote"))
+
+
+def test_mkdir_commands_stay_below_the_length_limit(ssh, mocker):
+    mocker.patch("score.itf.core.com.sftp_transfer._MAX_COMMAND_LENGTH", 40)
+    ssh.execute_command.side_effect = None
+    ssh.execute_command.return_value = 0
+
+    SftpTransfer(ssh)._make_remote_dirs([f"/tmp/remote/dir{i}" for i in range(5)])
+
+    commands = [call.args[0] for call in ssh.execute_command.call_args_list]
+    assert all(len(command) <= 40 for command in commands)
+    assert " ".join(commands).count("/tmp/remote/dir") == 5
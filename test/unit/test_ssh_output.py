@@ -0,0 +1,160 @@
+# *******************************************************************************
+# Copyright (c) 2026 Contributors to the Eclipse Foundation
+#
+# See the NOTICE file(s) distributed with this work for additional
+# information regarding copyright ownership.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Apache License Version 2.0 which is available at
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# SPDX-License-Identifier: Apache-2.0
+# *******************************************************************************
+
+import logging
+import statistics
+import threading
+import time
+
+from types import SimpleNamespace
+
+import paramiko
+
+from score.itf.core.com.ssh import _read_output_with_timeout
+
+
+logger = logging.getLogger(__name__)
+
+
+def _channel():
+    return paramiko.Channel(0)
+
+
+def _send_stdout(channel, data):
+    channel.in_buffer.feed(data)
+
+
+def _send_stderr(channel, data):
+    if channel.combine_stderr:
+        channel.in_buffer.feed(data)
+    else:
+        channel.in_stderr_buffer.feed(data)
+
+
+def _send_exit(channel, exit_code, eof=True):
+    channel.exit_status = exit_code
+    channel.status_event.set()
+    if eof:
+        channel.eof_received = True
+        channel.in_buffer.close()
+        channel.in_stderr_buffer.close()
+
+
+def _read(channel, max_exec_time=5, separate_stderr=True):
+    return _read_output_with_timeout(SimpleNamespace(channel=channel), None, False, max_exec_time, separate_stderr)
+
+
+def _later(delay, func, *args):
+    thread = threading.Timer(delay, func, args=args)
+    thread.start()
+    return thread
+
+
+def test_lines_split_across_chunks_are_joined():
+    channel = _channel()
+    _send_stdout(channel, b"a\nb")
+    _send_stdout(channel, b"c\n\xc3")
+    _send_stdout(channel, b"\xa4\n")
+    _send_exit(channel, 0)
+
+    stdout_lines, stderr_lines, exception = _read(channel)
+
+    assert stdout_lines == ["a\n", "bc\n", "ä\n"]
+    assert stderr_lines == []
+    assert exception == ""
+
+
+def test_trailing_partial_line_is_returned():
+    channel = _channel()
+    _send_stdout(channel, b"done")
+    _send_exit(channel, 0)
+
+    stdout_lines, _, _ = _read(channel)
+
+    assert stdout_lines == ["done"]
+
+
+def test_stderr_is_captured_separately():
+    channel = _channel()
+    channel.set_combine_stderr(False)
+    _send_stdout(channel, b"out\n")
+    _send_stderr(channel, b"err\n")
+    _send_exit(channel, 7)
+
+    stdout_lines, stderr_lines, _ = _read(channel, separate_stderr=True)
+
+    assert stdout_lines == ["out\n"]
+    assert stderr_lines == ["err\n"]
+
+
+def test_timeout_returns_collected_output_and_exception():
+    channel = _channel()
+    _send_stdout(channel, b"partial")
+
+    stdout_lines, _, exception = _read(channel, max_exec_time=0.2)
+
+    assert stdout_lines == ["partial"]
+    assert isinstance(exception, TimeoutError)
+
+
+def test_exit_without_eof_does_not_wait_for_stream_close():
+    channel = _channel()
+    _send_stdout(channel, b"started\n")
+    _send_exit(channel, 0, eof=False)
+
+    start = time.monotonic()
+    stdout_lines, _, exception = _read(channel)
+
+    assert time.monotonic() - start < 1
+    assert stdout_lines == ["started\n"]
+    assert exception == ""
+
+
+def test_reader_wakes_up_on_late_output_and_eof():
+    channel = _channel()
+    timers = [
+        _later(0.05, _send_stdout, channel, b"late\n"),
+        _later(0.1, _send_exit, channel, 0),
+    ]
+
+    stdout_lines, _, _ = _read(channel)
+
+    for timer in timers:
+        timer.join()
+    assert stdout_lines == ["late\n"]
+
+
+def test_echo_command_latency_benchmark():
+    """Per-command latency of an ``echo``-style command whose output and EOF arrive after 10 ms.
+
+    The reader must return right after EOF; a polling reader would add up to a full poll slice.
+    """
+    response_delay = 0.01
+    latencies = []
+    for _ in range(20):
+        channel = _channel()
+
+        def respond(channel=channel):
+            _send_stdout(channel, b"hello\n")
+            _send_exit(channel, 0)
+
+        start = time.monotonic()
+        timer = _later(response_delay, respond)
+        stdout_lines, _, _ = _read(channel)
+        latencies.append(time.monotonic() - start - response_delay)
+        timer.join()
+        assert stdout_lines == ["hello\n"]
+
+    median = statistics.median(latencies)
+    logger.info(f"echo latency overhead: median={median * 1000:.2f}ms max={max(latencies) * 1000:.2f}ms")
+    assert median < 0.05
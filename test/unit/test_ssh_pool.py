@@ -0,0 +1,152 @@
+# *******************************************************************************
+# Copyright (c) 2026 Contributors to the Eclipse Foundation
+#
+# See the NOTICE file(s) distributed with this work for additional
+# information regarding copyright ownership.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Apache License Version 2.0 which is available at
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# SPDX-License-Identifier: Apache-2.0
+# *******************************************************************************
+
+import threading
+
+import pytest
+
+from score.itf.core.com.ssh_pool import SshPool
+
+
+def _fake_ssh(mocker):
+    ssh = mocker.MagicMock()
+    ssh.__enter__.return_value = ssh
+    ssh.get_paramiko_client.return_value.get_transport.return_value.is_active.return_value = True
+    return ssh
+
+
+@pytest.fixture
+def factory(mocker):
+    return mocker.Mock(side_effect=lambda: _fake_ssh(mocker))
+
+
+def test_connection_is_reused_between_requests(factory):
+    pool = SshPool(factory)
+
+    with pool.connection() as first:
+        pass
+    with pool.connection() as second:
+        pass
+
+    assert first is second
+    assert factory.call_count == 1
+    stats = pool.stats()
+    assert (stats.hits, stats.misses, stats.reconnects) == (1, 1, 0)
+
+
+def test_keep_alive_is_enabled_on_new_connections(factory):
+    pool = SshPool(factory, keep_alive_interval=7)
+
+    with pool.connection() as ssh:
+        pass
+
+    ssh.get_paramiko_client().get_transport().set_keepalive.assert_called_once_with(7)
+
+
+def test_dead_connection_is_replaced(factory):
+    pool = SshPool(factory)
+    with pool.connection() as first:
+        pass
+
+    first.get_paramiko_client().get_transport().is_active.return_value = False
+    with pool.connection() as second:
+        pass
+
+    assert second is not first
+    first.__exit__.assert_called_once()
+    stats = pool.stats()
+    assert (stats.hits, stats.misses, stats.reconnects) == (0, 2, 1)
+
+
+def test_invalidate_forces_reconnect(factory):
+    pool = SshPool(factory)
+    with pool.connection() as first:
+        pass
+
+    pool.invalidate()
+    with pool.connection() as second:
+        pass
+
+    assert second is not first
+    assert pool.stats().reconnects == 1
+
+
+def test_busy_connections_grow_pool_up_to_size(factory):
+    pool = SshPool(factory, size=2)
+
+    with pool.connection() as first, pool.connection() as second, pool.connection() as third:
+        pass
+
+    assert first is not second
+    assert third in (first, second)
+    assert factory.call_count == 2
+
+
+def test_connecting_does_not_block_the_pool(mocker):
+    connecting = threading.Event()
+    proceed = threading.Event()
+
+    def slow_factory():
+        connecting.set()
+        assert proceed.wait(5)
+        return _fake_ssh(mocker)
+
+    pool = SshPool(slow_factory, size=2)
+    results = []
+
+    def acquire():
+        with pool.connection() as ssh:
+            results.append(ssh)
+
+    threads = [threading.Thread(target=acquire) for _ in range(2)]
+    threads[0].start()
+    assert connecting.wait(5)
+    # The handshake of the first caller runs outside the lock.
+    assert pool.stats().connections == 0
+    threads[1].start()
+    proceed.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert len(results) == 2
+    assert pool.stats().misses == 2
+
+
+def test_failed_connect_releases_the_slot(mocker):
+    factory = mocker.Mock(side_effect=[ConnectionError("refused"), _fake_ssh(mocker)])
+    pool = SshPool(factory)
+
+    with pytest.raises(ConnectionError):
+        with pool.connection():
+            pass
+    with pool.connection():
+        pass
+
+    assert pool.stats().connections == 1
+
+
+def test_close_closes_all_connections(factory):
+    pool = SshPool(factory, size=2)
+    with pool.connection() as first, pool.connection() as second:
+        pass
+
+    pool.close()
+
+    first.__exit__.assert_called_once()
+    second.__exit__.assert_called_once()
+    assert pool.stats().connections == 0
+
+
+def test_invalid_size_is_rejected(factory):
+    with pytest.raises(ValueError):
+        SshPool(factory, size=0)
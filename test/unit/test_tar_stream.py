@@ -0,0 +1,123 @@
+# *******************************************************************************
+# Copyright (c) 2026 Contributors to the Eclipse Foundation
+#
+# See the NOTICE file(s) distributed with this work for additional
+# information regarding copyright ownership.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Apache License Version 2.0 which is available at
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# SPDX-License-Identifier: Apache-2.0
+# *******************************************************************************
+import io
+import os
+import tarfile
+
+import pytest
+
+from score.itf.core.utils.tar_stream import ChunkReader, extract_stream, iter_tar_chunks, write_tree
+
+
+class _WriteOnlyStream(io.RawIOBase):
+    """Non-seekable sink, like an SSH channel."""
+
+    def __init__(self):
+        self.data = bytearray()
+
+    def writable(self):
+        return True
+
+    def write(self, b):
+        self.data += b
+        return len(b)
+
+
+def test_tree_round_trip(tmp_path):
+    source = tmp_path / "source"
+    (source / "sub" / "empty").mkdir(parents=True)
+    (source / "a.bin").write_bytes(os.urandom(20000))
+    (source / "sub" / "b.txt").write_text("hello")
+    os.symlink("b.txt", source / "sub" / "link")
+    stream = _WriteOnlyStream()
+
+    assert write_tree(stream, str(source)) == 2
+    assert extract_stream(io.BytesIO(bytes(stream.data)), str(tmp_path / "dest")) == 2
+
+    assert (tmp_path / "dest" / "a.bin").read_bytes() == (source / "a.bin").read_bytes()
+    assert (tmp_path / "dest" / "sub" / "b.txt").read_text() == "hello"
+    assert os.readlink(tmp_path / "dest" / "sub" / "link") == "b.txt"
+    assert (tmp_path / "dest" / "sub" / "empty").is_dir()
+
+
+@pytest.mark.parametrize(
+    "member",
+    [
+        tarfile.TarInfo("../escape.txt"),
+        tarfile.TarInfo("/abs.txt"),
+    ],
+)
+def test_extract_rejects_members_outside_destination(tmp_path, member):
+    data = io.BytesIO()
+    with tarfile.open(fileobj=data, mode="w") as tar:
+        tar.addfile(member, io.BytesIO(b""))
+    data.seek(0)
+
+    with pytest.raises(tarfile.TarError):
+        extract_stream(data, str(tmp_path / "dest"))
+
+
+def test_extract_rejects_links_pointing_outside_destination(tmp_path):
+    link = tarfile.TarInfo("link")
+    link.type = tarfile.SYMTYPE
+    link.linkname = "../../etc/passwd"
+    data = io.BytesIO()
+    with tarfile.open(fileobj=data, mode="w") as tar:
+        tar.addfile(link)
+    data.seek(0)
+
+    with pytest.raises(tarfile.TarError):
+        extract_stream(data, str(tmp_path / "dest"))
+
+
+def test_chunked_stream_round_trip_with_strip_components(tmp_path):
+    source = tmp_path / "source"
+    (source / "sub").mkdir(parents=True)
+    (source / "big.bin").write_bytes(os.urandom(300000))
+    (source / "sub" / "small.txt").write_text("x")
+
+    def write(fileobj):
+        with tarfile.open(fileobj=fileobj, mode="w|") as tar:
+            tar.add(str(source), arcname="top")
+
+    chunks = list(iter_tar_chunks(write, chunk_size=65536))
+    assert all(len(chunk) >= 65536 for chunk in chunks[:-1])
+
+    assert extract_stream(ChunkReader(chunks), str(tmp_path / "dest"), strip_components=1) == 2
+    assert (tmp_path / "dest" / "big.bin").read_bytes() == (source / "big.bin").read_bytes()
+    assert (tmp_path / "dest" / "sub" / "small.txt").read_text() == "x"
+
+
+def test_chunked_stream_is_bounded_and_stops_with_consumer():
+    written = []
+
+    def write(fileobj):
+        for _ in range(1000):
+            fileobj.write(b"x" * 1024)
+            written.append(1024)
+
+    chunks = iter_tar_chunks(write, chunk_size=1024)
+    assert next(chunks) == b"x" * 1024
+    chunks.close()
+
+    # Only a handful of chunks were produced ahead of the consumer.
+    assert len(written) < 20
+
+
+def test_chunked_stream_reraises_writer_errors():
+    def write(fileobj):
+        fileobj.write(b"partial")
+        raise OSError("disk gone")
+
+    with pytest.raises(OSError, match="disk gone"):
+        list(iter_tar_chunks(write))
@@ -0,0 +1,167 @@
+# *******************************************************************************
+# Copyright (c) 2026 Contributors to the Eclipse Foundation
+#
+# See the NOTICE file(s) distributed with this work for additional
+# information regarding copyright ownership.
+#
+# This program and the accompanying materials are made available under the
+# terms of the Apache License Version 2.0 which is available at
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# SPDX-License-Identifier: Apache-2.0
+# *******************************************************************************
+
+import hashlib
+import threading
+
+import pytest
+
+from score.itf.core.target import DeploymentCache, Target
+
+
+class _EchoTarget(Target):
+    def __init__(self):
+        super().__init__()
+        self.executed = []
+        self.uploaded = []
+
+    def execute(self, command):
+        self.executed.append(command)
+        return len(command), command.encode()
+
+    def execute_async(self, binary_path, args=None, cwd="/"):
+        raise NotImplementedError
+
+    def upload(self, local_path, remote_path):
+        self.uploaded.append((local_path, remote_path))
+
+    def download(self, remote_path, local_path):
+        raise NotImplementedError
+
+    def restart(self):
+        raise NotImplementedError
+
+
+class _CachingTarget(_EchoTarget):
+    def __init__(self, key="target-1", remote_digests=None):
+        super().__init__()
+        self.key = key
+        self.remote_digests = remote_digests or {}
+
+    def deployment_key(self):
+        return self.key
+
+    def execute(self, command):
+        self.executed.append(command)
+        path = command.split()[1]
+        if path in self.remote_digests:
+            return 0, f"{self.remote_digests[path]}  {path}\n".encode()
+        return 1, b""
+
+
+@pytest.fixture
+def cache(mocker):
+    cache = DeploymentCache()
+    mocker.patch("score.itf.core.target.target.deployment_cache", return_value=cache)
+    return cache
+
+
+def test_execute_many_falls_back_to_serial_execute():
+    target = _EchoTarget()
+
+    results = target.execute_many(["a", "bb", "ccc"], concurrency=8)
+
+    assert target.executed == ["a", "bb", "ccc"]
+    assert [r.command for r in results] == ["a", "bb", "ccc"]
+    assert [r.exit_code for r in results] == [1, 2, 3]
+    assert [r.stdout for r in results] == [b"a", b"bb", b"ccc"]
+    assert all(r.stderr == b"" for r in results)
+    assert all(r.duration >= 0 for r in results)
+
+
+def test_run_many_runs_commands_concurrently_and_keeps_order():
+    barrier = threading.Barrier(3, timeout=5)
+
+    def run(command):
+        barrier.wait()
+        return 0, command.encode(), b""
+
+    results = Target._run_many(run, ["x", "y", "z"], concurrency=3)
+
+    assert [r.stdout for r in results] == [b"x", b"y", b"z"]
+
+
+def test_upload_tree_falls_back_to_per_file_upload(tmp_path):
+    (tmp_path / "sub").mkdir()
+    (tmp_path / "a.txt").write_text("a")
+    (tmp_path / "sub" / "b.txt").write_text("b")
+    target = _EchoTarget()
+
+    target.upload_tree(str(tmp_path), "/opt/app/")
+
+    assert sorted(target.uploaded) == [
+        (str(tmp_path / "a.txt"), "/opt/app/a.txt"),
+        (str(tmp_path / "sub" / "b.txt"), "/opt/app/sub/b.txt"),
+    ]
+
+
+def test_download_tree_falls_back_to_per_file_download(tmp_path):
+    class _ListingTarget(_EchoTarget):
+        def __init__(self):
+            super().__init__()
+            self.downloaded = []
+
+        def execute(self, command):
+            self.executed.append(command)
+            return 0, b"/opt/app/a.txt\0/opt/app/sub/b.txt\0"
+
+        def download(self, remote_path, local_path):
+            self.downloaded.append((remote_path, local_path))
+
+    target = _ListingTarget()
+
+    target.download_tree("/opt/app/", str(tmp_path))
+
+    assert target.executed == ["find /opt/app/ -type f -print0"]
+    assert target.downloaded == [
+        ("/opt/app/a.txt", str(tmp_path / "a.txt")),
+        ("/opt/app/sub/b.txt", str(tmp_path / "sub" / "b.txt")),
+    ]
+    assert (tmp_path / "sub").is_dir()
+
+
+def test_upload_cached_skips_files_recorded_as_deployed(cache, tmp_path):
+    local = tmp_path / "binary"
+    local.write_bytes(b"\x7fELF" * 100)
+    target = _CachingTarget()
+
+    assert target.upload_cached(str(local), "/tmp/binary") is True
+    assert target.upload_cached(str(local), "/tmp/binary") is False
+
+    assert target.uploaded == [(str(local), "/tmp/binary")]
+    # The remote digest is only queried while the manifest does not know the file.
+    assert len(target.executed) == 1
+    stats = cache.stats()
+    assert (stats.hits, stats.misses, stats.bytes_skipped) == (1, 1, 400)
+
+
+def test_upload_cached_uses_remote_digest_and_detects_changes(cache, tmp_path):
+    local = tmp_path / "binary"
+    local.write_bytes(b"v1")
+    target = _CachingTarget(remote_digests={"/tmp/binary": hashlib.sha256(b"v1").hexdigest()})
+
+    assert target.upload_cached(str(local), "/tmp/binary") is False
+
+    local.write_bytes(b"version 2")
+    assert target.upload_cached(str(local), "/tmp/binary") is True
+    assert target.uploaded == [(str(local), "/tmp/binary")]
+
+
+def test_upload_cached_is_per_deployment(cache, tmp_path):
+    local = tmp_path / "binary"
+    local.write_bytes(b"content")
+
+    assert _CachingTarget(key="a").upload_cached(str(local), "/tmp/binary") is True
+    assert _CachingTarget(key="b").upload_cached(str(local), "/tmp/binary") is True
+    assert _CachingTarget(key=None).upload_cached(str(local), "/tmp/binary") is True
+    assert cache.stats().misses == 2